@@ -12,6 +12,8 @@ Usage:
 
 import os
 import sys
+from contextlib import contextmanager
+
 import click
 from dotenv import load_dotenv
 
@@ -26,68 +28,207 @@ def cli():
     pass
 
 
+def fetch_options(f):
+    """HTTP options shared by the scrape* commands."""
+    f = click.option('--max-page-size', type=click.FloatRange(min=0, min_open=True), default=5, show_default=True,
+                     help='Skip pages larger than this many MB (sitemaps and API responses may be larger)')(f)
+    f = click.option('--report', type=click.Path(dir_okay=False),
+                     help='Write per-request timings and per-strategy totals to this JSON file')(f)
+    f = click.option('--offline', is_flag=True, help='Serve pages only from the HTTP cache')(f)
+    f = click.option('--no-cache', is_flag=True, help='Disable the on-disk HTTP cache')(f)
+    f = click.option('--cache-dir', default='.replay_cache', show_default=True, help='HTTP cache directory')(f)
+    f = click.option('--host-delay', multiple=True, metavar='HOST=SECONDS',
+                     help='Per-host delay override (repeatable)')(f)
+    f = click.option('--delay', type=float, default=0.5, show_default=True,
+                     help='Seconds between requests to one host (robots.txt Crawl-delay may raise it)')(f)
+    return f
+
+
+@contextmanager
+def _make_fetcher(headers, verbose, cache_dir, no_cache, offline, delay, host_delay, report, max_page_size):
+    """Open the Fetcher an extractor should use for these CLI options.
+
+    With --report, request metrics are collected and written (with a short
+    summary on the console) when the block exits, even if the run failed.
+    """
+    from scraper.cache import ResponseCache
+    from scraper.fetch import Fetcher
+    from scraper.metrics import Metrics, summarize
+    from scraper.ratelimit import HostRateLimiter
+
+    if offline and no_cache:
+        raise click.UsageError('--offline needs the HTTP cache; drop --no-cache')
+    host_delays = {}
+    for item in host_delay:
+        host, _, seconds = item.partition('=')
+        try:
+            host_delays[host.strip()] = float(seconds)
+        except ValueError:
+            raise click.BadParameter(f"expected HOST=SECONDS, got {item!r}", param_hint='--host-delay')
+    cache = None if no_cache else ResponseCache(cache_dir, offline=offline)
+    limiter = HostRateLimiter(delay=delay, host_delays=host_delays)
+    metrics = Metrics() if report else None
+    with Fetcher(headers=headers, cache=cache, limiter=limiter, verbose=verbose, metrics=metrics,
+                 max_bytes=int(max_page_size * 1024 * 1024)) as fetcher:
+        try:
+            yield fetcher
+        finally:
+            if metrics:
+                for line in summarize(metrics.write(report)):
+                    click.echo(line)
+                click.echo(f"Report saved to {report}")
+
+
+def resume_option(f):
+    """--resume flag shared by the scrape* commands."""
+    return click.option('--resume', is_flag=True,
+                        help='Pick up an interrupted run from OUTPUT.journal')(f)
+
+
+def jobs_option(f):
+    """--jobs flag shared by the commands that parse pages on a process pool."""
+    return click.option('--jobs', '-j', type=click.IntRange(min=1), default=None,
+                        help='Worker processes for parsing (default: one per CPU)')(f)
+
+
+def format_option(f):
+    """--format flag shared by the commands that write posts."""
+    from scraper.output import FORMATS
+
+    return click.option('--format', 'output_format', type=click.Choice(FORMATS),
+                        help='Output format (default: ndjson for .ndjson/.jsonl outputs, else json)')(f)
+
+
+def _open_journal(output, resume):
+    """Progress journal kept beside the output file until it is written."""
+    from scraper.journal import Journal
+
+    journal = Journal(output + '.journal', resume=resume)
+    if resume and len(journal):
+        click.echo(f"Resuming: {len(journal)} pages already done")
+    return journal
+
+
 @cli.command()
 @click.argument('url')
 @click.option('--output', '-o', default='posts.json', help='Output file')
 @click.option('--verbose', '-v', is_flag=True)
-def scrape(url, output, verbose):
-    """Extract posts from a blog URL."""
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False),
+              help='Previous output; only fetch posts that are new or changed since it')
+@click.option('--since', help='When the baseline was taken (ISO 8601; default: its modification time)')
+@click.option('--keep-duplicates', is_flag=True,
+              help='Keep near-identical posts found under different URLs (AMP, print views, ...)')
+@fetch_options
+@resume_option
+@jobs_option
+@format_option
+def scrape(url, output, verbose, baseline, since, keep_duplicates, resume, jobs, output_format, **fetch_opts):
+    """Extract posts from a blog URL.
+
+    With --baseline, writes the merged, re-indexed posts to OUTPUT and a
+    changeset (added/updated/missing URLs) to OUTPUT_changes.json.
+    """
+    from scraper.cache import StrategyCache
+    from scraper.dedup import NearDuplicates
     from scraper.extract import BlogExtractor
+    from scraper.incremental import Baseline, merge_posts, parse_timestamp
+    from scraper.output import index_posts, infer_format, write_posts
+    from scraper.pipeline import ParsePool
     import json
     
     click.echo(f"Extracting posts from {url}...")
     
-    extractor = BlogExtractor(url, verbose=verbose)
-    posts = extractor.extract()
-    
-    if not posts:
+    strategy_cache = None
+    if not fetch_opts['no_cache']:
+        strategy_cache = StrategyCache(os.path.join(fetch_opts['cache_dir'], 'strategies.json'))
+
+    if since and not baseline:
+        raise click.UsageError('--since only applies with --baseline')
+    if baseline:
+        since_at = parse_timestamp(since) if since else None
+        if since and since_at is None:
+            raise click.BadParameter(f"expected an ISO 8601 date, got {since!r}", param_hint='--since')
+        baseline = Baseline.load(baseline, since_at)
+        click.echo(f"Baseline: {len(baseline)} posts as of {baseline.since.isoformat()}")
+
+    duplicates = None if keep_duplicates else NearDuplicates()
+    journal = _open_journal(output, resume)
+    with _make_fetcher(BlogExtractor.HEADERS, verbose, **fetch_opts) as fetcher, ParsePool(jobs) as parse_pool:
+        extractor = BlogExtractor(url, verbose=verbose, fetcher=fetcher, strategy_cache=strategy_cache,
+                                  journal=journal, baseline=baseline, parse_pool=parse_pool)
+        # Save with post_index
+        if baseline:
+            fresh = list(extractor.iter_posts())
+            if duplicates:
+                fresh = duplicates.collapse(fresh)
+            fresh = [p.to_dict() for p in fresh]
+            posts, changeset = merge_posts(baseline, fresh) if fresh else ([], None)
+        else:
+            posts = index_posts(extractor.iter_posts(), BlogExtractor.ORDER_KEY, duplicates)
+        count = write_posts(output, posts, output_format or infer_format(output))
+    
+    if not count:
         click.echo("No posts found!")
         sys.exit(1)
+    journal.remove()
     
-    # Save with post_index
-    data = [p.to_dict() | {'post_index': i} for i, p in enumerate(posts, 1)]
-    
-    with open(output, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    click.echo(f"Saved {len(posts)} posts to {output}")
+    if duplicates and duplicates.collapsed:
+        click.echo(f"Collapsed {len(duplicates.collapsed)} near-duplicate posts")
+        if verbose:
+            for dropped, kept in duplicates.collapsed:
+                click.echo(f"  {dropped} -> {kept}")
+    click.echo(f"Saved {count} posts to {output}")
+
+    if baseline:
+        changes_file = os.path.splitext(output)[0] + '_changes.json'
+        with open(changes_file, 'w') as f:
+            json.dump(changeset, f, indent=2)
+        click.echo(f"{len(changeset['added'])} added, {len(changeset['updated'])} updated, "
+                   f"{len(changeset['missing'])} missing; changeset saved to {changes_file}")
 
 
 @cli.command('scrape-illich')
 @click.argument('book_url')
 @click.option('--output', '-o', default='illich_posts.json', help='Output file')
 @click.option('--verbose', '-v', is_flag=True)
-def scrape_illich(book_url, output, verbose):
+@fetch_options
+@resume_option
+@jobs_option
+@format_option
+def scrape_illich(book_url, output, verbose, resume, jobs, output_format, **fetch_opts):
     """Extract chapters from an Illich book on henryzoo.com.
 
     Example:
         python backstack.py scrape-illich https://henryzoo.com/illich/celebration-of-awareness/
     """
     from scraper.extract import IllichExtractor
-    import json
+    from scraper.output import index_posts, infer_format, write_posts
+    from scraper.pipeline import ParsePool
 
     click.echo(f"Extracting chapters from {book_url}...")
 
-    extractor = IllichExtractor(book_url, verbose=verbose)
-    posts = extractor.extract()
+    journal = _open_journal(output, resume)
+    with _make_fetcher(IllichExtractor.HEADERS, verbose, **fetch_opts) as fetcher, ParsePool(jobs) as parse_pool:
+        extractor = IllichExtractor(book_url, verbose=verbose, fetcher=fetcher, journal=journal, parse_pool=parse_pool)
+        posts = index_posts(extractor.iter_posts(), IllichExtractor.ORDER_KEY)
+        count = write_posts(output, posts, output_format or infer_format(output))
 
-    if not posts:
+    if not count:
         click.echo("No chapters found!")
         sys.exit(1)
+    journal.remove()
 
-    # Save with post_index
-    data = [p.to_dict() | {'post_index': i} for i, p in enumerate(posts, 1)]
-
-    with open(output, 'w') as f:
-        json.dump(data, f, indent=2)
-
-    click.echo(f"Saved {len(posts)} chapters to {output}")
+    click.echo(f"Saved {count} chapters to {output}")
 
 
 @cli.command('scrape-gwern')
 @click.option('--output', '-o', default='gwern_raw.json', help='Output file')
 @click.option('--verbose', '-v', is_flag=True)
-def scrape_gwern(output, verbose):
+@fetch_options
+@resume_option
+@jobs_option
+@format_option
+def scrape_gwern(output, verbose, resume, jobs, output_format, **fetch_opts):
     """Extract essays from gwern.net, tagged by index theme.
 
     Example:
@@ -96,29 +237,33 @@ def scrape_gwern(output, verbose):
         python backstack.py upload gwern_clean.json -s gwern -n "Gwern" -u https://gwern.net -a "Gwern Branwen"
     """
     from scraper.extract import GwernExtractor
-    import json
+    from scraper.output import index_posts, infer_format, write_posts
+    from scraper.pipeline import ParsePool
 
     click.echo("Extracting essays from gwern.net...")
 
-    extractor = GwernExtractor(verbose=verbose)
-    posts = extractor.extract()
+    journal = _open_journal(output, resume)
+    with _make_fetcher(GwernExtractor.HEADERS, verbose, **fetch_opts) as fetcher, ParsePool(jobs) as parse_pool:
+        extractor = GwernExtractor(verbose=verbose, fetcher=fetcher, journal=journal, parse_pool=parse_pool)
+        posts = index_posts(extractor.iter_posts(), GwernExtractor.ORDER_KEY)
+        count = write_posts(output, posts, output_format or infer_format(output))
 
-    if not posts:
+    if not count:
         click.echo("No essays found!")
         sys.exit(1)
+    journal.remove()
 
-    data = [p.to_dict() | {'post_index': i} for i, p in enumerate(posts, 1)]
-
-    with open(output, 'w') as f:
-        json.dump(data, f, indent=2)
-
-    click.echo(f"Saved {len(posts)} essays to {output}")
+    click.echo(f"Saved {count} essays to {output}")
 
 
 @cli.command('scrape-rickover')
 @click.option('--output', '-o', default='rickover_raw.json', help='Output file')
 @click.option('--verbose', '-v', is_flag=True)
-def scrape_rickover(output, verbose):
+@fetch_options
+@resume_option
+@jobs_option
+@format_option
+def scrape_rickover(output, verbose, resume, jobs, output_format, **fetch_opts):
     """Extract speeches from rickovercorpus.org, tagged by theme.
 
     Example:
@@ -126,30 +271,34 @@ def scrape_rickover(output, verbose):
         python backstack.py clean rickover_raw.json -b https://rickovercorpus.org -o rickover_clean.json
     """
     from scraper.extract import RickoverExtractor
-    import json
+    from scraper.output import index_posts, infer_format, write_posts
+    from scraper.pipeline import ParsePool
 
     click.echo("Extracting speeches from rickovercorpus.org...")
 
-    extractor = RickoverExtractor(verbose=verbose)
-    posts = extractor.extract()
+    journal = _open_journal(output, resume)
+    with _make_fetcher(RickoverExtractor.HEADERS, verbose, **fetch_opts) as fetcher, ParsePool(jobs) as parse_pool:
+        extractor = RickoverExtractor(verbose=verbose, fetcher=fetcher, journal=journal, parse_pool=parse_pool)
+        posts = index_posts(extractor.iter_posts(), RickoverExtractor.ORDER_KEY)
+        count = write_posts(output, posts, output_format or infer_format(output))
 
-    if not posts:
+    if not count:
         click.echo("No speeches found!")
         sys.exit(1)
+    journal.remove()
 
-    data = [p.to_dict() | {'post_index': i} for i, p in enumerate(posts, 1)]
-
-    with open(output, 'w') as f:
-        json.dump(data, f, indent=2)
-
-    click.echo(f"Saved {len(posts)} speeches to {output}")
+    click.echo(f"Saved {count} speeches to {output}")
 
 
 @cli.command('scrape-curated')
 @click.argument('links_file')
 @click.option('--output', '-o', default='curated_raw.json', help='Output file')
 @click.option('--verbose', '-v', is_flag=True)
-def scrape_curated(links_file, output, verbose):
+@fetch_options
+@resume_option
+@jobs_option
+@format_option
+def scrape_curated(links_file, output, verbose, resume, jobs, output_format, **fetch_opts):
     """Extract articles from a curated list of URLs.
 
     LINKS_FILE should be a JSON array of objects with 'title', 'url', and optional 'author'.
@@ -159,6 +308,8 @@ def scrape_curated(links_file, output, verbose):
         python backstack.py clean joanne_raw.json -b https://example.com -o joanne_clean.json
     """
     from scraper.extract import CuratedExtractor
+    from scraper.output import index_posts, infer_format, write_posts
+    from scraper.pipeline import ParsePool
     import json
 
     with open(links_file) as f:
@@ -166,70 +317,104 @@ def scrape_curated(links_file, output, verbose):
 
     click.echo(f"Extracting {len(links)} articles from curated list...")
 
-    extractor = CuratedExtractor(links, verbose=verbose)
-    posts = extractor.extract()
+    journal = _open_journal(output, resume)
+    with _make_fetcher(CuratedExtractor.HEADERS, verbose, **fetch_opts) as fetcher, ParsePool(jobs) as parse_pool:
+        extractor = CuratedExtractor(links, verbose=verbose, fetcher=fetcher, journal=journal, parse_pool=parse_pool)
+        posts = index_posts(extractor.iter_posts(), CuratedExtractor.ORDER_KEY)
+        count = write_posts(output, posts, output_format or infer_format(output))
 
-    if not posts:
+    if not count:
         click.echo("No articles extracted!")
         sys.exit(1)
+    journal.remove()
 
-    data = [p.to_dict() | {'post_index': i} for i, p in enumerate(posts, 1)]
-
-    with open(output, 'w') as f:
-        json.dump(data, f, indent=2)
-
-    click.echo(f"Saved {len(posts)} articles to {output}")
+    click.echo(f"Saved {count} articles to {output}")
 
 
 @cli.command()
 @click.argument('input_file')
-@click.option('--output', '-o', help='Output file (default: input_cleaned.json)')
+@click.option('--output', '-o', help='Output file (default: INPUT_cleaned.EXT, keeping the input extension)')
 @click.option('--base-url', '-b', required=True, help='Blog base URL')
 @click.option('--cdn-url', '-c', help='CDN URL for images')
 @click.option('--verbose', '-v', is_flag=True)
-def clean(input_file, output, base_url, cdn_url, verbose):
-    """Clean extracted posts for email delivery."""
-    from scraper.clean import HTMLCleaner
+@click.option('--no-cache', is_flag=True, help='Clean every post, ignoring and not filling the clean cache')
+@click.option('--cache-dir', default='.replay_cache', show_default=True, help='Cache directory')
+@jobs_option
+@format_option
+def clean(input_file, output, base_url, cdn_url, verbose, no_cache, cache_dir, jobs, output_format):
+    """Clean extracted posts for email delivery.
+
+    INPUT_FILE may be a JSON array or NDJSON. Posts are read, cleaned and
+    written one at a time, so memory use does not grow with the input.
+
+    Results are cached under CACHE_DIR/clean by a hash of each post's HTML,
+    the base and CDN URLs and the cleaner's configuration, so re-running
+    only cleans posts that changed.
+    """
+    from scraper.cache import CleanCache
+    from scraper.clean import clean_posts
+    from scraper.metrics import percentile
+    from scraper.output import infer_format, read_posts, write_posts
+    from array import array
+    from collections import Counter
     import json
+    import tempfile
+    import time
     
+    root, ext = os.path.splitext(input_file)
     if not output:
-        output = input_file.replace('.json', '_cleaned.json')
-    
-    with open(input_file) as f:
-        posts = json.load(f)
-    
-    click.echo(f"Cleaning {len(posts)} posts...")
-    
-    cleaner = HTMLCleaner(base_url, cdn_url, verbose)
-    cleaned = []
-    all_images = []
-    
-    for post in posts:
-        if not post.get('content_html'):
-            continue
-        
-        result = cleaner.clean(post['content_html'], post.get('title'))
+        output = f"{root}_cleaned{ext or '.json'}"
+    fmt = output_format or infer_format(output)
+    
+    click.echo(f"Cleaning posts from {input_file}...")
+    
+    started = time.perf_counter()
+    timings = array('d')
+    slowest = (0.0, '')
+    stats = Counter()
+    cache = None if no_cache else CleanCache(os.path.join(cache_dir, 'clean'))
+    
+    def cleaned(images):
+        nonlocal slowest
+        for post, result, seconds in clean_posts(read_posts(input_file), base_url, cdn_url, verbose, jobs,
+                                                 stats, cache):
+            label = post.get('title') or post.get('url', '')
+            timings.append(seconds)
+            slowest = max(slowest, (seconds, label))
+            if verbose:
+                click.echo(f"  {seconds * 1000:.0f}ms {label}")
+            for image in result['images']:
+                images.write(json.dumps(image) + '\n')
+            
+            yield {
+                **post,
+                'content_html': result['html'],
+                'content_text': result['text'],
+                'excerpt': result['excerpt'],
+                'word_count': result['word_count'],
+                'reading_time_minutes': result['reading_time_minutes'],
+            }
+    
+    # Image URLs are spooled to disk until the posts are written
+    with tempfile.TemporaryFile('w+') as images:
+        count = write_posts(output, cleaned(images), fmt)
+        if not count:
+            click.echo("No posts to clean!")
+            return
+        click.echo(f"Saved {count} cleaned posts to {output}")
+        click.echo(f"Cleaned in {time.perf_counter() - started:.1f}s: "
+                   f"p50 {percentile(timings, 50) * 1000:.0f}ms, p90 {percentile(timings, 90) * 1000:.0f}ms, "
+                   f"slowest {slowest[0] * 1000:.0f}ms ({slowest[1]})")
+        click.echo(f"Single tree: {stats['tree']} posts ({stats['allow_listed']} allow-listed, "
+                   f"{stats['control_free']} control-free), fallback: {stats['fallback']}, "
+                   f"cached: {stats['cached']}")
         
-        cleaned.append({
-            **post,
-            'content_html': result['html'],
-            'content_text': result['text'],
-            'excerpt': result['excerpt'],
-            'word_count': result['word_count'],
-            'reading_time_minutes': result['reading_time_minutes'],
-        })
-        all_images.extend(result['images'])
-    
-    with open(output, 'w') as f:
-        json.dump(cleaned, f, indent=2)
-    
-    click.echo(f"Saved {len(cleaned)} cleaned posts to {output}")
-    
-    if all_images:
-        images_file = output.replace('.json', '_images.json')
-        with open(images_file, 'w') as f:
-            json.dump(all_images, f, indent=2)
-        click.echo(f"Saved {len(all_images)} image URLs to {images_file}")
+        images.seek(0)
+        root, ext = os.path.splitext(output)
+        images_file = f"{root}_images{ext}"
+        image_count = write_posts(images_file, (json.loads(line) for line in images), fmt)
+        if image_count:
+            click.echo(f"Saved {image_count} image URLs to {images_file}")
 
 
 @cli.command()
@@ -241,13 +426,15 @@ def clean(input_file, output, base_url, cdn_url, verbose):
 @click.option('--author-email', help='Author email')
 @click.option('--dry-run', is_flag=True)
 def upload(posts_file, slug, name, url, author, author_email, dry_run):
-    """Upload posts to Supabase."""
+    """Upload posts to Supabase.
+
+    POSTS_FILE may be a JSON array or NDJSON, as written by scrape and clean.
+    """
     from supabase import create_client
     from datetime import datetime
-    import json
+    from scraper.output import read_posts
     
-    with open(posts_file) as f:
-        posts = json.load(f)
+    posts = list(read_posts(posts_file))
     
     click.echo(f"Uploading {len(posts)} posts for {name}...")
     
@@ -15,12 +15,12 @@ the body. Output: federalist_raw.json, in the ExtractedPost dict shape expected
 
 import re
 import json
-import time
 from datetime import datetime, timedelta
 
-import httpx
 from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from scraper.fetch import Fetcher
+from scraper.ratelimit import HostRateLimiter
 
 BASE = "https://avalon.law.yale.edu/18th_century/fed{:02d}.asp"
 HEADERS = {
@@ -40,18 +40,8 @@ DATE_RE = re.compile(
 )
 AUTHOR_RE = re.compile(r"^(HAMILTON|MADISON|JAY|MCLEAN)(\s+(AND|OR)\s+(HAMILTON|MADISON|JAY))?$")
 
-client = httpx.Client(headers=HEADERS, follow_redirects=True, timeout=30.0)
-
-
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-)
-def fetch(url: str) -> httpx.Response:
-    resp = client.get(url)
-    resp.raise_for_status()
-    return resp
+# Avalon is a small academic server: ~2.5 requests/second, as the old fixed sleep allowed
+AVALON_DELAY = 0.4
 
 
 def norm(text: str) -> str:
@@ -111,10 +101,15 @@ def parse_page(html: str, n: int):
 
 
 def main():
+    urls = [BASE.format(n) for n in range(1, 86)]
+    limiter = HostRateLimiter(delay=AVALON_DELAY)
+    with Fetcher(headers=HEADERS, limiter=limiter) as fetcher:
+        responses = fetcher.fetch_all(urls)
+
     posts = []
-    for n in range(1, 86):
-        url = BASE.format(n)
-        resp = fetch(url)
+    for n, (url, resp) in enumerate(zip(urls, responses), 1):
+        if resp is None:
+            raise SystemExit(f"Failed to fetch {url}")
         subject, author, published_str, body_html = parse_page(resp.text, n)
 
         title = f"No. {n}: {subject}" if subject else f"No. {n}"
@@ -139,7 +134,6 @@ def main():
             "post_index": n,
         })
         print(f"[{n:>2}/85] {title}  | {author or '?'}  | {published_str or '(synthetic)'}  | {len(body_html)}B")
-        time.sleep(0.4)
 
     with open("federalist_raw.json", "w") as f:
         json.dump(posts, f, indent=2)
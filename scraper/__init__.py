@@ -1,3 +1,4 @@
 from scraper.extract import BlogExtractor, ExtractedPost, IllichExtractor
+from scraper.fetch import Fetcher
 
-__all__ = ['BlogExtractor', 'ExtractedPost', 'IllichExtractor']
+__all__ = ['BlogExtractor', 'ExtractedPost', 'Fetcher', 'IllichExtractor']
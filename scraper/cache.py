@@ -0,0 +1,188 @@
+"""Persistent on-disk caches: HTTP responses, strategy winners and cleaned posts.
+
+Response bodies are content-addressed: each is stored once under the SHA-256 of its
+bytes, and a small JSON index entry per URL points at the body together with
+the status, headers and validators needed to revalidate it.
+
+    <root>/index/<sha256(url)>.json
+    <root>/bodies/<ab>/<sha256(body)>
+
+Cleaned posts are stored under a key that hashes the raw HTML together with
+everything else that shapes the output (see ``HTMLCleaner.fingerprint``):
+
+    <root>/clean/<ab>/<key>.json
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+import httpx
+
+
+# Headers that describe the wire encoding rather than the stored (decoded) body
+_DROP_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection')
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a URL is not in the cache."""
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ResponseCache:
+    """Store and revalidate HTTP responses on disk.
+
+    In ``offline`` mode the fetch layer serves entries straight from disk and
+    raises ``CacheMissError`` for anything it has never seen.
+    """
+
+    def __init__(self, root: str, offline: bool = False):
+        self.root = root
+        self.offline = offline
+
+    def _index_path(self, url: str) -> str:
+        return os.path.join(self.root, 'index', _sha256(url.encode('utf-8')) + '.json')
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'bodies', digest[:2], digest)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the index entry for a URL, or None if absent or damaged."""
+        try:
+            with open(self._index_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._body_path(entry['body'])):
+            return None
+        return entry
+
+    def put(self, url: str, resp: httpx.Response) -> Dict:
+        """Store a successful response and return its index entry."""
+        body = resp.content
+        digest = _sha256(body)
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            _atomic_write(body_path, body)
+
+        entry = {
+            'url': url,
+            'final_url': str(resp.url),
+            'status': resp.status_code,
+            'headers': {k: v for k, v in resp.headers.items() if k.lower() not in _DROP_HEADERS},
+            'body': digest,
+            'stored_at': time.time(),
+        }
+        _atomic_write(self._index_path(url), json.dumps(entry).encode('utf-8'))
+        return entry
+
+    def touch(self, url: str, entry: Dict, resp: httpx.Response) -> Dict:
+        """Record a successful revalidation (304), merging any refreshed validators."""
+        for name in ('etag', 'last-modified', 'cache-control', 'expires'):
+            if name in resp.headers:
+                entry['headers'][name] = resp.headers[name]
+        entry['stored_at'] = time.time()
+        _atomic_write(self._index_path(url), json.dumps(entry).encode('utf-8'))
+        return entry
+
+    @staticmethod
+    def validators(entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for revalidating an entry."""
+        headers = {k.lower(): v for k, v in entry['headers'].items()}
+        conditional = {}
+        if 'etag' in headers:
+            conditional['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            conditional['If-Modified-Since'] = headers['last-modified']
+        return conditional
+
+    def to_response(self, entry: Dict, source: str = 'hit') -> httpx.Response:
+        """Rebuild an ``httpx.Response`` from an index entry.
+
+        ``source`` is exposed as ``resp.extensions['cache']`` ('hit' for an
+        offline read, 'revalidated' after a 304).
+        """
+        with open(self._body_path(entry['body']), 'rb') as f:
+            body = f.read()
+        return httpx.Response(
+            entry['status'],
+            headers=entry['headers'],
+            content=body,
+            request=httpx.Request('GET', entry.get('final_url') or entry['url']),
+            extensions={'cache': source},
+        )
+
+
+class StrategyCache:
+    """Remember which extraction strategy worked for each domain.
+
+    A single small JSON file mapping domain -> strategy name, so a re-scrape
+    goes straight to the strategy that won last time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, domain: str) -> Optional[str]:
+        return self._load().get(domain)
+
+    def set(self, domain: str, strategy: str):
+        winners = self._load()
+        if winners.get(domain) == strategy:
+            return
+        winners[domain] = strategy
+        _atomic_write(self.path, json.dumps(winners, indent=2, sort_keys=True).encode('utf-8'))
+
+
+class CleanCache:
+    """Store ``HTMLCleaner.clean`` results on disk, keyed by content hash.
+
+    Entries are never invalidated in place. A changed post, base URL or
+    cleaner configuration produces a different key.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def key(fingerprint: str, html: str) -> str:
+        return _sha256(f"{fingerprint}\0{html}".encode('utf-8'))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored result for a key, or None if absent or damaged."""
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: Dict):
+        _atomic_write(self._path(key), json.dumps(result).encode('utf-8'))
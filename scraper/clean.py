@@ -1,13 +1,60 @@
-"""HTML cleaning and sanitization for email delivery."""
+"""HTML cleaning and sanitization for email delivery.
 
-import re
-from urllib.parse import urljoin
-from typing import Dict, List, Optional
+``HTMLCleaner`` parses a post once with lxml and does all of its work on that
+one tree: dropping unwanted elements, resolving links, sanitizing tags and
+attributes, and laying out whitespace. The tree is serialized once, at the
+end. The output is byte-identical to the original BeautifulSoup, bleach and
+Premailer pipeline, because the tree pass applies the rules those libraries
+applied: bleach's allow-lists and link protocol check, html5lib's implied
+``<tbody>``, Premailer's class stripping, and libxml2's pretty-print line
+breaks and link escaping.
+
+A few constructs make html5lib or libxml2 restructure the document in ways
+not worth reproducing, such as a table inside a paragraph, a link inside a
+link, MathML, or a stray table cell. Posts containing one are cleaned by the
+original pipeline (``_clean_soup``) instead.
+
+``HTMLCleaner.stats`` counts how posts were cleaned: ``tree`` or
+``fallback``, and for tree-path posts the fast paths that fired.
+``control_free`` posts have no carriage returns, character references or
+control characters, so their text needs no per-node sanitizing.
+``allow_listed`` posts have nothing to strip or unwrap, so their whitespace
+needs no second pass.
+
+With a ``CleanCache``, results are stored under a hash of the raw HTML and
+``HTMLCleaner.fingerprint``, which covers ``CLEANER_VERSION``, the
+allow-lists, the versions of the libraries that shape the output, and the
+base and CDN URLs. Bump ``CLEANER_VERSION`` whenever the output changes.
+
+``clean_posts`` cleans a batch of posts on a process pool and yields the
+results in input order, with the time each post took.
+"""
+
+import json
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, urljoin
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import bleach
+import bs4
+import lxml.html
+import premailer
+from bleach.html5lib_shim import HTML_TAGS_BLOCK_LEVEL, attr_val_is_uri
+from bleach.sanitizer import (
+    INVISIBLE_CHARACTERS, INVISIBLE_CHARACTERS_RE, INVISIBLE_REPLACEMENT_CHAR, BleachSanitizerFilter,
+)
 from bs4 import BeautifulSoup
+from lxml import etree
 from premailer import Premailer
 
+from scraper.cache import CleanCache
+from scraper.pipeline import default_jobs
+
+
+# Part of every cache key: bump when cleaned output changes
+CLEANER_VERSION = 1
 
 # Tags safe for email rendering
 ALLOWED_TAGS = [
@@ -37,14 +84,144 @@ STRIP_ELEMENTS = [
     'object', 'embed',
 ]
 
+# Posts in flight per worker in ``clean_posts``
+WINDOW = 4
+
+# Attributes kept per tag. Premailer drops ``class`` after bleach allows it.
+_KEPT_ATTRS = {
+    tag: frozenset(ALLOWED_ATTRS['*'] + ALLOWED_ATTRS.get(tag, [])) - {'class'}
+    for tag in ALLOWED_TAGS
+}
+_URI_ATTRS = frozenset(name for ns, name in attr_val_is_uri if ns is None)
+_URI_CHECK = BleachSanitizerFilter(iter(()), allowed_protocols=bleach.sanitizer.ALLOWED_PROTOCOLS)
+# Disallowed block tags that bleach replaces with a line break
+_BREAKING_TAGS = HTML_TAGS_BLOCK_LEVEL - set(ALLOWED_TAGS)
+
+# bleach strips disallowed tags while tokenizing, so html5lib only ever
+# builds a tree of allowed tags. These are the rules it would apply to them.
+
+_HEADINGS = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
+# Start tags that make html5lib close an open <p>
+_CLOSES_P = _HEADINGS | {
+    'blockquote', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure', 'hr', 'li',
+    'ol', 'p', 'pre', 'table', 'ul',
+}
+# Elements that hide an outer <p> from those start tags
+_BUTTON_SCOPE = frozenset({'table', 'td', 'th'})
+# Elements that hide an outer <li>, <dd> or <dt> from a new one
+_LIST_SCOPE = _HEADINGS | {
+    'blockquote', 'dd', 'dl', 'dt', 'figcaption', 'figure', 'li', 'ol', 'pre',
+    'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+# Table structure html5lib accepts as is: allowed children, allowed parents
+_TABLE_CHILDREN = {
+    'table': frozenset({'tbody', 'thead', 'tfoot', 'tr'}),
+    'tbody': frozenset({'tr'}),
+    'thead': frozenset({'tr'}),
+    'tfoot': frozenset({'tr'}),
+    'tr': frozenset({'td', 'th'}),
+}
+_TABLE_PARENTS = {
+    'tbody': frozenset({'table'}),
+    'thead': frozenset({'table'}),
+    'tfoot': frozenset({'table'}),
+    'tr': frozenset({'table', 'tbody', 'thead', 'tfoot'}),
+    'td': frozenset({'tr'}),
+    'th': frozenset({'tr'}),
+}
+_TABLE_SECTIONS = frozenset({'tbody', 'thead', 'tfoot'})
+
+# Parent -> children whose start tag makes libxml2 close the parent
+# (probed against libxml2 2.14; reached only once bleach unwraps a tag)
+_CELLS = frozenset({'td', 'th'})
+_LIBXML_CLOSES = {
+    'a': frozenset({'a', 'table'}) | _CELLS,
+    'b': frozenset({'p'}) | _CELLS,
+    'i': frozenset({'p'}) | _CELLS,
+    's': frozenset({'p'}) | _CELLS,
+    'u': frozenset({'p'}) | _CELLS,
+    'small': frozenset({'p'}) | _CELLS,
+    'span': _CELLS,
+    'dd': frozenset({'dt'}),
+    'dt': frozenset({'dd', 'dl'}),
+    'dl': frozenset({'li'}),
+    'li': frozenset({'li'}),
+    'p': _HEADINGS | _CELLS | {
+        'blockquote', 'dd', 'div', 'dl', 'dt', 'hr', 'li', 'ol', 'p', 'pre',
+        'table', 'tbody', 'tfoot', 'tr', 'ul',
+    },
+    'pre': frozenset({'dd', 'dl', 'dt', 'li', 'table', 'ul'}),
+    'ul': frozenset({'pre'}),
+    'tbody': frozenset({'tbody', 'tfoot'}),
+    'thead': frozenset({'tbody', 'tfoot'}),
+    'tfoot': frozenset({'tbody'}),
+    'tr': frozenset({'tbody', 'tfoot', 'tr'}),
+    'td': _CELLS | {'tbody', 'tfoot', 'tr'},
+    'th': _CELLS | {'tbody', 'tfoot', 'tr'},
+}
+for _tag in _HEADINGS:
+    _LIBXML_CLOSES[_tag] = frozenset({'li', 'p', 'table'})
+
+# Block tags libxml2's pretty printer puts on their own line
+_BLOCK_TAGS = _HEADINGS | {
+    'blockquote', 'body', 'dd', 'div', 'dl', 'dt', 'hr', 'li', 'ol', 'p',
+    'pre', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul',
+}
+_VOID_TAGS = frozenset({'br', 'hr', 'img'})
+# libxml2 %-escapes these when it serializes, leaving printable ASCII alone
+_ESCAPED_ATTRS = frozenset({'href', 'src'})
+_URI_SAFE = ''.join(chr(c) for c in range(0x21, 0x7f))
+_TABLE_SPACE = ' \t\n'
+# Whitespace-only strings BeautifulSoup collapses outside <pre>
+_ASCII_SPACES = ' \n\t\x0c\r'
+# Characters ``_sanitize_text`` rewrites. Testing for each with ``in`` is
+# faster than a regex search over a whole post.
+_CONTROL_CHARS = '\r' + INVISIBLE_CHARACTERS
+
+
+def _escape(text: str) -> str:
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _quote_attr(value: str) -> str:
+    """Quote an attribute value the way BeautifulSoup does."""
+    value = _escape(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+
+def _collapse_spaces(body):
+    """Reduce whitespace-only strings to one space or newline, as BeautifulSoup does."""
+    kept = set()
+    for pre in body.iter('pre', 'textarea'):
+        kept.update(pre.iter())
+    for el in body.iter():
+        text = el.text
+        if text and isinstance(el.tag, str) and not text.strip(_ASCII_SPACES) and el not in kept:
+            el.text = '\n' if '\n' in text else ' '
+        tail = el.tail
+        if tail and el is not body and not tail.strip(_ASCII_SPACES) and el.getparent() not in kept:
+            el.tail = '\n' if '\n' in tail else ' '
+
 
 class HTMLCleaner:
     """Clean and sanitize HTML for email delivery."""
 
-    def __init__(self, base_url: str, cdn_url: Optional[str] = None, verbose: bool = False):
+    def __init__(self, base_url: str, cdn_url: Optional[str] = None, verbose: bool = False,
+                 cache: Optional[CleanCache] = None):
         self.base_url = base_url.rstrip('/')
         self.cdn_url = cdn_url.rstrip('/') if cdn_url else None
         self.verbose = verbose
+        self.cache = cache
+        self.stats: Counter = Counter()
+        self.fingerprint = json.dumps([
+            CLEANER_VERSION, ALLOWED_TAGS, ALLOWED_ATTRS, STRIP_ELEMENTS,
+            bleach.__version__, bs4.__version__, premailer.__version__, etree.LXML_VERSION, etree.LIBXML_VERSION,
+            self.base_url, self.cdn_url,
+        ])
 
     def _log(self, msg: str):
         if self.verbose:
@@ -55,6 +232,294 @@ class HTMLCleaner:
 
         Returns dict with: html, text, excerpt, word_count, reading_time_minutes, images
         """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.fingerprint, html)
+            result = self.cache.get(key)
+            if result is not None:
+                self.stats['cached'] += 1
+                return result
+
+        cleaned = self._clean_tree(html)
+        if cleaned is None:
+            self.stats['fallback'] += 1
+            cleaned = self._clean_soup(html)
+        else:
+            self.stats['tree'] += 1
+        cleaned_html, plain_text, images = cleaned
+
+        # Generate excerpt
+        excerpt = self._generate_excerpt(plain_text)
+
+        # Calculate word count and reading time
+        words = plain_text.split()
+        word_count = len(words)
+        reading_time = max(1, round(word_count / 250))
+
+        self._log(f"Cleaned: {word_count} words, ~{reading_time} min read, {len(images)} images")
+
+        result = {
+            'html': cleaned_html,
+            'text': plain_text,
+            'excerpt': excerpt,
+            'word_count': word_count,
+            'reading_time_minutes': reading_time,
+            'images': images,
+        }
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def _clean_tree(self, html: str) -> Optional[Tuple[str, str, List[Dict]]]:
+        """Clean on a single lxml tree; None if the post needs ``_clean_soup``."""
+        try:
+            root = lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            return None
+        body = root.find('body')
+        if body is None:
+            return None
+
+        control_free = '&#' not in html and not any(c in html for c in _CONTROL_CHARS)
+        try:
+            _collapse_spaces(body)
+            # Remove unwanted elements entirely, and comments
+            removed = list(root.iter(etree.Comment, *STRIP_ELEMENTS))
+            for el in removed:
+                el.drop_tree()
+            self._fix_tree_urls(root)
+            images = self._collect_tree_images(root)
+            unwrapped = self._sanitize(body, control_free)
+            if unwrapped is None:
+                return None
+        except ValueError:
+            # lxml refuses to store control characters bleach would have kept
+            return None
+
+        # Premailer strips the document before parsing it
+        if len(body):
+            body.text = (body.text or '').lstrip()
+            body[-1].tail = (body[-1].tail or '').rstrip()
+        else:
+            body.text = (body.text or '').strip()
+            if not body.text:
+                return None
+        # BeautifulSoup writes strings sitting directly in <body> unescaped,
+        # and reparses them: keep to posts where that changes nothing
+        if '<' in (body.text or '') or '&' in (body.text or '') or any(
+            '<' in (el.tail or '') or '&' in (el.tail or '') for el in body
+        ):
+            return None
+        # Only dropped or unwrapped tags leave runs of whitespace to collapse
+        allow_listed = not removed and not unwrapped
+        if not allow_listed:
+            _collapse_spaces(body)
+        # libxml2 writes an empty <li> without its end tag; Premailer's reparse
+        # closes it again only at the next <li> or the end of the list
+        for li in body.iter('li'):
+            if li.text is None and not len(li):
+                after = li.getnext()
+                if li.getparent().tag not in ('ol', 'ul') or (after is not None and after.tag != 'li'):
+                    return None
+
+        out: List[str] = []
+        self._render_children(body, out)
+        text = [s for s in (s.strip() for s in body.itertext()) if s]
+        self.stats['control_free'] += control_free
+        self.stats['allow_listed'] += allow_listed
+        return ''.join(out), '\n'.join(text), images
+
+    def _sanitize(self, body, control_free: bool = False) -> Optional[int]:
+        """Apply bleach's and html5lib's rules to ``body`` in place.
+
+        Returns the number of tags unwrapped, or None, leaving the tree
+        half-done, if html5lib or libxml2 would restructure the post. With
+        ``control_free`` the text is known not to need sanitizing.
+        """
+        # bleach: strip disallowed tags as it tokenizes, filter attributes and text
+        unwrap, pres = [], []
+        if not control_free:
+            self._sanitize_text(body)
+        for i, el in enumerate(body.iterdescendants()):
+            tag = el.tag
+            if not isinstance(tag, str):
+                return None
+            if not control_free:
+                self._sanitize_text(el)
+            kept = _KEPT_ATTRS.get(tag)
+            if kept is None:
+                unwrap.append(el)
+                # Any tag but the very first one makes it a line break
+                if tag in _BREAKING_TAGS and i:
+                    el.text = '\n' + (el.text or '')
+            else:
+                if el.attrib:
+                    self._sanitize_attrs(el, kept)
+                if tag == 'pre' and not any(True for _ in el.iterancestors('td', 'th')):
+                    # Inside a table cell html5lib keeps the newline
+                    pres.append(el)
+        for pre in pres:
+            self._drop_leading_newline(pre)
+        for el in unwrap:
+            el.drop_tag()
+
+        # html5lib builds the tree of allowed tags; Premailer reparses it with libxml2
+        tables = []
+        for el in body.iterdescendants():
+            tag = el.tag
+            parent = el.getparent()
+            closes = _LIBXML_CLOSES.get(parent.tag)
+            if closes and tag in closes:
+                return None
+            if tag in _TABLE_PARENTS and parent.tag not in _TABLE_PARENTS[tag]:
+                return None
+            if tag in _TABLE_CHILDREN:
+                if not self._plain_table_part(el):
+                    return None
+                if tag == 'table':
+                    tables.append(el)
+            if tag in _CLOSES_P:
+                for anc in el.iterancestors():
+                    if anc.tag == 'p':
+                        return None
+                    if anc.tag in _BUTTON_SCOPE or anc is body:
+                        break
+                if tag in _HEADINGS and parent.tag in _HEADINGS:
+                    return None
+                if tag in ('li', 'dd', 'dt'):
+                    same = ('li',) if tag == 'li' else ('dd', 'dt')
+                    for anc in el.iterancestors():
+                        if anc.tag in same:
+                            return None
+                        if anc.tag in _LIST_SCOPE or anc is body:
+                            break
+            elif tag == 'a':
+                for _ in el.iterancestors('a'):
+                    return None
+        for table in tables:
+            self._add_tbody(table)
+        return len(unwrap)
+
+    @staticmethod
+    def _sanitize_text(el):
+        """Normalize newlines like html5lib and blank out control characters like bleach."""
+        for attr in ('text', 'tail'):
+            text = getattr(el, attr)
+            if text and ('\r' in text or INVISIBLE_CHARACTERS_RE.search(text)):
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+                setattr(el, attr, INVISIBLE_CHARACTERS_RE.sub(INVISIBLE_REPLACEMENT_CHAR, text))
+
+    @staticmethod
+    def _drop_leading_newline(pre):
+        """Drop a newline opening ``pre``, as html5lib does, looking past stripped tags."""
+        for event, el in etree.iterwalk(pre, events=('start', 'end')):
+            if event == 'start':
+                if el is not pre and (el.tag in _KEPT_ATTRS or el.tag in _BREAKING_TAGS):
+                    return
+                attr = 'text'
+            elif el is pre:
+                return
+            else:
+                attr = 'tail'
+            text = getattr(el, attr)
+            if text:
+                if text[0] == '\n':
+                    setattr(el, attr, text[1:])
+                return
+
+    @staticmethod
+    def _plain_table_part(el) -> bool:
+        """Whether a table (section, row) holds only the parts html5lib expects."""
+        allowed = _TABLE_CHILDREN[el.tag]
+        if el.text and el.text.strip(_TABLE_SPACE):
+            return False
+        for child in el:
+            if child.tag not in allowed:
+                return False
+            if child.tail and child.tail.strip(_TABLE_SPACE):
+                return False
+        return True
+
+    @staticmethod
+    def _add_tbody(table):
+        """Wrap rows sitting directly in ``table`` in a ``tbody``, like html5lib."""
+        tbody = None
+        for child in list(table):
+            if child.tag in _TABLE_SECTIONS:
+                tbody = None
+            elif tbody is None:
+                tbody = etree.Element('tbody')
+                child.addprevious(tbody)
+                tbody.append(child)
+            else:
+                tbody.append(child)
+
+    @staticmethod
+    def _sanitize_attrs(el, kept: frozenset):
+        # html5lib hands attributes to bleach sorted by name
+        attrs = sorted(el.attrib.items())
+        el.attrib.clear()
+        for name, value in attrs:
+            if name not in kept:
+                continue
+            if '\r' in value:
+                value = value.replace('\r\n', '\n').replace('\r', '\n')
+            if name == 'style':
+                # No CSS sanitizer configured: bleach empties every style
+                value = ''
+            elif name in _URI_ATTRS:
+                if _URI_CHECK.sanitize_uri_value(_escape(value), _URI_CHECK.allowed_protocols) is None:
+                    continue
+            elif name == 'rel':
+                value = ' '.join(value.split())
+            el.set(name, value)
+
+    def _render_children(self, el, out: List[str]):
+        """Serialize ``el``'s content like BeautifulSoup, with libxml2's line breaks."""
+        tag = el.tag
+        text = el.text
+        children = len(el)
+        # libxml2 breaks lines inside block elements, except <p> and <pre>,
+        # holding more than one node and starting (ending) with an element
+        breaks = tag in _BLOCK_TAGS and tag[0] != 'p' and children and (
+            text or children > 1 or el[-1].tail
+        )
+        escape = _escape if tag != 'body' else str
+        if text:
+            out.append(escape(text))
+        elif breaks:
+            out.append('\n')
+        last = children - 1
+        for i, child in enumerate(el):
+            self._render(child, out)
+            if child.tail:
+                after = escape(child.tail)
+            elif i < last:
+                after = '\n' if tag[0] != 'p' and child.tag in _BLOCK_TAGS else ''
+            else:
+                after = '\n' if breaks else ''
+            if child.tag == 'li' and child.text is None and not len(child):
+                # libxml2 leaves an empty <li> open, so what follows lands inside
+                out[-1] = after + out[-1]
+            elif after:
+                out.append(after)
+
+    def _render(self, el, out: List[str]):
+        tag = el.tag
+        out.append('<' + tag)
+        for name, value in el.attrib.items():
+            if name in _ESCAPED_ATTRS:
+                value = quote(value.lstrip(' \t\n\r'), safe=_URI_SAFE)
+            out.append(f' {name}={_quote_attr(value)}')
+        if tag in _VOID_TAGS and not len(el) and not el.text:
+            out.append('/>')
+            return
+        out.append('>')
+        self._render_children(el, out)
+        out.append(f'</{tag}>')
+
+    def _clean_soup(self, html: str) -> Tuple[str, str, List[Dict]]:
+        """The original pipeline: BeautifulSoup, bleach, then Premailer."""
         soup = BeautifulSoup(html, 'lxml')
 
         # Remove unwanted elements entirely
@@ -109,42 +574,52 @@ class HTMLCleaner:
         # Extract plain text
         text_soup = BeautifulSoup(cleaned_html, 'lxml')
         plain_text = text_soup.get_text(separator='\n', strip=True)
+        return cleaned_html, plain_text, images
 
-        # Generate excerpt
-        excerpt = self._generate_excerpt(plain_text)
+    def _link_url(self, href: str) -> Optional[str]:
+        """Absolute form of a relative link, or None to leave it alone."""
+        if href.startswith(('http://', 'https://', 'mailto:', '#')):
+            return None
+        return urljoin(self.base_url + '/', href)
 
-        # Calculate word count and reading time
-        words = plain_text.split()
-        word_count = len(words)
-        reading_time = max(1, round(word_count / 250))
-
-        self._log(f"Cleaned: {word_count} words, ~{reading_time} min read, {len(images)} images")
-
-        return {
-            'html': cleaned_html,
-            'text': plain_text,
-            'excerpt': excerpt,
-            'word_count': word_count,
-            'reading_time_minutes': reading_time,
-            'images': images,
-        }
+    def _image_url(self, src: str) -> Optional[str]:
+        """Absolute form of a relative image source, or None to leave it alone."""
+        if src.startswith(('http://', 'https://', 'data:')):
+            return None
+        return urljoin(self.base_url + '/', src)
 
     def _fix_urls(self, soup: BeautifulSoup):
         """Convert relative URLs to absolute."""
         for tag in soup.find_all('a', href=True):
-            href = tag['href']
-            if href.startswith(('http://', 'https://', 'mailto:', '#')):
+            href = self._link_url(tag['href'])
+            if href is None:
                 continue
-            tag['href'] = urljoin(self.base_url + '/', href)
+            tag['href'] = href
             # Open external links in new tab
             tag['target'] = '_blank'
             tag['rel'] = 'noopener noreferrer'
 
         for tag in soup.find_all('img', src=True):
-            src = tag['src']
-            if src.startswith(('http://', 'https://', 'data:')):
+            src = self._image_url(tag['src'])
+            if src is not None:
+                tag['src'] = src
+
+    def _fix_tree_urls(self, root):
+        """``_fix_urls`` for an lxml tree."""
+        for tag in root.iter('a'):
+            href = tag.get('href')
+            href = href if href is None else self._link_url(href)
+            if href is None:
                 continue
-            tag['src'] = urljoin(self.base_url + '/', src)
+            tag.set('href', href)
+            tag.set('target', '_blank')
+            tag.set('rel', 'noopener noreferrer')
+
+        for tag in root.iter('img'):
+            src = tag.get('src')
+            src = src if src is None else self._image_url(src)
+            if src is not None:
+                tag.set('src', src)
 
     def _collect_images(self, soup: BeautifulSoup) -> List[Dict]:
         """Collect image information from the HTML."""
@@ -159,6 +634,14 @@ class HTMLCleaner:
             })
         return images
 
+    def _collect_tree_images(self, root) -> List[Dict]:
+        """``_collect_images`` for an lxml tree."""
+        return [
+            {'src': img.get('src'), 'alt': img.get('alt', '')}
+            for img in root.iter('img')
+            if img.get('src') is not None and not img.get('src').startswith('data:')
+        ]
+
     def _generate_excerpt(self, text: str, max_length: int = 200) -> str:
         """Generate excerpt from plain text."""
         if not text:
@@ -176,3 +659,64 @@ class HTMLCleaner:
             if idx > 50:
                 return excerpt[:idx] + '...'
         return excerpt[:max_length] + ('...' if len(text) > max_length else '')
+
+
+# The cleaner owned by a worker process of ``clean_posts``
+_worker_cleaner: Optional[HTMLCleaner] = None
+
+
+def _init_worker(base_url: str, cdn_url: Optional[str], verbose: bool, cache: Optional[CleanCache]):
+    global _worker_cleaner
+    _worker_cleaner = HTMLCleaner(base_url, cdn_url, verbose, cache)
+
+
+def _timed_clean(cleaner: HTMLCleaner, html: str, title: Optional[str]) -> Tuple[Dict, float, Counter]:
+    """Clean one post, returning the result, the seconds taken and its ``stats`` counts."""
+    before = cleaner.stats.copy()
+    started = time.perf_counter()
+    result = cleaner.clean(html, title)
+    return result, time.perf_counter() - started, cleaner.stats - before
+
+
+def _clean_in_worker(html: str, title: Optional[str]) -> Tuple[Dict, float, Counter]:
+    return _timed_clean(_worker_cleaner, html, title)
+
+
+def clean_posts(posts: Iterable[Dict], base_url: str, cdn_url: Optional[str] = None,
+                verbose: bool = False, jobs: Optional[int] = None,
+                stats: Optional[Counter] = None, cache: Optional[CleanCache] = None) -> Iterator[Tuple[Dict, Dict, float]]:
+    """Clean posts, yielding ``(post, result, seconds)`` in input order.
+
+    Posts without ``content_html`` are skipped. With more than one job, posts
+    are cleaned on a process pool whose workers each keep one ``HTMLCleaner``.
+    At most ``WINDOW`` posts per worker are in flight, so results stream out as
+    soon as the posts before them are done. The workers' ``HTMLCleaner.stats``
+    are added up in ``stats``. Every worker reads and writes the same ``cache``.
+    """
+    if stats is None:
+        stats = Counter()
+    jobs = jobs or default_jobs()
+    posts = (post for post in posts if post.get('content_html'))
+    if jobs == 1:
+        cleaner = HTMLCleaner(base_url, cdn_url, verbose, cache)
+        for post in posts:
+            result, seconds, counts = _timed_clean(cleaner, post['content_html'], post.get('title'))
+            stats.update(counts)
+            yield post, result, seconds
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(base_url, cdn_url, verbose, cache)) as executor:
+        pending = deque()
+        for post in posts:
+            pending.append((post, executor.submit(_clean_in_worker, post['content_html'], post.get('title'))))
+            if len(pending) >= jobs * WINDOW:
+                done, future = pending.popleft()
+                result, seconds, counts = future.result()
+                stats.update(counts)
+                yield done, result, seconds
+        while pending:
+            done, future = pending.popleft()
+            result, seconds, counts = future.result()
+            stats.update(counts)
+            yield done, result, seconds
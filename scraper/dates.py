@@ -0,0 +1,229 @@
+"""Publication date extraction and normalization.
+
+``parse_date`` turns the date strings found on pages and in APIs into ISO
+8601, or None; it never hands back the raw input. Each format is a small
+regex-guarded parser rather than a ``strptime`` attempt, so a miss costs a
+failed match instead of an exception, and the format that last worked for a
+site is tried first on its next page.
+
+``extract_date`` finds a page's date in one walk over its ``<meta>``,
+``<time>`` and JSON-LD ``<script>`` elements, falling back to a text scan
+only when asked to.
+"""
+
+import calendar
+import json
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from lxml import etree
+
+
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+_MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+_MONTHS['sept'] = 9
+
+_MONTH = r'([A-Za-z]{3,9})\.?'
+_DAY = r'(\d{1,2})(?:st|nd|rd|th)?'
+
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_MDY = re.compile(rf'\b{_MONTH}\s+{_DAY},?\s+(\d{{4}})\b')
+_DMY = re.compile(rf'\b{_DAY}\s+{_MONTH},?\s+(\d{{4}})\b')
+_YMD_SLASH = re.compile(r'\b(\d{4})/(\d{1,2})/(\d{1,2})\b')
+_RFC_2822 = re.compile(r'[A-Za-z]{3},\s+\d{1,2}\s+[A-Za-z]{3}\s+\d{4}')
+
+# Month-name dates in running text, e.g. "January 3rd, 1971"
+TEXT_DATE = re.compile(
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}',
+    re.IGNORECASE,
+)
+
+# <meta> keys (property, name or itemprop; case-insensitive) for the publish date
+DEFAULT_META_KEYS = ('article:published_time', 'datepublished', 'date')
+
+# How far into the page text the text fallback looks
+TEXT_SCAN_CHARS = 2000
+
+_TEXT_NODES = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+
+def _ymd(year: str, month: int, day: str) -> Optional[datetime]:
+    try:
+        return datetime(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    if not _ISO_DATE.match(value):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # e.g. "2023-01-15 10:30:00 +0000": keep the date part
+        return datetime.fromisoformat(value[:10]) if len(value) > 10 else None
+
+
+def _parse_mdy(value: str) -> Optional[datetime]:
+    for m in _MDY.finditer(value):
+        month = _MONTHS.get(m.group(1).lower())
+        if month:
+            return _ymd(m.group(3), month, m.group(2))
+    return None
+
+
+def _parse_dmy(value: str) -> Optional[datetime]:
+    for m in _DMY.finditer(value):
+        month = _MONTHS.get(m.group(2).lower())
+        if month:
+            return _ymd(m.group(3), month, m.group(1))
+    return None
+
+
+def _parse_ymd_slash(value: str) -> Optional[datetime]:
+    m = _YMD_SLASH.search(value)
+    return _ymd(m.group(1), int(m.group(2)), m.group(3)) if m else None
+
+
+def _parse_rfc_2822(value: str) -> Optional[datetime]:
+    if not _RFC_2822.match(value):
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+FORMATS: Dict[str, Callable[[str], Optional[datetime]]] = {
+    'iso': _parse_iso,
+    'rfc-2822': _parse_rfc_2822,
+    'month-day-year': _parse_mdy,
+    'day-month-year': _parse_dmy,
+    'year/month/day': _parse_ymd_slash,
+}
+
+
+class DateParser:
+    """Normalize date strings, learning which format each site uses.
+
+    ``site`` is any key for a site (the extractors use the host name). The
+    format that last parsed a value for that site is tried first.
+    """
+
+    def __init__(self):
+        self._learned: Dict[str, str] = {}
+
+    def _order(self, site: Optional[str]) -> List[str]:
+        learned = self._learned.get(site) if site else None
+        if learned is None:
+            return list(FORMATS)
+        return [learned] + [name for name in FORMATS if name != learned]
+
+    def parse(self, value: Optional[str], site: Optional[str] = None) -> Optional[str]:
+        """Return ``value`` as an ISO 8601 string, or None if it isn't a date."""
+        if not value:
+            return None
+        value = value.strip()
+        for name in self._order(site):
+            parsed = FORMATS[name](value)
+            if parsed is not None:
+                if site:
+                    self._learned[site] = name
+                return parsed.isoformat()
+        return None
+
+    def extract(
+        self,
+        tree,
+        site: Optional[str] = None,
+        sources: Iterable[str] = ('meta', 'time', 'json-ld'),
+        meta_keys: Iterable[str] = DEFAULT_META_KEYS,
+    ) -> Optional[str]:
+        """Find a page's publication date.
+
+        One pass over the tree collects the ``<meta>`` contents, the first
+        ``<time datetime>`` and any JSON-LD ``datePublished``/``dateCreated``.
+        Candidates are then tried in ``sources`` order (``'meta'`` walks
+        ``meta_keys`` in order); the first that parses wins. ``'text'`` scans
+        the start of the page text for a month-name date.
+        """
+        metas: Dict[str, str] = {}
+        time_value = None
+        json_ld: List[str] = []
+        for el in tree.iter('meta', 'time', 'script'):
+            if el.tag == 'meta':
+                content = el.get('content')
+                if content:
+                    for attr in ('property', 'name', 'itemprop'):
+                        key = el.get(attr)
+                        if key:
+                            metas.setdefault(key.lower(), content)
+            elif el.tag == 'time':
+                if time_value is None:
+                    time_value = el.get('datetime')
+            elif (el.get('type') or '').strip().lower() == 'application/ld+json' and el.text:
+                json_ld.extend(_json_ld_dates(el.text))
+
+        for source in sources:
+            if source == 'meta':
+                candidates = [metas.get(key.lower()) for key in meta_keys]
+            elif source == 'time':
+                candidates = [time_value]
+            elif source == 'json-ld':
+                candidates = json_ld
+            elif source == 'text':
+                candidates = [_text_date(tree)]
+            else:
+                raise ValueError(f"Unknown date source: {source}")
+            for candidate in candidates:
+                parsed = self.parse(candidate, site)
+                if parsed:
+                    return parsed
+        return None
+
+
+def _json_ld_dates(text: str) -> List[str]:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return []
+    found = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            for key in ('datePublished', 'dateCreated'):
+                if isinstance(node.get(key), str):
+                    found.append(node[key])
+            if '@graph' in node:
+                stack.append(node['@graph'])
+    return found
+
+
+def _text_date(tree) -> Optional[str]:
+    chunks, length = [], 0
+    for text in _TEXT_NODES(tree):
+        chunks.append(text)
+        length += len(text)
+        if length >= TEXT_SCAN_CHARS:
+            break
+    match = TEXT_DATE.search(''.join(chunks)[:TEXT_SCAN_CHARS])
+    return match.group(0) if match else None
+
+
+_parser = DateParser()
+
+
+def parse_date(value: Optional[str], site: Optional[str] = None) -> Optional[str]:
+    """Normalize a date string to ISO 8601 (or None) with the shared parser."""
+    return _parser.parse(value, site)
+
+
+def extract_date(tree, site: Optional[str] = None, **kwargs) -> Optional[str]:
+    """Find a page's publication date with the shared parser; see ``DateParser.extract``."""
+    return _parser.extract(tree, site, **kwargs)
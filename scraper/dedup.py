@@ -0,0 +1,144 @@
+"""Near-duplicate post detection.
+
+The same article often comes back under several URLs: an AMP page, a print
+view, a category permalink. Each post's text gets a 64-bit simhash over word
+shingles. Posts whose fingerprints differ in at most ``distance`` bits count
+as copies, and only one copy is kept.
+
+Fingerprints are indexed by band, so a lookup does not scan every kept post.
+Two fingerprints within ``distance`` bits of each other must agree exactly on
+at least one of ``distance + 1`` bands, so only posts sharing a band are
+compared.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from html import unescape
+from typing import Any, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+BITS = 64
+# Words per shingle
+SHINGLE = 3
+# Posts shorter than this are never collapsed: too little text to compare
+MIN_WORDS = 50
+# Largest Hamming distance still counted as a duplicate
+DISTANCE = 3
+
+# Per bit of a byte, a translate table mapping each byte to 1 if the bit is set, else 0
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+# URL shapes that mark a copy rather than the canonical page
+_VARIANT_PATH = re.compile(r'/(amp|print|category|tag|feed)(/|$)')
+_VARIANT_QUERY = re.compile(r'(^|&)(amp|print|output=amp|outputType=amp)(=|&|$)', re.IGNORECASE)
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit simhash of ``text``'s word shingles, or None if it is too short.
+
+    A bit is set when more than half the shingle hashes set it. The hashes
+    are laid end to end in one bytes object and each bit position is counted
+    with ``bytes.translate``/``bytes.count``, so no Python loop runs per
+    shingle per bit.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = len(words) - SHINGLE + 1
+    digests = b''.join(
+        hashlib.blake2b(' '.join(words[i:i + SHINGLE]).encode('utf-8'), digest_size=8).digest()
+        for i in range(shingles)
+    )
+    fingerprint = 0
+    for byte in range(BITS // 8):
+        # Digests are little-endian, so bit ``8 * byte + bit`` lives in this column
+        column = digests[byte::8]
+        for bit, table in enumerate(_BIT_TABLES):
+            if 2 * column.translate(table).count(1) > shingles:
+                fingerprint |= 1 << (8 * byte + bit)
+    return fingerprint
+
+
+def post_fingerprint(post) -> Optional[int]:
+    """Simhash of a post's content with the markup stripped.
+
+    A ``fingerprint`` already on the post (set by the parse workers) is used
+    as is.
+    """
+    fingerprint = getattr(post, 'fingerprint', None)
+    if fingerprint is not None:
+        return fingerprint
+    return simhash(unescape(_TAG.sub(' ', post.content_html or '')))
+
+
+def url_rank(url: str) -> Tuple:
+    """Sort key preferring the canonical copy: no AMP/print/category shape, then the shortest URL."""
+    parsed = urlparse(url)
+    variant = bool(_VARIANT_PATH.search(parsed.path.lower()) or _VARIANT_QUERY.search(parsed.query))
+    return (variant, len(parsed.path.rstrip('/')), len(parsed.query), url)
+
+
+class NearDuplicates:
+    """Index of kept posts' fingerprints, used to collapse copies.
+
+    ``collapsed`` lists ``(dropped URL, kept URL)`` for every copy dropped.
+    """
+
+    def __init__(self, distance: int = DISTANCE):
+        self.distance = distance
+        self._band_bits = BITS // (distance + 1)
+        self._bands = [defaultdict(list) for _ in range(distance + 1)]
+        # [fingerprint, url, value] per kept post
+        self._entries: List[list] = []
+        self.collapsed: List[Tuple[str, str]] = []
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << self._band_bits) - 1
+        for i in range(len(self._bands)):
+            yield i, fingerprint >> (i * self._band_bits) & mask
+
+    def _find(self, fingerprint: int) -> Optional[list]:
+        for i, key in self._band_keys(fingerprint):
+            for entry in self._bands[i].get(key, ()):
+                if bin(entry[0] ^ fingerprint).count('1') <= self.distance:
+                    return entry
+        return None
+
+    def offer(self, post, value: Any = None, replace: bool = True) -> Tuple[bool, Any]:
+        """Check a post against the ones kept so far.
+
+        Returns ``(True, None)`` for a new post, ``(False, None)`` for a copy
+        to drop, and ``(True, old_value)`` when the post is a copy with a more
+        canonical URL than the kept one (only if ``replace``): the caller
+        swaps it in where ``old_value`` was.
+        """
+        fingerprint = post_fingerprint(post)
+        if fingerprint is None:
+            return True, None
+        entry = self._find(fingerprint)
+        if entry is None:
+            entry = [fingerprint, post.url, value]
+            self._entries.append(entry)
+            for i, key in self._band_keys(fingerprint):
+                self._bands[i][key].append(entry)
+            return True, None
+        if replace and url_rank(post.url) < url_rank(entry[1]):
+            self.collapsed.append((entry[1], post.url))
+            entry[1] = post.url
+            return True, entry[2]
+        self.collapsed.append((post.url, entry[1]))
+        return False, None
+
+    def collapse(self, posts: Iterable) -> List:
+        """Return ``posts`` with copies removed, in order, keeping canonical URLs."""
+        kept = []
+        for post in posts:
+            keep, slot = self.offer(post, len(kept))
+            if slot is not None:
+                kept[slot] = post
+            elif keep:
+                kept.append(post)
+        return kept
@@ -1,19 +1,31 @@
 """Blog post extraction with multiple strategies."""
 
 import re
+import itertools
 import json
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import List, Optional
-from urllib.parse import urljoin, urlparse
+from dataclasses import dataclass, asdict, field
+from html import unescape
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlencode, urljoin, urlparse
 
 import httpx
+import lxml.html
 from bs4 import BeautifulSoup
+from lxml import etree
 from readability import Document
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from scraper.cache import StrategyCache
+from scraper.dates import extract_date, parse_date
+from scraper.dedup import post_fingerprint
+from scraper.fetch import DATA, PAGE, Fetcher
+from scraper.frontier import Frontier
+from scraper.incremental import Baseline
+from scraper.journal import Journal, iter_journaled
+from scraper.pipeline import ParsePool
+from scraper.sitemap import SitemapEntry, iter_sitemap
 
-@dataclass
+
+@dataclass(slots=True)
 class ExtractedPost:
     title: str
     url: str
@@ -21,13 +33,28 @@ class ExtractedPost:
     slug: str
     published_at: Optional[str] = None
     tags: Optional[List[str]] = None
+    # Content simhash (``scraper.dedup``) computed where the post was parsed; not written out
+    fingerprint: Optional[int] = field(default=None, compare=False, repr=False)
 
     def to_dict(self) -> dict:
         d = asdict(self)
+        del d['fingerprint']
         if d['tags'] is None:
             d['tags'] = []
         return d
 
+    @classmethod
+    def from_dict(cls, d: dict) -> 'ExtractedPost':
+        return cls(**{k: d.get(k) for k in ('title', 'url', 'content_html', 'slug', 'published_at', 'tags')})
+
+
+def _undated_first(post: ExtractedPost):
+    return (post.published_at or '0000', post.url)
+
+
+def _undated_last(post: ExtractedPost):
+    return (post.published_at or '9999', post.url)
+
 
 def _slugify(text: str) -> str:
     """Convert text to URL-friendly slug."""
@@ -37,128 +64,357 @@ def _slugify(text: str) -> str:
     return text.strip('-')[:80]
 
 
-def _parse_date(date_str: Optional[str]) -> Optional[str]:
-    """Try to parse a date string into ISO format."""
-    if not date_str:
-        return None
-    # Common date formats
-    for fmt in (
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S%z',
-        '%Y-%m-%dT%H:%M:%S.%f%z',
-        '%Y-%m-%d',
-        '%B %d, %Y',
-        '%b %d, %Y',
-        '%d %B %Y',
-        '%d %b %Y',
-        '%Y/%m/%d',
-    ):
-        try:
-            dt = datetime.strptime(date_str.strip(), fmt)
-            return dt.isoformat()
-        except ValueError:
-            continue
-    return date_str
+# Parse exactly the way readability does, so handing it our tree is a drop-in swap
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
 
+# Visible text, skipping <script>/<style> like BeautifulSoup's get_text()
+_TEXT_NODES = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+
+def _parse_in_worker(cls, verbose: bool, method: str, *args):
+    """Call an extractor's parse method in a pool worker.
+
+    Parse methods only need ``verbose`` (for logging), so the worker builds a
+    bare instance instead of pickling the extractor and its fetcher. A post
+    comes back with its dedup fingerprint, so hashing its text stays off
+    the process consuming the posts.
+    """
+    parser = cls.__new__(cls)
+    parser.verbose = verbose
+    post = getattr(parser, method)(*args)
+    if isinstance(post, ExtractedPost):
+        post.fingerprint = post_fingerprint(post)
+    return post
+
+
+def _parse_html(html: str) -> lxml.html.HtmlElement:
+    """Parse a page once; the tree feeds both metadata lookup and readability."""
+    return lxml.html.document_fromstring(html.encode('utf-8', 'replace'), parser=_HTML_PARSER)
+
+
+def _text(el, strip: bool = False) -> str:
+    """Text of an element, mirroring BeautifulSoup's ``get_text()``/``get_text(strip=True)``."""
+    if strip:
+        return ''.join(t.strip() for t in _TEXT_NODES(el))
+    return ''.join(_TEXT_NODES(el))
 
-class BlogExtractor:
-    """Extract posts from a blog using multiple strategies."""
+
+def _first(tree, xpath: str, **variables):
+    found = tree.xpath(xpath, **variables)
+    return found[0] if found else None
+
+
+def _is_gone(result) -> bool:
+    """Whether a ``Fetcher.get_all`` result is a definite 404/410."""
+    return isinstance(result, httpx.HTTPStatusError) and result.response.status_code in (404, 410)
+
+
+class BaseExtractor:
+    """Fetch and parse plumbing shared by the extractors.
+
+    Owns the ``Fetcher`` (closing it only if it created one), runs parse
+    methods on the ``ParsePool`` when there is one, replays journaled pages,
+    and with a ``Baseline`` reuses the post for any page the HTTP cache
+    revalidated.
+    """
 
     HEADERS = {
         'User-Agent': 'Replay/0.1 (blog archiver; +https://replay.pub)',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     }
+    # Tag on verbose log lines
+    LOG_NAME = 'extract'
+    baseline: Optional[Baseline] = None
 
-    def __init__(self, url: str, verbose: bool = False):
-        self.url = url.rstrip('/')
+    def __init__(self, verbose: bool = False, fetcher: Optional[Fetcher] = None,
+                 journal: Optional[Journal] = None, parse_pool: Optional[ParsePool] = None):
         self.verbose = verbose
-        self.client = httpx.Client(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        )
+        self.journal = journal
+        self.parse_pool = parse_pool
+        self._owns_fetcher = fetcher is None
+        self.fetcher = fetcher or Fetcher(headers=self.HEADERS, verbose=verbose)
 
     def _log(self, msg: str):
         if self.verbose:
-            print(f"  [extract] {msg}")
+            print(f"  [{self.LOG_NAME}] {msg}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-    )
-    def _fetch(self, url: str) -> httpx.Response:
-        resp = self.client.get(url)
-        resp.raise_for_status()
-        return resp
+    def close(self):
+        """Shut down the HTTP session if this extractor created it."""
+        if self._owns_fetcher:
+            self.fetcher.close()
+
+    def _fetch(self, url: str, kind: str = PAGE) -> httpx.Response:
+        return self.fetcher.get(url, kind=kind)
 
-    def _safe_fetch(self, url: str) -> Optional[httpx.Response]:
+    def _safe_fetch(self, url: str, kind: str = PAGE) -> Optional[httpx.Response]:
         try:
-            return self._fetch(url)
+            return self._fetch(url, kind)
         except Exception as e:
             self._log(f"Failed to fetch {url}: {e}")
             return None
 
-    def extract(self) -> List[ExtractedPost]:
-        """Try extraction strategies in order, return first that works."""
-        strategies = [
-            ('structured archive', self._try_structured_archive),
-            ('sitemap', self._try_sitemap),
-            ('WordPress API', self._try_wp_api),
-            ('archive page', self._try_archive),
-            ('Wayback Machine', self._try_wayback),
+    def _safe_fetch_many(self, urls: List[str], attempts: Optional[int] = None,
+                         kind: str = PAGE) -> List[Optional[httpx.Response]]:
+        """Fetch URLs concurrently; failed fetches come back as None."""
+        return self.fetcher.fetch_all(urls, attempts, kind)
+
+    def _fetch_and_process(self, urls: List[str], process) -> Iterator[Optional[ExtractedPost]]:
+        """Fetch URLs concurrently, yielding each response's post in URL order as it is ready.
+
+        URLs already in the journal are replayed from it instead of refetched,
+        and pages the HTTP cache revalidated (304) reuse the baseline post.
+        """
+        def process_or_reuse(url, resp):
+            if self.baseline is not None and url in self.baseline and resp.extensions.get('cache') == 'revalidated':
+                return self._baseline_post(url)
+            return process(url, resp)
+
+        return iter_journaled(self.fetcher.imap, urls, process_or_reuse, self.journal, ExtractedPost.from_dict)
+
+    async def _parse(self, method: str, *args) -> Optional[ExtractedPost]:
+        """Run a parse method on the parse pool, or inline without one."""
+        if self.parse_pool is None or self.parse_pool.inline:
+            return getattr(self, method)(*args)
+        return await self.parse_pool.run(_parse_in_worker, type(self), self.verbose, method, *args)
+
+    def _baseline_post(self, url: str) -> ExtractedPost:
+        return ExtractedPost.from_dict(self.baseline.post(url))
+
+
+class BlogExtractor(BaseExtractor):
+    """Extract posts from a blog using multiple strategies."""
+
+    # Post order for extract() and the scrape output (iter_posts() yields in fetch order)
+    ORDER_KEY = staticmethod(_undated_first)
+
+    def __init__(
+        self,
+        url: str,
+        verbose: bool = False,
+        fetcher: Optional[Fetcher] = None,
+        strategy_cache: Optional[StrategyCache] = None,
+        journal: Optional[Journal] = None,
+        baseline: Optional[Baseline] = None,
+        parse_pool: Optional[ParsePool] = None,
+    ):
+        super().__init__(verbose, fetcher, journal, parse_pool)
+        self.url = url.rstrip('/')
+        self.strategy_cache = strategy_cache
+        self.baseline = baseline
+        # Probe answers by URL, reused by the strategies instead of refetching
+        self._probed: Dict[str, Union[httpx.Response, Exception]] = {}
+
+    def _sitemap_urls(self) -> List[str]:
+        return [
+            f"{self.url}/sitemap.xml",
+            f"{self.url}/sitemap_index.xml",
+            f"{self.url}/post-sitemap.xml",
+            f"{self.url}/sitemap.xml.gz",
         ]
 
-        for name, strategy in strategies:
-            self._log(f"Trying {name}...")
+    def _structured_archive_urls(self) -> List[str]:
+        return [
+            f"{self.url}/posts",
+            f"{self.url}/archive",
+            f"{self.url}/archives",
+            self.url,
+        ]
+
+    def _probe(self) -> Dict[str, Optional[bool]]:
+        """Cheaply check which strategies can work, in one concurrent batch.
+
+        Probes are single-attempt: a sitemap that parses, a ``wp-json`` posts
+        endpoint that answers with JSON, and an archive page with at least five
+        ``<article>`` elements. A probe is False only on a definite no (every
+        URL answered 404/410 or with a body that does not qualify) and None
+        when a fetch failed, so a transient error does not rule a strategy
+        out. Strategies without a probe are not reported.
+
+        Responses and definite 404/410s are kept in ``_probed`` for the
+        strategies to read instead of fetching the same URLs again.
+        """
+        sitemap_urls = self._sitemap_urls()
+        wp_url = f"{self.url}/wp-json/wp/v2/posts?per_page=1&_fields=id"
+        archive_urls = self._structured_archive_urls()
+        kinds = [DATA] * (len(sitemap_urls) + 1) + [PAGE] * len(archive_urls)
+        results = self.fetcher.get_all(sitemap_urls + [wp_url] + archive_urls, attempts=1, kind=kinds)
+        for url, result in zip(sitemap_urls + [wp_url] + archive_urls, results):
+            if isinstance(result, BaseException):
+                self._log(f"Probe of {url} failed: {result}")
+            if not isinstance(result, BaseException) or _is_gone(result):
+                self._probed[url] = result
+        sitemap_results = results[:len(sitemap_urls)]
+        wp_result = results[len(sitemap_urls)]
+        archive_results = results[len(sitemap_urls) + 1:]
+
+        def has_sitemap_entries(resp) -> bool:
+            return resp.status_code == 200 and next(iter_sitemap(resp.content), None) is not None
+
+        def is_wp_api(resp) -> bool:
+            try:
+                return resp.status_code == 200 and isinstance(resp.json(), list)
+            except ValueError:
+                return False
+
+        def has_articles(resp) -> bool:
             try:
-                posts = strategy()
+                return _parse_html(resp.text).xpath('count(//article)') >= 5
+            except (etree.ParserError, ValueError):
+                return False
+
+        def verdict(results, check) -> Optional[bool]:
+            answers = []
+            for result in results:
+                if _is_gone(result):
+                    answers.append(False)
+                elif isinstance(result, BaseException):
+                    answers.append(None)
+                elif check(result):
+                    return True
+                else:
+                    answers.append(False)
+            return None if None in answers else False
+
+        return {
+            'structured archive': verdict(archive_results, has_articles),
+            'sitemap': verdict(sitemap_results, has_sitemap_entries),
+            'WordPress API': verdict([wp_result], is_wp_api),
+        }
+
+    def _fetch_probed(self, url: str, kind: str = PAGE) -> Optional[httpx.Response]:
+        """``_safe_fetch``, reusing the probe's answer when there is one."""
+        if url in self._probed:
+            result = self._probed[url]
+            return result if isinstance(result, httpx.Response) else None
+        return self._safe_fetch(url, kind)
+
+    def _fetch_probed_many(self, urls: List[str], kind: str = PAGE) -> List[Optional[httpx.Response]]:
+        """``_safe_fetch_many``, fetching only the URLs the probes did not answer."""
+        missing = [url for url in urls if url not in self._probed]
+        fetched = dict(zip(missing, self._safe_fetch_many(missing, kind=kind))) if missing else {}
+        return [fetched[url] if url in fetched else self._fetch_probed(url) for url in urls]
+
+    def _run_strategy(self, name: str, strategy) -> Optional[Iterator[ExtractedPost]]:
+        """Start a strategy and return its posts, or None if it found nothing.
+
+        Strategies may return lazy iterables; only the first post is pulled
+        here to tell success from failure, the rest stream to the caller.
+        """
+        self._log(f"Trying {name}...")
+        metrics = self.fetcher.metrics
+        if metrics:
+            metrics.begin_strategy(name)
+        try:
+            posts = iter(strategy() or ())
+            first = next(posts, None)
+        except Exception as e:
+            self._log(f"{name} failed: {e}")
+            first = None
+        if first is None:
+            if metrics:
+                metrics.end_strategy(name)
+            return None
+        self._log(f"{name} is working")
+        return itertools.chain([first], posts)
+
+    def iter_posts(self) -> Iterator[ExtractedPost]:
+        """Yield posts from the first extraction strategy that works.
+
+        The strategy that won last time for this domain (per the strategy
+        cache) runs first. Otherwise the cheap probes decide which of the
+        probed strategies are worth running; unprobed ones always get a turn.
+        Posts come out in the order they are fetched; sort by ``ORDER_KEY``
+        (as ``extract()`` does) for publication order.
+        """
+        strategies = {
+            'structured archive': self._try_structured_archive,
+            'sitemap': self._try_sitemap,
+            'WordPress API': self._try_wp_api,
+            'archive page': self._try_archive,
+            'Wayback Machine': self._try_wayback,
+        }
+        domain = urlparse(self.url).netloc
+
+        tried = set()
+        posts = winner = None
+        cached = self.strategy_cache.get(domain) if self.strategy_cache else None
+        if cached in strategies:
+            self._log(f"Cached strategy for {domain}: {cached}")
+            tried.add(cached)
+            posts = self._run_strategy(cached, strategies[cached])
+            winner = cached
+
+        metrics = self.fetcher.metrics
+        if not posts:
+            if metrics:
+                metrics.begin_strategy('probes')
+            probes = self._probe()
+            if metrics:
+                metrics.end_strategy('probes')
+            self._log("Probes: " + ', '.join(
+                f"{k}={'unknown' if v is None else 'yes' if v else 'no'}" for k, v in probes.items()
+            ))
+            for name, strategy in strategies.items():
+                if name in tried:
+                    continue
+                if probes.get(name) is False:
+                    self._log(f"Skipping {name} (probe failed)")
+                    continue
+                posts = self._run_strategy(name, strategy)
                 if posts:
-                    self._log(f"{name} found {len(posts)} posts")
-                    # Sort by published_at (oldest first), then by URL as fallback
-                    posts.sort(key=lambda p: (p.published_at or '0000', p.url))
-                    return posts
-            except Exception as e:
-                self._log(f"{name} failed: {e}")
-                continue
+                    winner = name
+                    break
+            self._probed.clear()
+
+        if not posts:
+            self._log("All strategies failed")
+            return
+
+        if self.strategy_cache:
+            self.strategy_cache.set(domain, winner)
+        count = 0
+        try:
+            for post in posts:
+                count += 1
+                yield post
+        finally:
+            if metrics:
+                metrics.end_strategy(winner, count)
+        self._log(f"{winner} found {count} posts")
 
-        self._log("All strategies failed")
-        return []
+    def extract(self) -> List[ExtractedPost]:
+        """Try extraction strategies and return the first that works.
+
+        Posts are sorted by published_at (oldest first), then by URL.
+        """
+        return sorted(self.iter_posts(), key=self.ORDER_KEY)
 
     def _extract_article(self, url: str, html: str) -> Optional[ExtractedPost]:
-        """Use readability to extract article content from HTML."""
+        """Use readability to extract article content from HTML.
+
+        The page is parsed once; dates and tags are read from that tree before
+        it is handed to readability (which prunes it as it goes).
+        """
         try:
-            doc = Document(html, url=url)
+            tree = _parse_html(html)
+            published_at = extract_date(tree, urlparse(url).netloc, sources=('time', 'meta', 'json-ld'))
+
+            tags = [t.strip().lower() for t in tree.xpath('//meta[@property="article:tag"]/@content') if t.strip()]
+
+            doc = Document(tree, url=url)
             title = doc.short_title()
             content = doc.summary()
 
             if not title or not content or len(content) < 100:
                 return None
 
-            # Try to extract date from HTML
-            soup = BeautifulSoup(html, 'lxml')
-            published_at = None
-
-            # Check <time> tags
-            time_tag = soup.find('time', attrs={'datetime': True})
-            if time_tag:
-                published_at = _parse_date(time_tag['datetime'])
-
-            # Check meta tags
-            if not published_at:
-                for prop in ('article:published_time', 'datePublished', 'date'):
-                    meta = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
-                    if meta and meta.get('content'):
-                        published_at = _parse_date(meta['content'])
-                        if published_at:
-                            break
-
             return ExtractedPost(
                 title=title,
                 url=url,
                 content_html=content,
                 slug=_slugify(title),
                 published_at=published_at,
+                tags=tags or None,
             )
         except Exception as e:
             self._log(f"Failed to extract article from {url}: {e}")
@@ -166,17 +422,12 @@ class BlogExtractor:
 
     # ----- Strategy: Structured archive -----
 
-    def _try_structured_archive(self) -> Optional[List[ExtractedPost]]:
+    def _try_structured_archive(self) -> Optional[Iterable[ExtractedPost]]:
         """Parse a structured archive page with <article> elements containing tags and dates."""
-        archive_urls = [
-            f"{self.url}/posts",
-            f"{self.url}/archive",
-            f"{self.url}/archives",
-            self.url,
-        ]
+        archive_urls = self._structured_archive_urls()
 
-        for archive_url in archive_urls:
-            resp = self._safe_fetch(archive_url)
+        responses = self._fetch_probed_many(archive_urls)
+        for archive_url, resp in zip(archive_urls, responses):
             if not resp:
                 continue
 
@@ -190,6 +441,7 @@ class BlogExtractor:
 
             # Parse metadata from each article
             post_meta = []
+            frontier = Frontier()
             for article in articles:
                 title_tag = article.find(['h1', 'h2', 'h3'], class_=lambda c: c is None or 'title' in (c or ''))
                 if not title_tag:
@@ -199,7 +451,9 @@ class BlogExtractor:
                     continue
 
                 title = link.get_text(strip=True)
-                href = urljoin(archive_url, link['href'])
+                href = frontier.add(urljoin(archive_url, link['href']))
+                if not href:
+                    continue
 
                 # Extract tags from links to /tag/ paths
                 tags = []
@@ -231,165 +485,312 @@ class BlogExtractor:
             self._log(f"Parsed {len(post_meta)} posts with metadata, fetching content...")
 
             # Fetch and extract each post, attaching tags
-            posts = []
-            for i, meta in enumerate(post_meta):
-                self._log(f"Fetching {i+1}/{len(post_meta)}: {meta['url']}")
-                resp = self._safe_fetch(meta['url'])
-                if not resp:
-                    continue
-                post = self._extract_article(meta['url'], resp.text)
+            meta_by_url = {meta['url']: meta for meta in post_meta}
+
+            async def process(url, resp):
+                meta = meta_by_url[url]
+                post = await self._parse('_extract_article', url, resp.text)
                 if post:
                     post.tags = meta['tags']
                     # Use the slug from the URL path if available
-                    path = urlparse(meta['url']).path.strip('/')
+                    path = urlparse(url).path.strip('/')
                     if path:
                         post.slug = path.split('/')[-1]
                     # Override date from archive if we didn't get one from the page
                     if not post.published_at and meta['date_str']:
-                        post.published_at = _parse_date(meta['date_str'])
-                    posts.append(post)
+                        post.published_at = parse_date(meta['date_str'], urlparse(url).netloc)
+                return post
 
-            return posts if posts else None
+            return (p for p in self._fetch_and_process(list(meta_by_url), process) if p)
 
         return None
 
     # ----- Strategy: Sitemap -----
 
-    def _try_sitemap(self) -> Optional[List[ExtractedPost]]:
+    def _try_sitemap(self) -> Optional[Iterable[ExtractedPost]]:
         """Parse sitemap.xml for post URLs."""
-        sitemap_urls = [
-            f"{self.url}/sitemap.xml",
-            f"{self.url}/sitemap_index.xml",
-            f"{self.url}/post-sitemap.xml",
-        ]
-
-        post_urls = []
-        for sitemap_url in sitemap_urls:
-            resp = self._safe_fetch(sitemap_url)
+        entries = []
+        for sitemap_url in self._sitemap_urls():
+            resp = self._fetch_probed(sitemap_url, DATA)
             if resp and resp.status_code == 200:
-                urls = self._parse_sitemap(resp.text)
-                if urls:
-                    post_urls.extend(urls)
+                found = self._parse_sitemap(resp.content)
+                if found:
+                    entries.extend(found)
                     break
 
-        if not post_urls:
+        if not entries:
             return None
 
         # Filter to likely post URLs (skip pages like /about, /contact)
-        post_urls = self._filter_post_urls(post_urls)
+        frontier = self._post_frontier()
+        lastmods = {}
+        for entry in entries:
+            url = frontier.add(entry.loc)
+            if url:
+                lastmods[url] = entry.lastmod
+        post_urls = frontier.urls
         self._log(f"Found {len(post_urls)} URLs in sitemap")
 
-        return self._fetch_and_extract(post_urls)
-
-    def _parse_sitemap(self, xml_text: str) -> List[str]:
-        """Parse sitemap XML and return URLs."""
-        soup = BeautifulSoup(xml_text, 'lxml-xml')
-        urls = []
-
-        # Check for sitemap index (contains other sitemaps)
-        sitemaps = soup.find_all('sitemap')
-        if sitemaps:
-            for sm in sitemaps:
-                loc = sm.find('loc')
-                if loc and loc.text:
-                    # Fetch sub-sitemap
-                    resp = self._safe_fetch(loc.text.strip())
-                    if resp:
-                        urls.extend(self._parse_sitemap(resp.text))
-            return urls
-
-        # Regular sitemap
-        for url_tag in soup.find_all('url'):
-            loc = url_tag.find('loc')
-            if loc and loc.text:
-                urls.append(loc.text.strip())
-
-        return urls
-
-    def _filter_post_urls(self, urls: List[str]) -> List[str]:
-        """Filter URLs to likely blog posts."""
-        skip_patterns = (
-            '/tag/', '/category/', '/author/', '/page/',
-            '/about', '/contact', '/privacy', '/terms',
-            '/feed', '/sitemap', '/wp-content/', '/wp-admin/',
-        )
-        parsed_base = urlparse(self.url)
-        filtered = []
-        for url in urls:
-            parsed = urlparse(url)
-            path = parsed.path.rstrip('/')
-            # Must be on the same domain
-            if parsed.netloc != parsed_base.netloc:
-                continue
-            # Skip root
-            if not path or path == '/':
-                continue
-            # Skip common non-post paths
-            if any(pat in path.lower() for pat in skip_patterns):
-                continue
-            # Posts usually have a deeper path
-            if path.count('/') >= 1:
-                filtered.append(url)
-        return filtered
+        posts = []
+        if self.baseline is not None:
+            changed = []
+            for url in post_urls:
+                if self.baseline.unchanged(url, lastmods[url]):
+                    posts.append(self._baseline_post(url))
+                else:
+                    changed.append(url)
+            self._log(f"{len(posts)} unchanged since the baseline")
+            post_urls = changed
+
+        if not post_urls:
+            return posts
+        return itertools.chain(posts, self._fetch_and_extract(post_urls))
+
+    def _parse_sitemap(self, data: bytes) -> List[SitemapEntry]:
+        """Parse a sitemap (plain or gzipped) into URL entries with lastmod.
 
-    def _fetch_and_extract(self, urls: List[str]) -> List[ExtractedPost]:
+        Sitemap indexes are walked level by level, fetching each level's
+        child sitemaps concurrently. Each child is parsed as soon as it
+        arrives and its body dropped, so only a bounded window of bodies is
+        ever in memory.
+        """
+        entries = []
+        seen = set()
+
+        def walk(found) -> List[str]:
+            """Collect one sitemap's URL entries and return its unseen children."""
+            children = []
+            for kind, entry in found:
+                if kind == 'url':
+                    entries.append(entry)
+                elif entry.loc not in seen:
+                    seen.add(entry.loc)
+                    children.append(entry.loc)
+            return children
+
+        def parse(url, resp):
+            return list(iter_sitemap(resp.content)) if resp else []
+
+        children = walk(iter_sitemap(data))
+        while children:
+            self._log(f"Fetching {len(children)} child sitemaps...")
+            level = []
+            for found in self.fetcher.imap(children, parse, kind=DATA):
+                level.extend(walk(found))
+            children = level
+        return entries
+
+    # Paths that are never posts
+    SKIP_PATTERNS = (
+        '/tag/', '/category/', '/author/', '/page/',
+        '/about', '/contact', '/privacy', '/terms',
+        '/feed', '/sitemap', '/wp-content/', '/wp-admin/',
+    )
+
+    def _is_post_url(self, url: str) -> bool:
+        """Whether a URL is likely a blog post."""
+        parsed = urlparse(url)
+        path = parsed.path.rstrip('/')
+        # Must be on the same domain
+        if parsed.netloc != urlparse(self.url).netloc.lower():
+            return False
+        # Skip root
+        if not path or path == '/':
+            return False
+        # Skip common non-post paths
+        if any(pat in path.lower() for pat in self.SKIP_PATTERNS):
+            return False
+        # Posts usually have a deeper path
+        return path.count('/') >= 1
+
+    def _post_frontier(self) -> Frontier:
+        """A frontier that keeps only likely post URLs, each once."""
+        return Frontier(accept=self._is_post_url)
+
+    def _fetch_and_extract(self, urls: List[str]) -> Iterator[ExtractedPost]:
         """Fetch each URL and extract article content."""
-        posts = []
-        for i, url in enumerate(urls):
-            self._log(f"Fetching {i+1}/{len(urls)}: {url}")
-            resp = self._safe_fetch(url)
-            if not resp:
-                continue
-            post = self._extract_article(url, resp.text)
-            if post:
-                posts.append(post)
-        return posts if posts else None
+        self._log(f"Fetching {len(urls)} URLs...")
+        results = self._fetch_and_process(urls, lambda url, resp: self._parse('_extract_article', url, resp.text))
+        return (p for p in results if p)
 
     # ----- Strategy: WordPress API -----
 
-    def _try_wp_api(self) -> Optional[List[ExtractedPost]]:
-        """Try WordPress REST API."""
-        api_url = f"{self.url}/wp-json/wp/v2/posts"
-        posts = []
-        page = 1
+    # Only the post fields _try_wp_api reads; WordPress drops the rest server-side
+    WP_POST_FIELDS = 'title,content,link,slug,date,categories,tags'
+    WP_TERM_FIELDS = 'id,name,slug'
 
-        while True:
-            resp = self._safe_fetch(f"{api_url}?per_page=100&page={page}&orderby=date&order=asc")
-            if not resp or resp.status_code != 200:
-                break
+    def _wp_collections(self, endpoints: Dict[str, str]) -> Dict[str, Optional[List[dict]]]:
+        """Fetch every page of several paginated ``wp-json`` collections.
 
-            data = resp.json()
-            if not data:
-                break
+        First pages of all endpoints go out in one batch; their
+        ``X-WP-TotalPages`` headers then size a second batch holding every
+        remaining page. A collection whose first page fails comes back None.
+        """
+        names = list(endpoints)
 
-            for item in data:
-                title = BeautifulSoup(item.get('title', {}).get('rendered', ''), 'html.parser').get_text()
-                content = item.get('content', {}).get('rendered', '')
+        def page_url(name, page):
+            sep = '&' if '?' in endpoints[name] else '?'
+            return f"{endpoints[name]}{sep}per_page=100&page={page}"
+
+        def items(resp) -> Optional[List[dict]]:
+            if not resp or resp.status_code != 200:
+                return None
+            try:
+                data = resp.json()
+            except ValueError:
+                return None
+            return data if isinstance(data, list) else None
+
+        results: Dict[str, Optional[List[dict]]] = {}
+        rest = []
+        first_pages = self._safe_fetch_many([page_url(name, 1) for name in names], kind=DATA)
+        for name, resp in zip(names, first_pages):
+            results[name] = items(resp)
+            if results[name]:
+                try:
+                    total_pages = int(resp.headers.get('X-WP-TotalPages', 1))
+                except ValueError:
+                    total_pages = 1
+                rest.extend((name, page) for page in range(2, total_pages + 1))
+
+        if rest:
+            self._log(f"Fetching {len(rest)} more API pages...")
+            responses = self._safe_fetch_many([page_url(name, page) for name, page in rest], kind=DATA)
+            for (name, _), resp in zip(rest, responses):
+                results[name].extend(items(resp) or [])
+        return results
+
+    def _try_wp_api(self) -> Optional[Iterable[ExtractedPost]]:
+        """Try WordPress REST API.
+
+        Requests only the fields we use via ``_fields=`` and pulls the
+        category and tag lists alongside the posts so term IDs can be
+        resolved to names without a request per post. With a baseline, the
+        first pass lists just each post's link and ``modified_gmt``; full
+        content is then fetched (by ``include=``) only for new or changed posts.
+        """
+        api_url = f"{self.url}/wp-json/wp/v2"
+        listing_fields = 'id,link,modified_gmt' if self.baseline is not None else self.WP_POST_FIELDS
+        collections = self._wp_collections({
+            'posts': f"{api_url}/posts?orderby=date&order=asc&_fields={listing_fields}",
+            'categories': f"{api_url}/categories?_fields={self.WP_TERM_FIELDS}",
+            'tags': f"{api_url}/tags?_fields={self.WP_TERM_FIELDS}",
+        })
+        if not collections['posts']:
+            return None
+
+        posts = []
+        items = collections['posts']
+        if self.baseline is not None:
+            changed_ids = []
+            for item in items:
                 link = item.get('link', '')
-                slug = item.get('slug', _slugify(title))
-                date = item.get('date')
-
-                if title and content:
-                    posts.append(ExtractedPost(
-                        title=title,
-                        url=link,
-                        content_html=content,
-                        slug=slug,
-                        published_at=_parse_date(date),
-                    ))
-
-            # Check for more pages
-            total_pages = int(resp.headers.get('X-WP-TotalPages', 1))
-            if page >= total_pages:
-                break
-            page += 1
+                if self.baseline.unchanged(link, item.get('modified_gmt')):
+                    posts.append(self._baseline_post(link))
+                elif item.get('id') is not None:
+                    changed_ids.append(item['id'])
+            self._log(f"{len(posts)} unchanged since the baseline, {len(changed_ids)} to fetch")
+            items = self._wp_posts_by_id(api_url, changed_ids)
+
+        term_names = {}
+        for taxonomy in ('categories', 'tags'):
+            for term in collections[taxonomy] or []:
+                if term.get('slug') != 'uncategorized' and term.get('name'):
+                    term_names[(taxonomy, term.get('id'))] = unescape(term['name']).strip().lower()
+
+        for item in items:
+            title = BeautifulSoup(item.get('title', {}).get('rendered', ''), 'html.parser').get_text()
+            content = item.get('content', {}).get('rendered', '')
+            link = item.get('link', '')
+            slug = item.get('slug', _slugify(title))
+            date = item.get('date')
+
+            tags = []
+            for taxonomy in ('categories', 'tags'):
+                for term_id in item.get(taxonomy) or []:
+                    name = term_names.get((taxonomy, term_id))
+                    if name and name not in tags:
+                        tags.append(name)
+
+            if title and content:
+                posts.append(ExtractedPost(
+                    title=title,
+                    url=link,
+                    content_html=content,
+                    slug=slug,
+                    published_at=parse_date(date, urlparse(self.url).netloc),
+                    tags=tags or None,
+                ))
 
         return posts if posts else None
 
+    def _wp_posts_by_id(self, api_url: str, ids: List[int]) -> List[dict]:
+        """Fetch full post objects for ``ids``, 100 per request, concurrently."""
+        if not ids:
+            return []
+        urls = [
+            f"{api_url}/posts?include={','.join(str(i) for i in ids[start:start + 100])}"
+            f"&per_page=100&_fields={self.WP_POST_FIELDS}"
+            for start in range(0, len(ids), 100)
+        ]
+        items = []
+        for resp in self._safe_fetch_many(urls, kind=DATA):
+            if resp and resp.status_code == 200:
+                try:
+                    items.extend(resp.json())
+                except ValueError:
+                    continue
+        return items
+
     # ----- Strategy: Archive page -----
 
-    def _try_archive(self) -> Optional[List[ExtractedPost]]:
-        """Scrape post links from the blog's main/archive pages."""
+    # Upper bound on listing pages the archive crawl fetches
+    ARCHIVE_MAX_PAGES = 200
+    # Pagination links: WordPress-style /page/N, ?page=N / ?paged=N, and "Older posts" text
+    PAGE_PATH = re.compile(r'/page/\d+/?$')
+    PAGE_QUERY = re.compile(r'(?:^|&)(?:page|paged)=\d+(?:&|$)')
+    OLDER_LINK_TEXT = re.compile(r'^\W*(older|next|previous|earlier)( posts| entries| page)?\W*$', re.IGNORECASE)
+
+    def _archive_links(self, page_url: str, html: str):
+        """Return a listing page's candidate post links and its pagination links."""
+        try:
+            tree = _parse_html(html)
+        except (etree.ParserError, ValueError):
+            return [], []
+        netloc = urlparse(self.url).netloc
+        posts, pages = [], []
+        for el in tree.iter('a', 'link'):
+            href = el.get('href')
+            if not href:
+                continue
+            href = urljoin(page_url, href)
+            parsed = urlparse(href)
+            if parsed.netloc != netloc:
+                continue
+            rel = (el.get('rel') or '').lower().split()
+            if ('next' in rel or self.PAGE_PATH.search(parsed.path) or self.PAGE_QUERY.search(parsed.query)
+                    or (el.tag == 'a' and self.OLDER_LINK_TEXT.match(' '.join(_text(el).split()) or '-'))):
+                pages.append(href)
+                continue
+            if el.tag != 'a':
+                continue
+
+            # Heuristic: posts tend to have longer paths
+            path = parsed.path.rstrip('/')
+            segments = [s for s in path.split('/') if s]
+            if len(segments) >= 2 or (len(segments) == 1 and len(segments[0]) > 10):
+                posts.append(href)
+        return posts, pages
+
+    def _try_archive(self) -> Optional[Iterable[ExtractedPost]]:
+        """Crawl the blog's archive pages for post links.
+
+        The first of the common archive locations that links to posts is the
+        starting page. From there pagination (``rel=next``, ``/page/N``,
+        "Older posts" links) is followed breadth-first, fetching each level
+        of listing pages concurrently, until a level turns up no new posts or
+        ``ARCHIVE_MAX_PAGES`` listing pages have been read.
+        """
         # Try common archive patterns
         archive_urls = [
             self.url,
@@ -400,152 +801,149 @@ class BlogExtractor:
             f"{self.url}/all",
         ]
 
-        post_links = set()
+        frontier = self._post_frontier()
+        pages = Frontier()
+
+        def unseen(urls: List[str]) -> List[str]:
+            return [url for url in urls if len(pages) < self.ARCHIVE_MAX_PAGES and pages.add(url)]
+
+        level = []
         for archive_url in archive_urls:
-            resp = self._safe_fetch(archive_url)
+            resp = self._fetch_probed(archive_url)
             if not resp:
                 continue
+            pages.add(archive_url)
+            posts, next_pages = self._archive_links(archive_url, resp.text)
+            frontier.extend(posts)
+            if frontier:
+                level = unseen(next_pages)
+                break
 
-            soup = BeautifulSoup(resp.text, 'lxml')
-
-            # Find all links that look like blog posts
-            for link in soup.find_all('a', href=True):
-                href = urljoin(archive_url, link['href'])
-                parsed = urlparse(href)
-                path = parsed.path.rstrip('/')
+        if not frontier:
+            return None
 
-                if not path or path == '/':
-                    continue
-                if parsed.netloc != urlparse(self.url).netloc:
+        while level:
+            self._log(f"Following {len(level)} archive pages...")
+            found = len(frontier)
+            next_level = []
+            for page_url, resp in zip(level, self._safe_fetch_many(level)):
+                if not resp or resp.status_code != 200:
                     continue
-
-                # Heuristic: posts tend to have longer paths
-                segments = [s for s in path.split('/') if s]
-                if len(segments) >= 2 or (len(segments) == 1 and len(segments[0]) > 10):
-                    post_links.add(href)
-
-            if post_links:
+                posts, next_pages = self._archive_links(page_url, resp.text)
+                frontier.extend(posts)
+                next_level.extend(unseen(next_pages))
+            if len(frontier) == found:
                 break
+            level = next_level
 
-        post_links = list(self._filter_post_urls(list(post_links)))
-        if not post_links:
-            return None
-
-        self._log(f"Found {len(post_links)} post links on archive page")
-        return self._fetch_and_extract(post_links)
+        self._log(f"Found {len(frontier)} post links on {len(pages)} archive pages")
+        return self._fetch_and_extract(frontier.urls)
 
     # ----- Strategy: Wayback Machine -----
 
-    def _try_wayback(self) -> Optional[List[ExtractedPost]]:
-        """Use Wayback Machine CDX API to find archived posts."""
-        parsed = urlparse(self.url)
-        domain = parsed.netloc
+    WAYBACK_HOST = 'web.archive.org'
+    # Seconds between snapshot requests; snapshots are fetched concurrently under this cap
+    WAYBACK_DELAY = 1.0
+    # Rows per CDX page; later pages are requested with the returned resume key
+    CDX_PAGE_SIZE = 5000
 
-        cdx_url = (
-            f"https://web.archive.org/cdx/search/cdx"
-            f"?url={domain}/*&output=json&fl=timestamp,original,statuscode"
-            f"&filter=statuscode:200&filter=mimetype:text/html"
-            f"&collapse=urlkey&limit=500"
-        )
+    def _cdx_rows(self, domain: str):
+        """Yield ``(timestamp, original)`` for every capture in the CDX index.
 
-        resp = self._safe_fetch(cdx_url)
-        if not resp:
-            return None
-
-        data = resp.json()
-        if len(data) < 2:  # First row is headers
-            return None
+        Pages through the whole index with ``showResumeKey``: each response
+        ends with an empty row followed by the key for the next page.
+        """
+        query = {
+            'url': f"{domain}/*",
+            'output': 'json',
+            'fl': 'timestamp,original',
+            'filter': ['statuscode:200', 'mimetype:text/html'],
+            'collapse': 'urlkey',
+            'limit': self.CDX_PAGE_SIZE,
+            'showResumeKey': 'true',
+        }
+        resume_key = None
+        while True:
+            params = dict(query, resumeKey=resume_key) if resume_key else query
+            resp = self._safe_fetch(f"https://{self.WAYBACK_HOST}/cdx/search/cdx?{urlencode(params, doseq=True)}", DATA)
+            if not resp:
+                return
+            try:
+                rows = resp.json()
+            except ValueError:
+                return
+
+            resume_key = None
+            if len(rows) >= 2 and rows[-2] == [] and len(rows[-1]) == 1:
+                resume_key = rows[-1][0]
+                rows = rows[:-2]
+            for row in rows[1:]:  # First row is headers
+                if len(row) == 2:
+                    yield row[0], row[1]
+            if not resume_key:
+                return
+
+    def _try_wayback(self) -> Optional[Iterable[ExtractedPost]]:
+        """Use Wayback Machine CDX API to find archived posts.
+
+        Snapshots are requested through the raw ``id_`` form, which serves
+        the page as archived without the Wayback toolbar and link rewriting.
+        """
+        domain = urlparse(self.url).netloc
 
         # Build wayback URLs
+        # The CDX index lists http/https, ``:80`` and query-string variants
+        # of the same page separately; only the first capture is fetched
         post_urls = []
-        seen = set()
-        for row in data[1:]:
-            timestamp, original_url, status = row
-            if original_url in seen:
-                continue
-            seen.add(original_url)
-
-            # Filter to likely posts
-            parsed_url = urlparse(original_url)
-            path = parsed_url.path.rstrip('/')
-            if not path or path == '/':
-                continue
-
-            wayback_url = f"https://web.archive.org/web/{timestamp}/{original_url}"
-            post_urls.append((original_url, wayback_url))
-
-        post_urls = [(orig, wb) for orig, wb in post_urls
-                     if orig in self._filter_post_urls([orig])]
+        frontier = self._post_frontier()
+        for timestamp, original_url in self._cdx_rows(domain):
+            url = frontier.add(original_url)
+            if url:
+                wayback_url = f"https://{self.WAYBACK_HOST}/web/{timestamp}id_/{original_url}"
+                post_urls.append((url, wayback_url))
 
         if not post_urls:
             return None
 
         self._log(f"Found {len(post_urls)} archived URLs")
 
-        posts = []
-        for orig_url, wayback_url in post_urls:
-            self._log(f"Fetching from Wayback: {orig_url}")
-            resp = self._safe_fetch(wayback_url)
-            if not resp:
-                continue
-            post = self._extract_article(orig_url, resp.text)
-            if post:
-                posts.append(post)
+        limiter = self.fetcher.limiter
+        if self.WAYBACK_HOST not in limiter.host_delays:
+            limiter.set_delay(self.WAYBACK_HOST, max(limiter.delay, self.WAYBACK_DELAY))
 
-        return posts if posts else None
+        self._log(f"Fetching {len(post_urls)} snapshots from Wayback...")
+        original = {wb: orig for orig, wb in post_urls}
+        results = self._fetch_and_process(
+            list(original), lambda wb, resp: self._parse('_extract_article', original[wb], resp.text),
+        )
+        return (p for p in results if p)
 
 
-class IllichExtractor:
+class IllichExtractor(BaseExtractor):
     """Extract chapters from henryzoo.com/illich books."""
 
     BASE_URL = "https://henryzoo.com"
-    HEADERS = {
-        'User-Agent': 'Replay/0.1 (blog archiver; +https://replay.pub)',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    }
+    LOG_NAME = 'illich'
+    # Chapters keep the book index order
+    ORDER_KEY = None
 
-    def __init__(self, book_url: str, verbose: bool = False):
+    def __init__(self, book_url: str, verbose: bool = False, fetcher: Optional[Fetcher] = None,
+                 journal: Optional[Journal] = None, parse_pool: Optional[ParsePool] = None):
         """
         Initialize with a book URL.
 
         Args:
             book_url: URL to book index, e.g. https://henryzoo.com/illich/celebration-of-awareness/
         """
+        super().__init__(verbose, fetcher, journal, parse_pool)
         self.book_url = book_url.rstrip('/')
-        self.verbose = verbose
-        self.client = httpx.Client(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        )
 
-    def _log(self, msg: str):
-        if self.verbose:
-            print(f"  [illich] {msg}")
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-    )
-    def _fetch(self, url: str) -> httpx.Response:
-        resp = self.client.get(url)
-        resp.raise_for_status()
-        return resp
-
-    def _safe_fetch(self, url: str) -> Optional[httpx.Response]:
-        try:
-            return self._fetch(url)
-        except Exception as e:
-            self._log(f"Failed to fetch {url}: {e}")
-            return None
-
-    def extract(self) -> List[ExtractedPost]:
-        """Extract all chapters from the book as posts."""
+    def iter_posts(self) -> Iterator[ExtractedPost]:
+        """Yield the book's chapters as posts, in index order, as they are fetched."""
         self._log(f"Fetching book index: {self.book_url}")
         resp = self._safe_fetch(self.book_url)
         if not resp:
-            return []
+            return
 
         soup = BeautifulSoup(resp.text, 'lxml')
 
@@ -563,13 +961,14 @@ class IllichExtractor:
 
         # Find all chapter links - they follow pattern /illich/slug
         chapter_links = []
+        frontier = Frontier()
         for link in soup.find_all('a', href=True):
             href = link['href']
             # Match /illich/something but not /illich/something/something (book indexes)
             if href.startswith('/illich/') and href.count('/') == 2:
-                full_url = urljoin(self.BASE_URL, href)
                 title = link.get_text(strip=True)
-                if title and full_url not in [c['url'] for c in chapter_links]:
+                full_url = title and frontier.add(urljoin(self.BASE_URL, href))
+                if full_url:
                     chapter_links.append({'url': full_url, 'title': title})
 
         # Filter out navigation links (Back to archive, etc.)
@@ -577,80 +976,66 @@ class IllichExtractor:
 
         self._log(f"Found {len(chapter_links)} chapters")
 
-        posts = []
-        for i, chapter in enumerate(chapter_links):
-            self._log(f"Fetching chapter {i+1}/{len(chapter_links)}: {chapter['title']}")
-            resp = self._safe_fetch(chapter['url'])
-            if not resp:
-                continue
+        chapter_titles = {c['url']: c['title'] for c in chapter_links}
 
-            post = self._extract_chapter(chapter['url'], resp.text, book_name)
-            if post:
-                # Use the chapter title from the index if extraction gave a bad title
-                if not post.title or post.title.startswith('1.') or len(post.title) > 100:
-                    post.title = chapter['title']
-                # Store chapter order for sorting
-                post._chapter_order = i
-                posts.append(post)
+        async def process(url, resp):
+            post = await self._parse('_extract_chapter', url, resp.text, book_name)
+            # Use the chapter title from the index if extraction gave a bad title
+            if post and (not post.title or post.title.startswith('1.') or len(post.title) > 100):
+                post.title = chapter_titles[url]
+            return post
 
-        # Sort by chapter order (as they appear in the book index)
-        posts.sort(key=lambda p: getattr(p, '_chapter_order', 999))
+        # Results come back in index order, so posts keep the book's chapter order
+        results = self._fetch_and_process([c['url'] for c in chapter_links], process)
+        yield from (p for p in results if p)
 
-        return posts
+    def extract(self) -> List[ExtractedPost]:
+        """Extract all chapters from the book as posts."""
+        return list(self.iter_posts())
 
     def _extract_chapter(self, url: str, html: str, book_name: Optional[str]) -> Optional[ExtractedPost]:
         """Extract chapter content from HTML."""
-        soup = BeautifulSoup(html, 'lxml')
+        try:
+            tree = _parse_html(html)
+        except (etree.ParserError, ValueError):
+            return None
 
         # Extract title - prefer h1, then h2, then title tag
         title = None
-        h1 = soup.find('h1')
-        if h1:
-            h1_text = h1.get_text(strip=True)
+        h1 = tree.find('.//h1')
+        if h1 is not None:
+            h1_text = _text(h1, strip=True)
             # Skip if it's just the site name
             if h1_text and h1_text.lower() not in ('henry\'s zoo', 'henrys zoo', 'ivan illich'):
                 title = h1_text
         if not title:
-            h2 = soup.find('h2')
-            if h2:
-                title = h2.get_text(strip=True)
+            h2 = tree.find('.//h2')
+            if h2 is not None:
+                title = _text(h2, strip=True)
         if not title:
-            title_tag = soup.find('title')
-            if title_tag:
-                title = title_tag.get_text(strip=True).split('|')[0].strip()
+            title_tag = tree.find('.//title')
+            if title_tag is not None:
+                title = _text(title_tag, strip=True).split('|')[0].strip()
 
         if not title:
             return None
 
-        # Extract date - look for common patterns
-        published_at = None
-        # Try meta tags
-        for prop in ('article:published_time', 'datePublished', 'date'):
-            meta = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
-            if meta and meta.get('content'):
-                published_at = _parse_date(meta['content'])
-                if published_at:
-                    break
-
-        # Try to find date in text (e.g., "January 3rd, 1971")
-        if not published_at:
-            # Look for date patterns in the first few paragraphs
-            date_pattern = re.compile(r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}', re.IGNORECASE)
-            text = soup.get_text()[:2000]
-            match = date_pattern.search(text)
-            if match:
-                date_str = match.group(0).replace('st', '').replace('nd', '').replace('rd', '').replace('th', '')
-                published_at = _parse_date(date_str)
+        # Extract date - meta tags, then a date in the opening text (e.g., "January 3rd, 1971")
+        published_at = extract_date(tree, urlparse(url).netloc, sources=('meta', 'json-ld', 'text'))
 
         # Extract main content using readability
+        fallback = None
+        for xpath in ('//main', '//article', '//div[contains(concat(" ", normalize-space(@class), " "), " content ")]'):
+            fallback = _first(tree, xpath)
+            if fallback is not None:
+                break
         try:
-            doc = Document(html, url=url)
+            doc = Document(tree, url=url)
             content_html = doc.summary()
         except Exception:
-            # Fallback: find main content area
-            main = soup.find('main') or soup.find('article') or soup.find('div', class_='content')
-            if main:
-                content_html = str(main)
+            # Fallback: main content area, located before readability pruned the tree
+            if fallback is not None:
+                content_html = lxml.html.tostring(fallback, encoding='unicode')
             else:
                 return None
 
@@ -675,17 +1060,15 @@ class IllichExtractor:
         )
 
 
-class GwernExtractor:
+class GwernExtractor(BaseExtractor):
     """Extract essays from gwern.net using the index page for theme-based tagging.
 
     Each essay is tagged with the theme sections it appears under on gwern.net/index.
     """
 
     BASE_URL = "https://gwern.net"
-    HEADERS = {
-        'User-Agent': 'Replay/0.1 (blog archiver; +https://replay.pub)',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    }
+    LOG_NAME = 'gwern'
+    ORDER_KEY = staticmethod(_undated_last)
 
     # Theme → list of URL paths from gwern.net/index
     # Excludes: Newest, Newest: Blog, Personal, Reviews, Reviews: Books
@@ -899,39 +1282,12 @@ class GwernExtractor:
         ],
     }
 
-    def __init__(self, verbose: bool = False):
-        self.verbose = verbose
-        self.client = httpx.Client(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        )
-
-    def _log(self, msg: str):
-        if self.verbose:
-            print(f"  [gwern] {msg}")
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-    )
-    def _fetch(self, url: str) -> httpx.Response:
-        resp = self.client.get(url)
-        resp.raise_for_status()
-        return resp
-
-    def _safe_fetch(self, url: str) -> Optional[httpx.Response]:
-        try:
-            return self._fetch(url)
-        except Exception as e:
-            self._log(f"Failed to fetch {url}: {e}")
-            return None
-
-    def extract(self) -> List[ExtractedPost]:
-        """Extract all essays, tagged by theme from the index."""
-        import time
+    def __init__(self, verbose: bool = False, fetcher: Optional[Fetcher] = None,
+                 journal: Optional[Journal] = None, parse_pool: Optional[ParsePool] = None):
+        super().__init__(verbose, fetcher, journal, parse_pool)
 
+    def iter_posts(self) -> Iterator[ExtractedPost]:
+        """Yield essays tagged by theme from the index, in fetch order."""
         # Build reverse mapping: URL path → list of themes
         url_themes: dict = {}
         for theme, paths in self.THEME_URLS.items():
@@ -941,62 +1297,48 @@ class GwernExtractor:
         unique_paths = list(url_themes.keys())
         self._log(f"{len(self.THEME_URLS)} themes, {len(unique_paths)} unique URLs")
 
-        posts = []
-        for i, path in enumerate(unique_paths):
-            url = f"{self.BASE_URL}{path}"
-            self._log(f"Fetching {i+1}/{len(unique_paths)}: {path}")
-
-            resp = self._safe_fetch(url)
-            if not resp:
-                continue
-
-            post = self._extract_essay(url, resp.text)
+        async def process(url, resp):
+            post = await self._parse('_extract_essay', url, resp.text)
             if post:
-                post.tags = url_themes[path]
-                posts.append(post)
+                post.tags = url_themes[url[len(self.BASE_URL):]]
+            return post
 
-            time.sleep(0.5)  # Be polite
+        urls = [f"{self.BASE_URL}{path}" for path in unique_paths]
+        yield from (p for p in self._fetch_and_process(urls, process) if p)
 
-        # Sort by date (oldest first), then URL
-        posts.sort(key=lambda p: (p.published_at or '9999', p.url))
+    def extract(self) -> List[ExtractedPost]:
+        """Extract all essays, sorted by date (oldest first, undated last), then URL."""
+        posts = sorted(self.iter_posts(), key=self.ORDER_KEY)
         self._log(f"Extracted {len(posts)} essays")
         return posts
 
     def _extract_essay(self, url: str, html: str) -> Optional[ExtractedPost]:
         """Extract essay content from a gwern.net page."""
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = _parse_html(html)
 
             # Title: prefer #title or h1, fall back to <title>
             title = None
-            title_el = soup.find(id='title') or soup.find('h1')
-            if title_el:
-                title = title_el.get_text(strip=True)
+            title_el = _first(tree, '//*[@id="title"]')
+            if title_el is None:
+                title_el = tree.find('.//h1')
+            if title_el is not None:
+                title = _text(title_el, strip=True)
             if not title:
-                title_tag = soup.find('title')
-                if title_tag:
-                    title = title_tag.get_text(strip=True).split('·')[0].strip()
+                title_tag = tree.find('.//title')
+                if title_tag is not None:
+                    title = _text(title_tag, strip=True).split('·')[0].strip()
             if not title:
                 return None
 
             # Date: gwern uses <meta name="dc.date.modified"> and similar
-            published_at = None
-            for attr_name in ('dc.date.modified', 'dcterms.modified', 'dc.date.created',
-                              'dcterms.created', 'date'):
-                meta = soup.find('meta', attrs={'name': attr_name})
-                if meta and meta.get('content'):
-                    published_at = _parse_date(meta['content'])
-                    if published_at:
-                        break
-
-            if not published_at:
-                # Try article:published_time
-                meta = soup.find('meta', attrs={'property': 'article:published_time'})
-                if meta and meta.get('content'):
-                    published_at = _parse_date(meta['content'])
-
-            # Content: use readability
-            doc = Document(html, url=url)
+            published_at = extract_date(tree, urlparse(url).netloc, sources=('meta', 'json-ld'), meta_keys=(
+                'dc.date.modified', 'dcterms.modified', 'dc.date.created', 'dcterms.created', 'date',
+                'article:published_time',
+            ))
+
+            # Content: use readability on the same tree
+            doc = Document(tree, url=url)
             content_html = doc.summary()
 
             if not content_html or len(content_html) < 100:
@@ -1018,17 +1360,15 @@ class GwernExtractor:
             return None
 
 
-class RickoverExtractor:
+class RickoverExtractor(BaseExtractor):
     """Extract speeches/writings from rickovercorpus.org, tagged by theme.
 
     Each speech is tagged with the themes assigned on the blog page.
     """
 
     BASE_URL = "https://rickovercorpus.org"
-    HEADERS = {
-        'User-Agent': 'Replay/0.1 (blog archiver; +https://replay.pub)',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    }
+    LOG_NAME = 'rickover'
+    ORDER_KEY = staticmethod(_undated_last)
 
     THEME_URLS = {
         "Management": [
@@ -1129,39 +1469,12 @@ class RickoverExtractor:
         ],
     }
 
-    def __init__(self, verbose: bool = False):
-        self.verbose = verbose
-        self.client = httpx.Client(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        )
-
-    def _log(self, msg: str):
-        if self.verbose:
-            print(f"  [rickover] {msg}")
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-    )
-    def _fetch(self, url: str) -> httpx.Response:
-        resp = self.client.get(url)
-        resp.raise_for_status()
-        return resp
-
-    def _safe_fetch(self, url: str) -> Optional[httpx.Response]:
-        try:
-            return self._fetch(url)
-        except Exception as e:
-            self._log(f"Failed to fetch {url}: {e}")
-            return None
-
-    def extract(self) -> List[ExtractedPost]:
-        """Extract all speeches, tagged by theme."""
-        import time
+    def __init__(self, verbose: bool = False, fetcher: Optional[Fetcher] = None,
+                 journal: Optional[Journal] = None, parse_pool: Optional[ParsePool] = None):
+        super().__init__(verbose, fetcher, journal, parse_pool)
 
+    def iter_posts(self) -> Iterator[ExtractedPost]:
+        """Yield speeches tagged by theme, in fetch order."""
         # Build reverse mapping: URL path -> list of themes
         url_themes: dict = {}
         for theme, paths in self.THEME_URLS.items():
@@ -1171,63 +1484,45 @@ class RickoverExtractor:
         unique_paths = list(url_themes.keys())
         self._log(f"{len(self.THEME_URLS)} themes, {len(unique_paths)} unique URLs")
 
-        posts = []
-        for i, path in enumerate(unique_paths):
-            url = f"{self.BASE_URL}{path}"
-            self._log(f"Fetching {i+1}/{len(unique_paths)}: {path}")
-
-            resp = self._safe_fetch(url)
-            if not resp:
-                continue
-
-            post = self._extract_speech(url, resp.text)
+        async def process(url, resp):
+            post = await self._parse('_extract_speech', url, resp.text)
             if post:
-                post.tags = url_themes[path]
-                posts.append(post)
+                post.tags = url_themes[url[len(self.BASE_URL):]]
+            return post
 
-            time.sleep(0.5)
+        urls = [f"{self.BASE_URL}{path}" for path in unique_paths]
+        yield from (p for p in self._fetch_and_process(urls, process) if p)
 
-        # Sort by date (oldest first), then URL
-        posts.sort(key=lambda p: (p.published_at or '9999', p.url))
+    def extract(self) -> List[ExtractedPost]:
+        """Extract all speeches, sorted by date (oldest first, undated last), then URL."""
+        posts = sorted(self.iter_posts(), key=self.ORDER_KEY)
         self._log(f"Extracted {len(posts)} speeches")
         return posts
 
     def _extract_speech(self, url: str, html: str) -> Optional[ExtractedPost]:
         """Extract speech content from a rickovercorpus.org page."""
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = _parse_html(html)
 
             # Title from h1 or <title>
             title = None
-            h1 = soup.find('h1')
-            if h1:
-                title = h1.get_text(strip=True)
+            h1 = tree.find('.//h1')
+            if h1 is not None:
+                title = _text(h1, strip=True)
             if not title:
-                title_tag = soup.find('title')
-                if title_tag:
-                    title = title_tag.get_text(strip=True).split('|')[0].strip()
+                title_tag = tree.find('.//title')
+                if title_tag is not None:
+                    title = _text(title_tag, strip=True).split('|')[0].strip()
             if not title:
                 return None
 
-            # Date from meta tags
-            published_at = None
-            for prop in ('article:published_time', 'datePublished', 'date',
-                         'dc.date.modified', 'dcterms.modified'):
-                meta = soup.find('meta', attrs={'property': prop}) or \
-                       soup.find('meta', attrs={'name': prop})
-                if meta and meta.get('content'):
-                    published_at = _parse_date(meta['content'])
-                    if published_at:
-                        break
-
-            # Try <time> tag
-            if not published_at:
-                time_tag = soup.find('time', attrs={'datetime': True})
-                if time_tag:
-                    published_at = _parse_date(time_tag['datetime'])
-
-            # Content via readability
-            doc = Document(html, url=url)
+            # Date from meta tags, then <time>
+            published_at = extract_date(tree, urlparse(url).netloc, sources=('meta', 'time', 'json-ld'), meta_keys=(
+                'article:published_time', 'datePublished', 'date', 'dc.date.modified', 'dcterms.modified',
+            ))
+
+            # Content via readability on the same tree
+            doc = Document(tree, url=url)
             content_html = doc.summary()
 
             if not content_html or len(content_html) < 100:
@@ -1249,106 +1544,77 @@ class RickoverExtractor:
             return None
 
 
-class CuratedExtractor:
+class CuratedExtractor(BaseExtractor):
     """Extract articles from a curated list of URLs.
 
     Each entry in the input list should have 'title' and 'url' keys,
     and optionally 'author' for tagging.
     """
 
+    LOG_NAME = 'curated'
     HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
     }
+    # Articles keep the order of the links file
+    ORDER_KEY = None
 
-    def __init__(self, links: List[dict], verbose: bool = False):
+    def __init__(self, links: List[dict], verbose: bool = False, fetcher: Optional[Fetcher] = None,
+                 journal: Optional[Journal] = None, parse_pool: Optional[ParsePool] = None):
         """
         Initialize with a list of link objects.
 
         Args:
             links: List of dicts with 'title', 'url', and optional 'author'
             verbose: Print progress
+            fetcher: Shared Fetcher to use (one is created if omitted)
+            journal: Progress journal for resumable runs
+            parse_pool: Process pool for parsing pages (inline if omitted)
         """
+        super().__init__(verbose, fetcher, journal, parse_pool)
         self.links = links
-        self.verbose = verbose
-        self.client = httpx.Client(
-            headers=self.HEADERS,
-            follow_redirects=True,
-            timeout=30.0,
-        )
 
-    def _log(self, msg: str):
-        if self.verbose:
-            print(f"  [curated] {msg}")
+    def iter_posts(self) -> Iterator[ExtractedPost]:
+        """Yield articles for the curated list, in list order, as they are fetched."""
+        links_by_url = {}
+        for link in self.links:
+            links_by_url.setdefault(link['url'], link)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectError, httpx.ReadTimeout)),
-    )
-    def _fetch(self, url: str) -> httpx.Response:
-        resp = self.client.get(url)
-        resp.raise_for_status()
-        return resp
+        async def process(url, resp):
+            link = links_by_url[url]
+            post = await self._parse('_extract_article', url, resp.text, link['title'], link.get('author'))
+            if not post:
+                self._log(f"Failed to extract content: {link['title']}")
+            return post
 
-    def _safe_fetch(self, url: str) -> Optional[httpx.Response]:
-        try:
-            return self._fetch(url)
-        except Exception as e:
-            self._log(f"Failed to fetch {url}: {e}")
-            return None
+        yield from (p for p in self._fetch_and_process(list(links_by_url), process) if p)
 
     def extract(self) -> List[ExtractedPost]:
         """Extract content from all URLs in the curated list."""
-        import time
-
-        posts = []
-        for i, link in enumerate(self.links):
-            url = link['url']
-            title = link['title']
-            author = link.get('author')
-
-            self._log(f"Fetching {i+1}/{len(self.links)}: {title}")
-
-            resp = self._safe_fetch(url)
-            if not resp:
-                continue
-
-            post = self._extract_article(url, resp.text, title, author)
-            if post:
-                posts.append(post)
-            else:
-                self._log(f"  Failed to extract content")
-
-            time.sleep(0.5)  # Be polite
-
+        posts = list(self.iter_posts())
         self._log(f"Extracted {len(posts)} of {len(self.links)} articles")
         return posts
 
     def _extract_article(self, url: str, html: str, fallback_title: str, author: Optional[str]) -> Optional[ExtractedPost]:
         """Extract article content using readability."""
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = _parse_html(html)
 
             # Try to get a better title from the page
             title = fallback_title
-            h1 = soup.find('h1')
-            if h1:
-                h1_text = h1.get_text(strip=True)
+            h1 = tree.find('.//h1')
+            if h1 is not None:
+                h1_text = _text(h1, strip=True)
                 if h1_text and len(h1_text) < 200:
                     title = h1_text
 
             # Extract date
-            published_at = None
-            for prop in ('article:published_time', 'datePublished', 'date', 'dc.date'):
-                meta = soup.find('meta', attrs={'property': prop}) or soup.find('meta', attrs={'name': prop})
-                if meta and meta.get('content'):
-                    published_at = _parse_date(meta['content'])
-                    if published_at:
-                        break
-
-            # Extract content using readability
-            doc = Document(html, url=url)
+            published_at = extract_date(tree, urlparse(url).netloc, sources=('meta', 'json-ld'), meta_keys=(
+                'article:published_time', 'datePublished', 'date', 'dc.date',
+            ))
+
+            # Extract content using readability on the same tree
+            doc = Document(tree, url=url)
             content_html = doc.summary()
 
             if not content_html or len(content_html) < 100:
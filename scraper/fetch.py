@@ -0,0 +1,397 @@
+"""Concurrent HTTP fetching shared by the extractors."""
+
+import asyncio
+import inspect
+import posixpath
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from urllib.parse import urlparse
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt
+
+from scraper.cache import CacheMissError, ResponseCache
+from scraper.metrics import Metrics, RequestSample, RequestTrace
+from scraper.ratelimit import HostRateLimiter
+from scraper.retry import CircuitBreaker, is_transient, wait_retry_after
+from scraper.session import DEFAULT_HEADERS, DEFAULT_TIMEOUT, create_async_client
+
+
+# Extensions never worth a request: nothing the extractors can read
+BINARY_EXTENSIONS = frozenset({
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp', '.tif', '.tiff',
+    '.mp3', '.mp4', '.m4a', '.ogg', '.wav', '.mov', '.avi', '.webm',
+    '.zip', '.tar', '.tgz', '.rar', '.7z', '.exe', '.dmg', '.iso',
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.epub', '.mobi',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot', '.css', '.js',
+})
+# What a fetch expects back: an HTML page, or a sitemap/API/index document
+PAGE, DATA = 'page', 'data'
+# Content types a page fetch accepts; capped at the fetcher's ``max_bytes``
+PAGE_TYPES = ('text/html', 'application/xhtml+xml')
+# Content types a data fetch accepts, besides any ``+xml``/``+json`` type
+DATA_TYPES = ('text/xml', 'application/xml', 'application/json', 'application/x-gzip', 'application/gzip')
+# Data responses may be as large as the sitemap protocol allows
+DATA_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Headers that describe the wire encoding, not the decoded body
+_ENCODING_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class UnwantedContentError(Exception):
+    """Raised for a URL or response the fetcher will not download."""
+
+
+def _body_limit(url: str, content_type: str, max_bytes: int, kind: str = PAGE) -> int:
+    """Size cap for a ``kind`` fetch answered with ``content_type``; raise if the type is unwanted."""
+    content_type = content_type.split(';')[0].strip().lower()
+    if kind == PAGE:
+        if not content_type or content_type in PAGE_TYPES:
+            return max_bytes
+    elif (not content_type or content_type in DATA_TYPES or content_type.endswith(('+xml', '+json'))
+          # Gzipped sitemaps are often served as a generic binary
+          or (content_type == 'application/octet-stream' and urlparse(url).path.endswith('.gz'))):
+        return max(max_bytes, DATA_MAX_BYTES)
+    raise UnwantedContentError(f"Skipping {content_type} response to a {kind} fetch: {url}")
+
+
+class Fetcher:
+    """Fetch URLs concurrently on an ``httpx.AsyncClient``.
+
+    The fetcher owns a private event loop and one pooled client from
+    ``scraper.session``, so the (synchronous) extractors can call
+    ``fetch_all`` directly and every batch reuses warm connections. In-flight requests are bounded globally and
+    per host, and results always come back in the order the URLs were given,
+    so callers can keep assigning ``post_index`` deterministically.
+
+    With a ``ResponseCache`` attached, cached pages are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and a 304 is served from disk;
+    an offline cache never touches the network at all.
+
+    Requests are paced per host by a ``HostRateLimiter`` (robots.txt
+    ``Crawl-delay`` aware); pass ``HostRateLimiter(delay=0, robots=False)``
+    to disable pacing.
+
+    Only transient failures (429, 5xx, timeouts, dropped connections) are
+    retried, waiting as long as ``Retry-After`` asks. A ``CircuitBreaker``
+    stops requests to a host after repeated transient failures.
+
+    Responses are streamed: URLs with binary extensions are never requested,
+    and a download stops as soon as the ``Content-Type`` turns out not to be
+    what the fetch expects, or the body passes its cap. A ``PAGE`` fetch (the
+    default) accepts only HTML/XHTML up to ``max_bytes``; a ``DATA`` fetch,
+    for sitemaps, APIs and indexes, accepts XML/JSON/gzip up to
+    ``DATA_MAX_BYTES``. Either way the fetch fails with
+    ``UnwantedContentError`` and is not retried.
+
+    With a ``Metrics`` attached, every fetch records a ``RequestSample``
+    (timings, bytes, status, retries).
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = 16,
+        per_host: int = 4,
+        timeout: float = DEFAULT_TIMEOUT,
+        attempts: int = 3,
+        verbose: bool = False,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[HostRateLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        metrics: Optional[Metrics] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.headers = headers or DEFAULT_HEADERS
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.attempts = attempts
+        self.verbose = verbose
+        self.cache = cache
+        self.limiter = limiter or HostRateLimiter()
+        self.metrics = metrics
+        self.breaker = breaker or CircuitBreaker()
+        self.max_bytes = max_bytes
+        if self.limiter.user_agent is None:
+            self.limiter.user_agent = self.headers.get('User-Agent')
+        self._transport = transport
+        self._loop = asyncio.new_event_loop()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _log(self, msg: str):
+        if self.verbose:
+            print(f"  [fetch] {msg}")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = create_async_client(
+                headers=self.headers,
+                timeout=self.timeout,
+                max_connections=self.concurrency,
+                transport=self._transport,
+            )
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def _load_robots(self, robots_url: str) -> Optional[str]:
+        """Fetch robots.txt for the rate limiter, bypassing pacing and retries."""
+        entry = self.cache.get(robots_url) if self.cache else None
+        if self.cache and self.cache.offline:
+            return self.cache.to_response(entry).text if entry else None
+        try:
+            resp = await self._get_client().get(
+                robots_url, headers=ResponseCache.validators(entry) if entry else {},
+            )
+        except httpx.HTTPError as e:
+            self._log(f"No robots.txt at {robots_url}: {e}")
+            return None
+        if resp.status_code == 304 and entry:
+            return self.cache.to_response(self.cache.touch(robots_url, entry, resp)).text
+        if resp.status_code != 200:
+            return None
+        if self.cache:
+            self.cache.put(robots_url, resp)
+        return resp.text
+
+    # ----- Async API -----
+
+    async def aget(self, url: str, attempts: Optional[int] = None, kind: str = PAGE) -> httpx.Response:
+        """Fetch a URL, retrying transient failures. Raises on error.
+
+        ``attempts`` overrides the fetcher's default for cheap one-shot probes;
+        ``kind`` (``PAGE`` or ``DATA``) is what the response must be.
+        """
+        if self.metrics is None:
+            return await self._get(url, attempts, kind, None)
+        sample = RequestSample(url)
+        try:
+            resp = await self._get(url, attempts, kind, sample)
+        except Exception as e:
+            sample.error = type(e).__name__
+            if isinstance(e, httpx.HTTPStatusError):
+                sample.status = e.response.status_code
+            raise
+        finally:
+            self.metrics.record(sample)
+        sample.status = resp.status_code
+        sample.bytes = len(resp.content)
+        sample.cache = resp.extensions.get('cache')
+        return resp
+
+    async def _get(self, url: str, attempts: Optional[int], kind: str,
+                   sample: Optional[RequestSample]) -> httpx.Response:
+        if posixpath.splitext(urlparse(url).path)[1].lower() in BINARY_EXTENSIONS:
+            raise UnwantedContentError(f"Skipping binary URL: {url}")
+        entry = self.cache.get(url) if self.cache else None
+        if self.cache and self.cache.offline:
+            if entry is None:
+                raise CacheMissError(f"Not cached (offline): {url}")
+            return self.cache.to_response(entry)
+
+        conditional = ResponseCache.validators(entry) if entry else {}
+        host = urlparse(url).netloc
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(attempts or self.attempts),
+            wait=wait_retry_after(),
+            retry=retry_if_exception(is_transient),
+            reraise=True,
+        ):
+            with attempt:
+                self.breaker.check(host)
+                queued = time.perf_counter()
+                await self.limiter.acquire(url, self._load_robots)
+                async with self._slots, self._host_slot(url):
+                    # The host may have tripped while this request was queued
+                    self.breaker.check(host)
+                    if sample is not None:
+                        sample.retries = attempt.retry_state.attempt_number - 1
+                        sample.wait += time.perf_counter() - queued
+                    try:
+                        resp = await self._send(url, conditional, kind, sample)
+                    except httpx.TransportError as e:
+                        if is_transient(e):
+                            self.breaker.record_failure(host)
+                        raise
+                if resp.status_code >= 500:
+                    self.breaker.record_failure(host)
+                elif resp.status_code != 429:
+                    self.breaker.record_success(host)
+                if resp.status_code == 304 and entry:
+                    self._log(f"Not modified: {url}")
+                    return self.cache.to_response(self.cache.touch(url, entry, resp), 'revalidated')
+                resp.raise_for_status()
+        if self.cache:
+            self.cache.put(url, resp)
+        return resp
+
+    async def _send(self, url: str, headers: Dict[str, str], kind: str,
+                    sample: Optional[RequestSample]) -> httpx.Response:
+        """Send one attempt, timing its phases into ``sample`` if there is one."""
+        if sample is None:
+            return await self._download(url, headers, kind, None)
+        trace = RequestTrace()
+        try:
+            return await self._download(url, headers, kind, {'trace': trace})
+        finally:
+            sample.total = time.perf_counter() - trace.started
+            sample.connect, sample.ttfb = trace.connect, trace.ttfb
+
+    async def _download(self, url: str, headers: Dict[str, str], kind: str,
+                        extensions: Optional[dict]) -> httpx.Response:
+        """Stream a response, giving up early on unwanted types and oversized bodies.
+
+        The returned response holds the decoded body, so the wire-encoding
+        headers are dropped from it.
+        """
+        client = self._get_client()
+        request = client.build_request('GET', url, headers=headers, extensions=extensions)
+        resp = await client.send(request, stream=True)
+        try:
+            limit = max(self.max_bytes, DATA_MAX_BYTES)
+            if resp.is_success:
+                limit = _body_limit(url, resp.headers.get('content-type', ''), self.max_bytes, kind)
+                length = resp.headers.get('content-length', '')
+                if length.isdigit() and int(length) > limit:
+                    raise UnwantedContentError(f"Skipping {length}-byte response: {url}")
+            chunks, size = [], 0
+            async for chunk in resp.aiter_bytes():
+                size += len(chunk)
+                if size > limit:
+                    raise UnwantedContentError(f"Skipping response over {limit} bytes: {url}")
+                chunks.append(chunk)
+        finally:
+            await resp.aclose()
+        return httpx.Response(
+            resp.status_code,
+            headers=[(k, v) for k, v in resp.headers.multi_items() if k.lower() not in _ENCODING_HEADERS],
+            content=b''.join(chunks),
+            request=resp.request,
+            extensions=resp.extensions,
+        )
+
+    async def afetch(self, url: str, attempts: Optional[int] = None, kind: str = PAGE) -> Optional[httpx.Response]:
+        """Fetch a URL, returning None instead of raising."""
+        try:
+            return await self.aget(url, attempts, kind)
+        except Exception as e:
+            self._log(f"Failed to fetch {url}: {e}")
+            return None
+
+    async def afetch_all(self, urls: Iterable[str], attempts: Optional[int] = None,
+                         kind: str = PAGE) -> List[Optional[httpx.Response]]:
+        """Fetch URLs concurrently; results line up with ``urls``."""
+        return list(await asyncio.gather(*(self.afetch(url, attempts, kind) for url in urls)))
+
+    async def aget_all(self, urls: Iterable[str], attempts: Optional[int] = None,
+                       kind: Union[str, Sequence[str]] = PAGE) -> List[Union[httpx.Response, Exception]]:
+        """Fetch URLs concurrently; a failed fetch comes back as the exception it raised.
+
+        ``kind`` is one kind for every URL, or a sequence lining up with ``urls``.
+        """
+        urls = list(urls)
+        kinds = [kind] * len(urls) if isinstance(kind, str) else kind
+        return list(await asyncio.gather(
+            *(self.aget(url, attempts, k) for url, k in zip(urls, kinds)), return_exceptions=True,
+        ))
+
+    async def amap(
+        self,
+        urls: Iterable[str],
+        func: Callable[[str, Optional[httpx.Response]], Any],
+        attempts: Optional[int] = None,
+        kind: str = PAGE,
+    ) -> List[Any]:
+        """Fetch URLs concurrently, calling ``func(url, resp)`` as each arrives.
+
+        ``resp`` is None for a failed fetch. ``func`` may be a coroutine
+        function, in which case its result is awaited. Results line up with
+        ``urls``.
+        """
+        return list(await asyncio.gather(*(self._apply(url, func, attempts, kind) for url in urls)))
+
+    async def _apply(self, url: str, func: Callable, attempts: Optional[int], kind: str) -> Any:
+        result = func(url, await self.afetch(url, attempts, kind))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    # ----- Sync API -----
+
+    def get(self, url: str, attempts: Optional[int] = None, kind: str = PAGE) -> httpx.Response:
+        return self._loop.run_until_complete(self.aget(url, attempts, kind))
+
+    def fetch(self, url: str, attempts: Optional[int] = None, kind: str = PAGE) -> Optional[httpx.Response]:
+        return self._loop.run_until_complete(self.afetch(url, attempts, kind))
+
+    def fetch_all(self, urls: Iterable[str], attempts: Optional[int] = None,
+                  kind: str = PAGE) -> List[Optional[httpx.Response]]:
+        return self._loop.run_until_complete(self.afetch_all(urls, attempts, kind))
+
+    def get_all(self, urls: Iterable[str], attempts: Optional[int] = None,
+                kind: Union[str, Sequence[str]] = PAGE) -> List[Union[httpx.Response, Exception]]:
+        return self._loop.run_until_complete(self.aget_all(urls, attempts, kind))
+
+    def map(
+        self,
+        urls: Iterable[str],
+        func: Callable[[str, Optional[httpx.Response]], Any],
+        attempts: Optional[int] = None,
+        kind: str = PAGE,
+    ) -> List[Any]:
+        return self._loop.run_until_complete(self.amap(urls, func, attempts, kind))
+
+    def imap(
+        self,
+        urls: Iterable[str],
+        func: Callable[[str, Optional[httpx.Response]], Any],
+        attempts: Optional[int] = None,
+        kind: str = PAGE,
+    ) -> Iterator[Any]:
+        """Like ``map``, but yield each result in order as soon as it is ready.
+
+        At most ``2 * concurrency`` URLs are scheduled ahead of the consumer,
+        so memory stays bounded however many URLs there are.
+        """
+        window = deque()
+        try:
+            for url in urls:
+                window.append(self._loop.create_task(self._apply(url, func, attempts, kind)))
+                if len(window) >= 2 * self.concurrency:
+                    yield self._loop.run_until_complete(window.popleft())
+            while window:
+                yield self._loop.run_until_complete(window.popleft())
+        finally:
+            # Consumer stopped early: don't leave tasks pending on the loop
+            for task in window:
+                task.cancel()
+            if window and not self._loop.is_closed():
+                self._loop.run_until_complete(asyncio.gather(*window, return_exceptions=True))
+
+    def close(self):
+        """Close the pooled client and the event loop."""
+        if self._loop.is_closed():
+            return
+        if self._client is not None:
+            self._loop.run_until_complete(self._client.aclose())
+            self._client = None
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
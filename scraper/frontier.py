@@ -0,0 +1,128 @@
+"""URL frontier for archive and index crawls.
+
+The same post is often linked under several spellings: with and without a
+trailing slash, over ``http`` and ``https``, with ``?utm_*`` tracking
+parameters or a ``#comments`` fragment. ``Frontier`` reduces every URL to a
+dedup key so each page is queued (and downloaded) once, applies an optional
+``accept`` filter as URLs arrive, and hands back the cleaned URLs in the
+order they were first seen.
+
+Seen keys live in a set; for very large crawls a ``BloomFilter`` keeps the
+memory fixed at the cost of rare false positives (a new URL taken for a
+duplicate and skipped).
+"""
+
+import hashlib
+import math
+from typing import Callable, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', 'ref_src',
+    '_ga', 'igshid', 'yclid',
+})
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def _is_tracking(param: str) -> bool:
+    return param.lower().startswith('utm_') or param.lower() in TRACKING_PARAMS
+
+
+def canonicalize_url(url: str) -> str:
+    """Clean a URL without changing which page it names.
+
+    Lower-cases the scheme and host, drops a default port, the fragment and
+    tracking parameters. The path (including any trailing slash) is kept as
+    given, so the URL still fetches without an extra redirect.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and str(parts.port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = parts.query
+    if query:
+        query = urlencode([
+            (k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not _is_tracking(k)
+        ])
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def url_key(url: str) -> str:
+    """Dedup key for a URL: its canonical form minus scheme and trailing slash."""
+    parts = urlsplit(canonicalize_url(url))
+    path = parts.path.rstrip('/') or '/'
+    return f"{parts.netloc}{path}?{parts.query}" if parts.query else f"{parts.netloc}{path}"
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set of strings.
+
+    Sized for ``capacity`` items at roughly ``error_rate`` false positives;
+    never gives a false negative.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class Frontier:
+    """Ordered, deduplicated queue of URLs to fetch.
+
+    ``accept`` is applied once per distinct URL, to its canonical form;
+    rejected URLs are remembered too, so they are not tested again. Pass
+    ``capacity`` to track seen URLs in a ``BloomFilter`` instead of a set.
+    """
+
+    def __init__(self, accept: Optional[Callable[[str], bool]] = None, capacity: Optional[int] = None):
+        self.accept = accept
+        self._seen = BloomFilter(capacity) if capacity else set()
+        self._urls: List[str] = []
+
+    def add(self, url: str) -> Optional[str]:
+        """Queue ``url``; return its canonical form if it was new and accepted."""
+        key = url_key(url)
+        if key in self._seen:
+            return None
+        self._seen.add(key)
+        url = canonicalize_url(url)
+        if self.accept is not None and not self.accept(url):
+            return None
+        self._urls.append(url)
+        return url
+
+    def extend(self, urls: Iterable[str]) -> 'Frontier':
+        for url in urls:
+            self.add(url)
+        return self
+
+    def __contains__(self, url: str) -> bool:
+        return url_key(url) in self._seen
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._urls)
+
+    @property
+    def urls(self) -> List[str]:
+        return list(self._urls)
@@ -0,0 +1,105 @@
+"""Incremental re-scrapes against a previous output file.
+
+A ``Baseline`` wraps the JSON an earlier ``scrape`` wrote. Extractors ask it
+whether a URL can be reused as-is (its sitemap ``lastmod`` or WordPress
+``modified`` date is older than the baseline) and, after a 304 from the HTTP
+cache, hand back the stored post instead of re-extracting it.
+``merge_posts`` then folds the fresh results into the baseline and describes
+what changed.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from scraper.output import read_posts
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C/ISO 8601 timestamp into an aware UTC datetime.
+
+    Naive values are taken as UTC. A bare date stands for the end of that
+    day, so a post changed later on the day of the baseline still counts as
+    changed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if len(value) == 10:
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class Baseline:
+    """Posts from a previous scrape, keyed by URL.
+
+    ``since`` is when the baseline was taken; it defaults to the file's
+    modification time.
+    """
+
+    def __init__(self, posts: List[dict], since: datetime):
+        self.posts = posts
+        self.since = since
+        self._by_url: Dict[str, dict] = {p['url']: p for p in posts}
+
+    @classmethod
+    def load(cls, path: str, since: Optional[datetime] = None) -> 'Baseline':
+        posts = list(read_posts(path))
+        if since is None:
+            since = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+        return cls(posts, since)
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._by_url
+
+    def post(self, url: str) -> Optional[dict]:
+        """The baseline post dict for a URL, without its ``post_index``."""
+        post = self._by_url.get(url)
+        if post is None:
+            return None
+        return {k: v for k, v in post.items() if k != 'post_index'}
+
+    def unchanged(self, url: str, modified: Optional[str]) -> bool:
+        """True if the URL is in the baseline and was last modified before it."""
+        if url not in self._by_url:
+            return False
+        modified_at = parse_timestamp(modified)
+        return modified_at is not None and modified_at <= self.since
+
+
+def merge_posts(baseline: Baseline, posts: List[dict]) -> Tuple[List[dict], dict]:
+    """Merge fresh post dicts into the baseline and re-index the result.
+
+    Fresh posts replace baseline posts with the same URL; baseline posts the
+    new scrape did not find are kept (they are listed as ``missing`` in the
+    changeset). The merged list is ordered oldest first, like ``extract()``,
+    and ``post_index`` is reassigned from 1.
+    """
+    fresh = {p['url']: p for p in posts}
+    added = [url for url in fresh if url not in baseline]
+    updated = [url for url in fresh if url in baseline and fresh[url] != baseline.post(url)]
+    missing = [p['url'] for p in baseline.posts if p['url'] not in fresh]
+
+    merged = list(fresh.values()) + [baseline.post(url) for url in missing]
+    merged.sort(key=lambda p: (p.get('published_at') or '0000', p['url']))
+    data = [p | {'post_index': i} for i, p in enumerate(merged, 1)]
+
+    changeset = {
+        'since': baseline.since.isoformat(),
+        'scraped_at': datetime.now(timezone.utc).isoformat(),
+        'added': added,
+        'updated': updated,
+        'missing': missing,
+        'unchanged': len(fresh) - len(added) - len(updated),
+        'total': len(data),
+    }
+    return data, changeset
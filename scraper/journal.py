@@ -0,0 +1,124 @@
+"""Crash-safe progress journal for resumable scrapes.
+
+The journal is an append-only NDJSON file next to the output file. Each line
+records one fetched URL and the post extracted from it (or null when the
+page held no article), and is flushed and fsynced before the next one, so an
+interrupted run loses at most the page in flight. Failed fetches are not
+recorded, which means a resumed run retries them.
+"""
+
+import inspect
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+import httpx
+
+
+class Journal:
+    """Append-only record of finished URLs and their extracted posts.
+
+    Opening without ``resume`` starts a fresh journal; with ``resume`` the
+    existing entries are indexed and new ones are appended after them. Only
+    URLs and file offsets are held in memory: a post from an earlier run is
+    read back from the file when it is replayed, and posts recorded in this
+    run are never kept at all.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._done: Set[str] = set()
+        self._offsets: Dict[str, int] = {}
+        self._reader = None
+        if resume:
+            self._load()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self):
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    record = None
+                if record is not None:
+                    self._offsets[record['url']] = offset
+                offset += len(line)
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._done)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets or url in self._done
+
+    def post(self, url: str) -> Optional[dict]:
+        """The post dict an earlier run recorded for a URL (None if it held no article)."""
+        offset = self._offsets.get(url)
+        if offset is None:
+            return None
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())['post']
+
+    def record(self, url: str, post: Optional[dict]):
+        """Durably append one finished URL."""
+        if url not in self._offsets:
+            self._done.add(url)
+        self._file.write(json.dumps({'url': url, 'post': post}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def remove(self):
+        """Close and delete the journal once the output has been written."""
+        self.close()
+        os.remove(self.path)
+
+
+def iter_journaled(
+    fetch_imap: Callable,
+    urls: List[str],
+    process: Callable[[str, httpx.Response], Optional[object]],
+    journal: Optional[Journal] = None,
+    restore: Optional[Callable[[dict], object]] = None,
+) -> Iterator[Optional[object]]:
+    """Fetch and process URLs, skipping and replaying ones already journaled.
+
+    ``fetch_imap(urls, func)`` is a ``Fetcher.imap``-style callable (it must
+    await coroutine results), ``process`` turns a response into a post (or
+    None), optionally as a coroutine, and ``restore`` rebuilds a post from
+    its journaled dict. Results are yielded in ``urls`` order as they become
+    ready; failed fetches come back as None.
+    """
+    todo = [url for url in urls if journal is None or url not in journal]
+    pending = set(todo)
+
+    async def handle(url, resp):
+        if resp is None:
+            return None
+        post = process(url, resp)
+        if inspect.isawaitable(post):
+            post = await post
+        if journal is not None:
+            journal.record(url, post.to_dict() if post else None)
+        return post
+
+    fresh = iter(fetch_imap(todo, handle)) if todo else iter(())
+    for url in urls:
+        if url in pending:
+            yield next(fresh)
+        else:
+            saved = journal.post(url)
+            yield restore(saved) if saved is not None else None
@@ -0,0 +1,182 @@
+"""Per-request instrumentation for scrape runs.
+
+A ``Metrics`` attached to a ``Fetcher`` gets one ``RequestSample`` per URL
+fetched. The sample holds the time spent waiting for a slot (rate limiter and
+concurrency caps), the connect time, the time to first byte and the total
+time of the last attempt, along with the status, body size, retry count and
+cache outcome. Connect and TTFB come from httpcore's trace hooks; DNS
+resolution is included in the connect time because httpcore does not report
+it separately. Extractors label the samples with the strategy that issued
+them, and ``report()`` rolls everything up into a JSON-ready dict.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Percentiles in the report
+PERCENTILES = (50, 90, 99)
+# Rows in the slowest-hosts and slowest-pages tables
+TOP = 10
+
+
+@dataclass(slots=True)
+class RequestSample:
+    url: str
+    strategy: Optional[str] = None
+    status: Optional[int] = None
+    bytes: int = 0
+    retries: int = 0
+    cache: Optional[str] = None
+    error: Optional[str] = None
+    wait: float = 0.0
+    connect: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: float = 0.0
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+
+class RequestTrace:
+    """httpcore ``trace`` extension that timestamps one request's phases."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self._connect_started: Optional[float] = None
+
+    async def __call__(self, event: str, info: dict):
+        now = time.perf_counter()
+        if event == 'connection.connect_tcp.started':
+            self._connect_started = now
+        elif event in ('connection.connect_tcp.complete', 'connection.start_tls.complete') and self._connect_started:
+            self.connect = now - self._connect_started
+        elif event.endswith('.receive_response_headers.complete') and self.ttfb is None:
+            self.ttfb = now - self.started
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    return {f"p{pct}": _round(percentile(values, pct)) for pct in PERCENTILES}
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+class Metrics:
+    """Collects request samples and per-strategy spans for one run."""
+
+    def __init__(self):
+        self.samples: List[RequestSample] = []
+        self.strategy: Optional[str] = None
+        self.strategies: Dict[str, dict] = {}
+        self.started = time.perf_counter()
+
+    def record(self, sample: RequestSample):
+        sample.strategy = self.strategy
+        self.samples.append(sample)
+
+    def begin_strategy(self, name: str):
+        """Attribute the requests that follow to strategy ``name``."""
+        self.strategy = name
+        span = self.strategies.setdefault(name, {'seconds': 0.0, 'posts': 0})
+        span['_started'] = time.perf_counter()
+
+    def end_strategy(self, name: str, posts: int = 0):
+        span = self.strategies[name]
+        span['seconds'] += time.perf_counter() - span.pop('_started')
+        span['posts'] += posts
+
+    def report(self) -> dict:
+        samples = self.samples
+        totals = [s.total for s in samples]
+        ttfbs = [s.ttfb for s in samples if s.ttfb is not None]
+
+        hosts: Dict[str, dict] = {}
+        for s in samples:
+            host = hosts.setdefault(s.host, {'requests': 0, 'bytes': 0, 'seconds': 0.0, 'retries': 0, 'errors': 0})
+            host['requests'] += 1
+            host['bytes'] += s.bytes
+            host['seconds'] += s.total
+            host['retries'] += s.retries
+            host['errors'] += s.error is not None
+        for host in hosts.values():
+            host['seconds'] = _round(host['seconds'])
+
+        strategies = {}
+        for name, span in self.strategies.items():
+            mine = [s for s in samples if s.strategy == name]
+            strategies[name] = {
+                'seconds': _round(span['seconds'] + (time.perf_counter() - span['_started'] if '_started' in span else 0)),
+                'posts': span['posts'],
+                'requests': len(mine),
+                'bytes': sum(s.bytes for s in mine),
+                'retries': sum(s.retries for s in mine),
+            }
+
+        return {
+            'seconds': _round(time.perf_counter() - self.started),
+            'requests': len(samples),
+            'errors': sum(s.error is not None for s in samples),
+            'retries': sum(s.retries for s in samples),
+            'bytes': sum(s.bytes for s in samples),
+            'cache': {
+                outcome: sum(s.cache == outcome for s in samples) for outcome in ('hit', 'revalidated')
+            },
+            'total_seconds': _percentiles(totals),
+            'ttfb_seconds': _percentiles(ttfbs),
+            'strategies': strategies,
+            'hosts': hosts,
+            'slowest_hosts': sorted(hosts, key=lambda h: hosts[h]['seconds'], reverse=True)[:TOP],
+            'slowest_pages': [
+                {'url': s.url, 'seconds': _round(s.total), 'status': s.status}
+                for s in sorted(samples, key=lambda s: s.total, reverse=True)[:TOP]
+            ],
+            'samples': [asdict(s) for s in samples],
+        }
+
+    def write(self, path: str) -> dict:
+        """Write the report to ``path`` as JSON and return it."""
+        report = self.report()
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+def summarize(report: dict) -> List[str]:
+    """Human-readable lines for a ``Metrics.report()``."""
+    def fmt(pcts):
+        return ', '.join(f"{k} {v * 1000:.0f}ms" if v is not None else f"{k} -" for k, v in pcts.items())
+
+    lines = [
+        f"{report['requests']} requests in {report['seconds']:.1f}s: {report['bytes'] / 1e6:.1f} MB, "
+        f"{report['retries']} retries, {report['errors']} errors, "
+        f"{report['cache']['hit']} cache hits, {report['cache']['revalidated']} revalidated",
+        f"Request time: {fmt(report['total_seconds'])}",
+        f"Time to first byte: {fmt(report['ttfb_seconds'])}",
+    ]
+    for name, s in report['strategies'].items():
+        lines.append(f"Strategy {name}: {s['posts']} posts, {s['requests']} requests, "
+                     f"{s['bytes'] / 1e6:.1f} MB in {s['seconds']:.1f}s")
+    if report['slowest_hosts']:
+        lines.append("Slowest hosts: " + ', '.join(
+            f"{h} ({report['hosts'][h]['seconds']:.1f}s/{report['hosts'][h]['requests']} req)"
+            for h in report['slowest_hosts'][:5]
+        ))
+    for page in report['slowest_pages'][:5]:
+        lines.append(f"  {page['seconds'] * 1000:.0f}ms {page['url']}")
+    return lines
@@ -0,0 +1,186 @@
+"""Streaming input and output for post files.
+
+Posts are written as soon as they are extracted rather than collected into
+one big list first. Two formats are supported:
+
+- ``json``: the indented JSON array the commands have always written
+  (byte-for-byte what ``json.dump(posts, f, indent=2)`` produces)
+- ``ndjson``: one compact JSON object per line
+
+Both are read back one post at a time as well: a JSON array is decoded item
+by item as it is read, so it is never loaded whole.
+"""
+
+import json
+import os
+import re
+import tempfile
+from typing import Callable, Iterable, Iterator, Optional
+
+FORMATS = ('json', 'ndjson')
+# Characters read at a time when streaming a JSON array
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# What may follow a number, or a cut-off literal, at the end of a chunk
+_SCALAR_TAIL = re.compile(r'[0-9.eE+\-a-z]*')
+
+
+def infer_format(path: str) -> str:
+    """``ndjson`` for ``.ndjson``/``.jsonl`` paths, ``json`` otherwise."""
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+
+
+def read_posts(path: str) -> Iterator[dict]:
+    """Yield the post dicts from a scrape output in either format."""
+    with open(path) as f:
+        start = f.read(1)
+        while start.isspace():
+            start = f.read(1)
+        f.seek(0)
+        if start == '[':
+            yield from iter_array(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_array(f, chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Yield the items of the JSON array in text file ``f``, reading it in chunks.
+
+    Only the item being decoded is held in memory. An item longer than what
+    has been read so far makes the next read twice as long, so even very
+    long posts are decoded in linear time.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, size, eof = '', 0, chunk_size, False
+
+    def refill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+        return not eof
+
+    def skip() -> bool:
+        """Move ``pos`` to the next non-whitespace character; False at end of file."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return True
+            if not refill():
+                return False
+
+    def expect(chars: Optional[str] = None):
+        """Skip to the next token, which must be one of ``chars`` if given."""
+        if not skip():
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        if chars and buf[pos] not in chars:
+            raise json.JSONDecodeError(f"Expecting {' or '.join(map(repr, chars))}", buf, pos)
+
+    expect('[')
+    pos += 1
+    expect()
+    while buf[pos] != ']':
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not refill():
+                raise
+            size *= 2
+            continue
+        if not eof and not isinstance(item, (dict, list, str)) and _SCALAR_TAIL.match(buf, end).end() == len(buf):
+            # A number might go on in the next chunk
+            if refill():
+                continue
+            item, end = decoder.raw_decode(buf, pos)
+        size = chunk_size
+        yield item
+        pos = end
+        expect(',]')
+        if buf[pos] == ']':
+            break
+        pos += 1
+        expect()
+        if buf[pos] == ']':
+            raise json.JSONDecodeError("Expecting value", buf, pos)
+    pos += 1
+    if skip():
+        raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+def index_posts(posts: Iterable, order_key: Optional[Callable] = None, duplicates=None) -> Iterator[dict]:
+    """Yield post dicts numbered with ``post_index`` from 1.
+
+    Without ``order_key`` posts pass straight through in arrival order.
+    With one, every post has to be seen before the first can be numbered, so
+    posts are spooled to a temporary NDJSON file and read back in sorted
+    order; only the sort keys and file offsets are held in memory.
+
+    ``duplicates`` (a ``scraper.dedup.NearDuplicates``) collapses copies of
+    the same post before they are numbered. When sorting, a later copy with
+    a more canonical URL takes the earlier one's place; when streaming, the
+    first copy is kept.
+    """
+    if order_key is None:
+        i = 0
+        for post in posts:
+            if duplicates is None or duplicates.offer(post, replace=False)[0]:
+                i += 1
+                yield post.to_dict() | {'post_index': i}
+        return
+
+    with tempfile.TemporaryFile() as spool:
+        keyed = []
+        for post in posts:
+            slot = None
+            if duplicates is not None:
+                keep, slot = duplicates.offer(post, len(keyed))
+                if not keep:
+                    continue
+            entry = (order_key(post), spool.tell())
+            spool.write(json.dumps(post.to_dict()).encode('utf-8') + b'\n')
+            if slot is None:
+                keyed.append(entry)
+            else:
+                keyed[slot] = entry
+        keyed.sort(key=lambda item: item[0])
+        for i, (_, offset) in enumerate(keyed, 1):
+            spool.seek(offset)
+            yield json.loads(spool.readline()) | {'post_index': i}
+
+
+def write_posts(path: str, posts: Iterable[dict], fmt: str = 'json') -> int:
+    """Write post dicts to ``path`` as they arrive and return how many.
+
+    The file is written under a temporary name and moved into place at the
+    end, so an interrupted run never leaves a truncated output behind. When
+    there are no posts nothing is written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    tmp = path + '.tmp'
+    count = 0
+    try:
+        with open(tmp, 'w') as f:
+            if fmt == 'ndjson':
+                for post in posts:
+                    f.write(json.dumps(post) + '\n')
+                    count += 1
+            else:
+                f.write('[')
+                for post in posts:
+                    f.write(',\n  ' if count else '\n  ')
+                    f.write(json.dumps(post, indent=2).replace('\n', '\n  '))
+                    count += 1
+                f.write('\n]' if count else ']')
+    except BaseException:
+        os.remove(tmp)
+        raise
+    if count:
+        os.replace(tmp, path)
+    else:
+        os.remove(tmp)
+    return count
@@ -0,0 +1,110 @@
+"""Retry policy and per-host circuit breaker for the fetch layer.
+
+Only transient failures are retried: 429, 5xx, timeouts and dropped
+connections. A 404 or 410 from a dead link fails at once instead of sleeping
+through the backoff. When the server sends ``Retry-After``, the wait before
+the next attempt follows it, capped at ``MAX_RETRY_AFTER``.
+
+``CircuitBreaker`` counts consecutive transient failures per host. Once a
+host reaches the threshold, its requests fail fast with ``CircuitOpenError``
+for a cooldown period. After that they are let through again, and one more
+failure re-opens the circuit.
+"""
+
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+from tenacity import RetryCallState, wait_exponential
+
+# Statuses worth another attempt (plus every 5xx)
+RETRY_STATUSES = frozenset({408, 429})
+# Longest Retry-After we are willing to sleep, in seconds
+MAX_RETRY_AFTER = 60.0
+
+_TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of requesting a host whose circuit is open."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed request is worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status in RETRY_STATUSES or status >= 500
+    return isinstance(exc, _TRANSIENT_ERRORS)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait per a response's ``Retry-After`` header, if it has one."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class wait_retry_after:
+    """Tenacity wait: honor ``Retry-After``, else fall back to ``fallback``."""
+
+    def __init__(self, fallback: Callable[[RetryCallState], float] = None, limit: float = MAX_RETRY_AFTER):
+        self.fallback = fallback or wait_exponential(multiplier=1, min=2, max=10)
+        self.limit = limit
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exc, httpx.HTTPStatusError):
+            seconds = retry_after(exc.response)
+            if seconds is not None:
+                return min(seconds, self.limit)
+        return self.fallback(retry_state)
+
+
+class CircuitBreaker:
+    """Fail fast on hosts that keep failing.
+
+    ``threshold`` consecutive transient failures open a host's circuit for
+    ``cooldown`` seconds. Any response that shows the host is up (including
+    a 404) closes it again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened: Dict[str, float] = {}
+
+    def check(self, host: str):
+        """Raise ``CircuitOpenError`` if ``host`` is cooling down."""
+        opened = self._opened.get(host)
+        if opened is not None and self.clock() - opened < self.cooldown:
+            raise CircuitOpenError(f"Circuit open for {host} after {self._failures[host]} failures")
+
+    def is_open(self, host: str) -> bool:
+        try:
+            self.check(host)
+        except CircuitOpenError:
+            return True
+        return False
+
+    def record_success(self, host: str):
+        self._failures.pop(host, None)
+        self._opened.pop(host, None)
+
+    def record_failure(self, host: str):
+        failures = self._failures[host] = self._failures.get(host, 0) + 1
+        if failures >= self.threshold:
+            self._opened[host] = self.clock()
@@ -0,0 +1,71 @@
+"""Shared HTTP session construction for every scraper entry point.
+
+All clients come from here so they share the same tuned keep-alive pool,
+negotiate HTTP/2 when the ``h2`` package is installed, and advertise every
+content encoding httpx can actually decode.
+"""
+
+import importlib.util
+from typing import Dict, Optional
+
+import httpx
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Replay/0.1 (blog archiver; +https://replay.pub)',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+
+DEFAULT_TIMEOUT = 30.0
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+HTTP2_AVAILABLE = _installed('h2')
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding for the decoders available in this environment."""
+    encodings = ['gzip', 'deflate']
+    if _installed('brotli') or _installed('brotlicffi'):
+        encodings.append('br')
+    if _installed('zstandard'):
+        encodings.append('zstd')
+    return ', '.join(encodings)
+
+
+def session_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Default headers overlaid with ``headers``, plus Accept-Encoding."""
+    merged = dict(DEFAULT_HEADERS)
+    merged.update(headers or {})
+    merged.setdefault('Accept-Encoding', accept_encoding())
+    return merged
+
+
+def pool_limits(max_connections: int = 32) -> httpx.Limits:
+    """Keep-alive pool sized for ``max_connections`` concurrent requests."""
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=30.0,
+    )
+
+
+def create_async_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_connections: int = 32,
+    http2: Optional[bool] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Create a pooled async client. Close it with ``aclose`` when done."""
+    return httpx.AsyncClient(
+        headers=session_headers(headers),
+        follow_redirects=True,
+        timeout=timeout,
+        limits=pool_limits(max_connections),
+        http2=HTTP2_AVAILABLE if http2 is None else http2,
+        transport=transport,
+    )
@@ -0,0 +1,64 @@
+"""Streaming sitemap parsing.
+
+Sitemaps are read with ``lxml.etree.iterparse`` and every ``<url>`` element
+is discarded as soon as it has been yielded, so even news-style sitemaps
+with tens of thousands of entries parse in bounded memory. Gzipped
+sitemaps (``.xml.gz``) are decompressed on the fly.
+"""
+
+import gzip
+import io
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class SitemapEntry(NamedTuple):
+    loc: str
+    lastmod: Optional[str] = None
+
+
+def _child_text(elem, name: str) -> Optional[str]:
+    for child in elem:
+        if isinstance(child.tag, str) and etree.QName(child).localname == name:
+            text = (child.text or '').strip()
+            return text or None
+    return None
+
+
+def iter_sitemap(data: bytes) -> Iterator[Tuple[str, SitemapEntry]]:
+    """Yield ``(kind, entry)`` for each entry in a sitemap document.
+
+    ``kind`` is ``'url'`` for pages in a ``<urlset>`` and ``'sitemap'`` for
+    child sitemaps listed in a ``<sitemapindex>``.
+    """
+    stream = io.BytesIO(data)
+    if data[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream)
+
+    context = etree.iterparse(
+        stream,
+        events=('end',),
+        tag=('{*}url', '{*}sitemap'),
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+    try:
+        for _, elem in context:
+            loc = _child_text(elem, 'loc')
+            if loc:
+                kind = etree.QName(elem).localname
+                yield kind, SitemapEntry(loc, _child_text(elem, 'lastmod'))
+            # Drop the element and anything before it so memory stays flat
+            elem.clear()
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+    except (etree.XMLSyntaxError, OSError, EOFError):
+        # Truncated or non-XML bodies: keep whatever parsed cleanly
+        return
@@ -0,0 +1,30 @@
+"""Shared fixtures for the test suite."""
+
+import httpx
+import pytest
+
+from scraper.fetch import Fetcher
+from scraper.ratelimit import HostRateLimiter
+
+
+@pytest.fixture
+def make_fetcher():
+    """Factory for Fetchers served by a MockTransport ``handler``.
+
+    The limiter defaults to no pacing and no robots.txt lookups; pass
+    ``limiter`` to override it. Fetchers are closed at teardown.
+    """
+    fetchers = []
+
+    def make(handler, limiter=None, **kwargs):
+        fetcher = Fetcher(
+            transport=httpx.MockTransport(handler),
+            limiter=limiter or HostRateLimiter(delay=0, robots=False),
+            **kwargs,
+        )
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.close()
@@ -0,0 +1,39 @@
+"""Tests for the backstack CLI."""
+
+import json
+
+from click.testing import CliRunner
+
+from backstack import cli
+
+
+POSTS = [
+    {'title': 'One', 'url': 'https://example.com/one', 'content_html': '<p>One</p>', 'post_index': 1},
+    {'title': 'Two', 'url': 'https://example.com/two', 'content_html': '<p>Two</p>', 'post_index': 2},
+]
+
+
+def upload(posts_file):
+    return CliRunner().invoke(cli, [
+        'upload', str(posts_file), '-s', 'example', '-n', 'Example', '-u', 'https://example.com', '--dry-run',
+    ])
+
+
+class TestUpload:
+    def test_dry_run_reads_ndjson(self, tmp_path):
+        posts_file = tmp_path / "posts_cleaned.ndjson"
+        posts_file.write_text(''.join(json.dumps(post) + '\n' for post in POSTS))
+
+        result = upload(posts_file)
+
+        assert result.exit_code == 0, result.output
+        assert "Posts: 2" in result.output
+
+    def test_dry_run_reads_json(self, tmp_path):
+        posts_file = tmp_path / "posts_cleaned.json"
+        posts_file.write_text(json.dumps(POSTS, indent=2))
+
+        result = upload(posts_file)
+
+        assert result.exit_code == 0, result.output
+        assert "Posts: 2" in result.output
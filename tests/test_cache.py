@@ -0,0 +1,95 @@
+"""Tests for scraper.cache module."""
+
+import httpx
+import pytest
+
+from scraper.cache import CacheMissError, CleanCache, ResponseCache
+from scraper.clean import HTMLCleaner
+
+
+class TestRevalidation:
+    def test_not_modified_served_from_cache(self, make_fetcher, tmp_path):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, html="<p>hello</p>", headers={'ETag': '"v1"'})
+
+        cache = ResponseCache(str(tmp_path))
+        with make_fetcher(handler, cache=cache, attempts=1) as fetcher:
+            first = fetcher.get("https://example.com/post")
+            second = fetcher.get("https://example.com/post")
+
+        assert seen == [None, '"v1"']
+        assert first.text == second.text == "<p>hello</p>"
+        assert second.extensions['cache'] == 'revalidated'
+
+    def test_last_modified_sent(self, make_fetcher, tmp_path):
+        sent = []
+
+        def handler(request):
+            sent.append(request.headers.get('If-Modified-Since'))
+            return httpx.Response(200, html="x", headers={'Last-Modified': 'Wed, 01 Jan 2020 00:00:00 GMT'})
+
+        cache = ResponseCache(str(tmp_path))
+        with make_fetcher(handler, cache=cache, attempts=1) as fetcher:
+            fetcher.get("https://example.com/a")
+            fetcher.get("https://example.com/a")
+
+        assert sent == [None, 'Wed, 01 Jan 2020 00:00:00 GMT']
+
+    def test_identical_bodies_stored_once(self, make_fetcher, tmp_path):
+        def handler(request):
+            return httpx.Response(200, html="same body")
+
+        cache = ResponseCache(str(tmp_path))
+        with make_fetcher(handler, cache=cache, attempts=1) as fetcher:
+            fetcher.get("https://example.com/a")
+            fetcher.get("https://example.com/b")
+
+        bodies = [p for p in (tmp_path / 'bodies').rglob('*') if p.is_file()]
+        assert len(bodies) == 1
+
+
+class TestOffline:
+    def test_offline_never_touches_network(self, make_fetcher, tmp_path):
+        def online(request):
+            return httpx.Response(200, html="cached page")
+
+        def offline(request):
+            raise AssertionError("network used in offline mode")
+
+        with make_fetcher(online, cache=ResponseCache(str(tmp_path)), attempts=1) as fetcher:
+            fetcher.get("https://example.com/a")
+
+        with make_fetcher(offline, cache=ResponseCache(str(tmp_path), offline=True), attempts=1) as fetcher:
+            resp = fetcher.get("https://example.com/a")
+            assert resp.text == "cached page"
+            assert resp.extensions['cache'] == 'hit'
+            with pytest.raises(CacheMissError):
+                fetcher.get("https://example.com/never-seen")
+            assert fetcher.fetch("https://example.com/never-seen") is None
+
+
+class TestCleanCache:
+    def test_hit_returns_stored_result(self, tmp_path):
+        cache = CleanCache(str(tmp_path))
+        first = HTMLCleaner("https://example.com", cache=cache)
+        result = first.clean('<p>Hello <a href="/about">about</a></p>')
+
+        second = HTMLCleaner("https://example.com", cache=cache)
+        assert second.clean('<p>Hello <a href="/about">about</a></p>') == result
+        assert second.stats == {'cached': 1}
+
+    def test_key_covers_urls_and_content(self, tmp_path):
+        cache = CleanCache(str(tmp_path))
+        HTMLCleaner("https://example.com", cache=cache).clean('<a href="/about">about</a>')
+
+        other_site = HTMLCleaner("https://other.com", cache=cache)
+        assert 'https://other.com/about' in other_site.clean('<a href="/about">about</a>')['html']
+        other_cdn = HTMLCleaner("https://example.com", "https://cdn.example.com", cache=cache)
+        other_cdn.clean('<a href="/about">about</a>')
+        other_cdn.clean('<a href="/contact">contact</a>')
+        assert other_site.stats['cached'] == other_cdn.stats['cached'] == 0
@@ -1,8 +1,10 @@
 """Tests for scraper.clean module."""
 
+from collections import Counter
+
 import pytest
 
-from scraper.clean import HTMLCleaner
+from scraper.clean import HTMLCleaner, clean_posts
 
 
 @pytest.fixture
@@ -106,3 +108,70 @@ class TestReturnKeys:
         html = '<p>Test content</p>'
         result = cleaner.clean(html)
         assert set(result.keys()) == {'html', 'text', 'excerpt', 'word_count', 'reading_time_minutes', 'images'}
+
+
+class TestSingleTree:
+    """The lxml tree path must match the bleach/Premailer pipeline byte for byte."""
+
+    @pytest.mark.parametrize('html', [
+        '<p>Hello <b class="x">world</b></p>\n<p>Second &amp; last</p>',
+        '<div><h2 id="a">Title</h2>\n<ul>\n<li>one</li>\n<li>two</li>\n</ul></div>',
+        '<table><tr><td>a</td><th>b</th></tr></table>',
+        '<pre>\n  code\n  more</pre>',
+        '<p><a href="/about" rel="nofollow">About</a> <img src="a b.png" alt="x&amp;y"></p>',
+        '<blockquote style="color: red"><p>"quoted" it\'s</p></blockquote>',
+        '<section><p>kept</p></section><!-- comment --><script>x()</script>',
+        '<ul><li></li><li>after empty</li></ul>',
+        'Just text',
+        '<p>one<p>two',
+        '<p>a<div><p>b</p></div></p>',
+    ])
+    def test_matches_fallback(self, cleaner, html):
+        tree = cleaner._clean_tree(html)
+        assert tree is not None
+        assert tree == cleaner._clean_soup(html)
+
+    @pytest.mark.parametrize('html', [
+        '<h2>a<h3>b</h3></h2>',
+        '<a href="/x"><div><a href="/y">y</a></div></a>',
+        '<ul><li></li><p>x</p></ul>',
+        'AT&amp;T at body level',
+    ])
+    def test_restructured_posts_fall_back(self, cleaner, html):
+        assert cleaner._clean_tree(html) is None
+        assert cleaner.clean(html)['html'] == cleaner._clean_soup(html)[0]
+
+
+class TestStats:
+    def test_counts_tree_and_fast_paths(self, cleaner):
+        cleaner.clean('<p>Plain <em>text</em></p>')
+        assert cleaner.stats == {'tree': 1, 'allow_listed': 1, 'control_free': 1}
+
+    def test_stripped_markup_is_not_allow_listed(self, cleaner):
+        cleaner.clean('<p>Text</p><!-- note --><div><font>odd</font></div>&#169;')
+        assert cleaner.stats['tree'] == 1
+        assert cleaner.stats['allow_listed'] == 0
+        assert cleaner.stats['control_free'] == 0
+
+    def test_counts_fallback(self, cleaner):
+        cleaner.clean('<h2>a<h3>b</h3></h2>')
+        assert cleaner.stats == {'fallback': 1}
+
+
+class TestCleanPosts:
+    POSTS = [{'title': f'Post {i}', 'content_html': f'<p>Post {i} <a href="/p{i}">link</a></p>'} for i in range(10)]
+
+    def test_skips_posts_without_content(self):
+        posts = [{'title': 'empty', 'content_html': ''}, {'title': 'kept', 'content_html': '<p>Kept</p>'}]
+        results = list(clean_posts(posts, "https://example.com", jobs=1))
+        assert [post['title'] for post, _, _ in results] == ['kept']
+        assert results[0][2] >= 0
+
+    def test_pool_keeps_order_and_output(self):
+        inline = list(clean_posts(self.POSTS, "https://example.com", jobs=1))
+        stats = Counter()
+        pooled = list(clean_posts(self.POSTS, "https://example.com", jobs=2, stats=stats))
+        assert [post['title'] for post, _, _ in pooled] == [post['title'] for post in self.POSTS]
+        assert [result for _, result, _ in pooled] == [result for _, result, _ in inline]
+        assert 'https://example.com/p3' in pooled[3][1]['html']
+        assert stats['tree'] == len(self.POSTS)
@@ -0,0 +1,73 @@
+"""Tests for scraper.dates module."""
+
+import lxml.html
+
+from scraper.dates import DateParser, extract_date, parse_date
+
+
+class TestParseDate:
+    def test_iso_format(self):
+        result = parse_date("2023-01-15T10:30:00")
+        assert result == "2023-01-15T10:30:00"
+
+    def test_date_only(self):
+        result = parse_date("2023-01-15")
+        assert "2023-01-15" in result
+
+    def test_human_format(self):
+        result = parse_date("January 15, 2023")
+        assert "2023" in result
+
+    def test_none(self):
+        assert parse_date(None) is None
+
+    def test_unparseable(self):
+        assert parse_date("not a date") is None
+
+    def test_ordinals_and_abbreviations(self):
+        assert parse_date("August 1st, 1970") == "1970-08-01T00:00:00"
+        assert parse_date("3 Sept. 2019") == "2019-09-03T00:00:00"
+
+    def test_timezones_kept(self):
+        assert parse_date("2023-01-15T10:30:00Z") == "2023-01-15T10:30:00+00:00"
+        assert parse_date("Sun, 15 Jan 2023 10:30:00 GMT") == "2023-01-15T10:30:00+00:00"
+
+    def test_impossible_date(self):
+        assert parse_date("2020/02/30") is None
+
+
+class TestFormatLearning:
+    def test_winning_format_tried_first(self):
+        parser = DateParser()
+        parser.parse("15 January 2023", site="example.com")
+        assert parser._order("example.com")[0] == 'day-month-year'
+        assert parser._order("other.com")[0] == 'iso'
+
+
+def tree(html):
+    return lxml.html.document_fromstring(html)
+
+
+class TestExtractDate:
+    def test_source_order(self):
+        page = tree("""<html><head>
+            <meta property="article:published_time" content="2021-05-01T00:00:00">
+            </head><body><time datetime="2020-01-01">Jan 1</time></body></html>""")
+        assert extract_date(page, sources=('time', 'meta')) == "2020-01-01T00:00:00"
+        assert extract_date(page, sources=('meta', 'time')) == "2021-05-01T00:00:00"
+
+    def test_unparseable_candidate_falls_through(self):
+        page = tree("""<html><head><meta name="date" content="sometime">
+            <meta itemprop="datePublished" content="2019-03-04"></head><body></body></html>""")
+        assert extract_date(page) == "2019-03-04T00:00:00"
+
+    def test_json_ld_graph(self):
+        page = tree("""<html><head><script type="application/ld+json">
+            {"@graph": [{"@type": "WebPage"}, {"@type": "Article", "datePublished": "2018-07-08T09:10:11+02:00"}]}
+            </script></head><body></body></html>""")
+        assert extract_date(page) == "2018-07-08T09:10:11+02:00"
+
+    def test_text_only_when_asked(self):
+        page = tree("<html><body><p>Cuernavaca, August 3rd, 1971</p><script>var d = 'May 1, 2000';</script></body></html>")
+        assert extract_date(page) is None
+        assert extract_date(page, sources=('meta', 'text')) == "1971-08-03T00:00:00"
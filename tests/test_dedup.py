@@ -0,0 +1,89 @@
+"""Tests for scraper.dedup module."""
+
+import hashlib
+import random
+
+from scraper.dedup import NearDuplicates, post_fingerprint, simhash, url_rank
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.output import index_posts
+
+random.seed(7)
+VOCAB = [f"word{i}" for i in range(2000)]
+
+
+def article(n=300):
+    return ' '.join(random.choice(VOCAB) for _ in range(n))
+
+
+def post(url, text, published_at=None):
+    return ExtractedPost("Title", url, f"<div><p>{text}</p></div>", "title", published_at)
+
+
+class TestSimhash:
+    def test_close_texts_have_close_fingerprints(self):
+        text = article()
+        edited = text.replace(text.split()[10], "changed", 1)
+        a, b, c = simhash(text), simhash(edited), simhash(article())
+        assert bin(a ^ b).count('1') <= 3
+        assert bin(a ^ c).count('1') > 10
+
+    def test_short_text_not_fingerprinted(self):
+        assert simhash("too short to tell") is None
+
+    def test_matches_bitwise_definition(self):
+        rng = random.Random(1)
+        words = [rng.choice(VOCAB) for _ in range(120)]
+        counts = [0] * 64
+        for i in range(len(words) - 2):
+            digest = hashlib.blake2b(' '.join(words[i:i + 3]).encode('utf-8'), digest_size=8).digest()
+            h = int.from_bytes(digest, 'little')
+            for bit in range(64):
+                counts[bit] += 1 if h >> bit & 1 else -1
+        assert simhash(' '.join(words)) == sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+    def test_carried_fingerprint_reused(self):
+        p = post("https://example.com/a", "word " * 60)
+        p.fingerprint = 12345
+        assert post_fingerprint(p) == 12345
+        assert 'fingerprint' not in p.to_dict()
+
+
+class TestNearDuplicates:
+    def test_collapse_keeps_canonical_url(self):
+        text, other = article(), article()
+        posts = [
+            post("https://example.com/2020/01/a-post/amp", text),
+            post("https://example.com/2020/01/b-post", other),
+            post("https://example.com/2020/01/a-post", text + " Share this."),
+            post("https://example.com/category/misc/2020/01/a-post", text),
+        ]
+        duplicates = NearDuplicates()
+        kept = duplicates.collapse(posts)
+
+        assert [p.url for p in kept] == ["https://example.com/2020/01/a-post", "https://example.com/2020/01/b-post"]
+        assert len(duplicates.collapsed) == 2
+
+    def test_short_posts_never_collapsed(self):
+        posts = [post("https://example.com/a", "Hello"), post("https://example.com/b", "Hello")]
+        assert len(NearDuplicates().collapse(posts)) == 2
+
+    def test_url_rank(self):
+        assert url_rank("https://example.com/post") < url_rank("https://example.com/post?amp=1")
+        assert url_rank("https://example.com/post") < url_rank("https://example.com/2020/post")
+
+
+class TestIndexPosts:
+    def test_duplicates_dropped_before_numbering(self):
+        text = article()
+        posts = [
+            post("https://example.com/print/b", text, "2023-02-01"),
+            post("https://example.com/a", article(), "2023-01-01"),
+            post("https://example.com/b", text, "2023-02-01"),
+        ]
+        data = list(index_posts(posts, BlogExtractor.ORDER_KEY, NearDuplicates()))
+        assert [(d['post_index'], d['url']) for d in data] == [
+            (1, "https://example.com/a"), (2, "https://example.com/b"),
+        ]
+
+        streamed = list(index_posts(posts, duplicates=NearDuplicates()))
+        assert [d['url'] for d in streamed] == ["https://example.com/print/b", "https://example.com/a"]
@@ -1,12 +1,15 @@
 """Tests for scraper.extract module."""
 
+import asyncio
 import json
 from unittest.mock import MagicMock, patch
 
 import pytest
 import httpx
 
-from scraper.extract import BlogExtractor, ExtractedPost, _slugify, _parse_date
+from scraper.cache import StrategyCache
+from scraper.extract import BlogExtractor, ExtractedPost, _slugify
+from scraper.fetch import PAGE
 
 
 class TestExtractedPost:
@@ -34,6 +37,11 @@ class TestExtractedPost:
         d = post.to_dict()
         assert d['published_at'] is None
 
+    def test_slots_and_round_trip(self):
+        post = ExtractedPost("T", "https://example.com/t", "<p>T</p>", "t", "2023-01-01", ["a"])
+        assert not hasattr(post, '__dict__')
+        assert ExtractedPost.from_dict(post.to_dict()) == post
+
 
 class TestSlugify:
     def test_basic(self):
@@ -47,27 +55,6 @@ class TestSlugify:
         assert len(_slugify(long_title)) <= 80
 
 
-class TestParseDate:
-    def test_iso_format(self):
-        result = _parse_date("2023-01-15T10:30:00")
-        assert result == "2023-01-15T10:30:00"
-
-    def test_date_only(self):
-        result = _parse_date("2023-01-15")
-        assert "2023-01-15" in result
-
-    def test_human_format(self):
-        result = _parse_date("January 15, 2023")
-        assert "2023" in result
-
-    def test_none(self):
-        assert _parse_date(None) is None
-
-    def test_unparseable(self):
-        result = _parse_date("not a date")
-        assert result == "not a date"
-
-
 SITEMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
     <url><loc>https://example.com/post-one</loc></url>
@@ -94,19 +81,22 @@ WP_API_RESPONSE = [
 
 
 class TestBlogExtractorSitemap:
+    @patch.object(BlogExtractor, '_fetch_and_process')
+    @patch.object(BlogExtractor, '_safe_fetch_many')
     @patch.object(BlogExtractor, '_safe_fetch')
     @patch.object(BlogExtractor, '_extract_article')
-    def test_sitemap_parses_urls(self, mock_extract, mock_fetch):
+    def test_sitemap_parses_urls(self, mock_extract, mock_fetch, mock_fetch_many, mock_process):
         # Sitemap response
         sitemap_resp = MagicMock()
         sitemap_resp.status_code = 200
         sitemap_resp.text = SITEMAP_XML
+        sitemap_resp.content = SITEMAP_XML.encode()
 
         # Post responses
         post_resp = MagicMock()
         post_resp.text = "<html><body><p>Post content</p></body></html>"
 
-        def fetch_side_effect(url):
+        def fetch_side_effect(url, kind=PAGE):
             if 'sitemap' in url:
                 return sitemap_resp
             if '/about' in url:
@@ -114,6 +104,8 @@ class TestBlogExtractorSitemap:
             return post_resp
 
         mock_fetch.side_effect = fetch_side_effect
+        mock_fetch_many.side_effect = lambda urls, kind=PAGE: [fetch_side_effect(u) for u in urls]
+        mock_process.side_effect = lambda urls, process: [asyncio.run(process(u, fetch_side_effect(u))) for u in urls]
 
         mock_extract.side_effect = [
             ExtractedPost("Post One", "https://example.com/post-one", "<p>One</p>", "post-one", "2023-01-01"),
@@ -121,22 +113,29 @@ class TestBlogExtractorSitemap:
         ]
 
         extractor = BlogExtractor("https://example.com")
-        posts = extractor._try_sitemap()
+        posts = list(extractor._try_sitemap())
 
-        assert posts is not None
         # /about should be filtered out, but extract_article is called for post URLs
         assert len(posts) == 2
 
 
+def wp_response(items, total_pages=1, status_code=200):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = items
+    resp.headers = {'X-WP-TotalPages': str(total_pages)}
+    return resp
+
+
 class TestBlogExtractorWPAPI:
-    @patch.object(BlogExtractor, '_safe_fetch')
-    def test_wp_api_maps_fields(self, mock_fetch):
-        resp = MagicMock()
-        resp.status_code = 200
-        resp.json.return_value = WP_API_RESPONSE
-        resp.headers = {'X-WP-TotalPages': '1'}
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    def test_wp_api_maps_fields(self, mock_fetch_many):
+        def fetch(url):
+            if '/posts' in url:
+                return wp_response(WP_API_RESPONSE)
+            return wp_response([])
 
-        mock_fetch.return_value = resp
+        mock_fetch_many.side_effect = lambda urls, kind=PAGE: [fetch(u) for u in urls]
 
         extractor = BlogExtractor("https://example.com")
         posts = extractor._try_wp_api()
@@ -147,16 +146,158 @@ class TestBlogExtractorWPAPI:
         assert posts[0].slug == "first-post"
         assert posts[1].title == "Second Post"
 
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    def test_wp_api_returns_none_on_404(self, mock_fetch_many):
+        mock_fetch_many.side_effect = lambda urls, kind=PAGE: [wp_response([], status_code=404) for _ in urls]
+
+        extractor = BlogExtractor("https://example.com")
+        posts = extractor._try_wp_api()
+
+        assert posts is None
+
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    def test_wp_api_fetches_remaining_pages_in_one_batch(self, mock_fetch_many):
+        def fetch(url):
+            if '/posts' not in url:
+                return wp_response([])
+            page = int(url.rsplit('page=', 1)[1])
+            return wp_response([WP_API_RESPONSE[page - 1]], total_pages=2)
+
+        batches = []
+
+        def fetch_many(urls, kind=PAGE):
+            batches.append(urls)
+            return [fetch(u) for u in urls]
+
+        mock_fetch_many.side_effect = fetch_many
+
+        extractor = BlogExtractor("https://example.com")
+        posts = extractor._try_wp_api()
+
+        assert [p.slug for p in posts] == ["first-post", "second-post"]
+        assert len(batches) == 2
+        assert all('_fields=' in u for u in batches[0])
+        assert batches[1] == [u[:-1] + '2' for u in batches[0] if '/posts' in u]
+
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    def test_wp_api_resolves_terms(self, mock_fetch_many):
+        items = [dict(WP_API_RESPONSE[0], categories=[1, 2], tags=[7])]
+        terms = {
+            'categories': [{'id': 1, 'name': 'Uncategorized', 'slug': 'uncategorized'},
+                           {'id': 2, 'name': 'Books &amp; Reading', 'slug': 'books'}],
+            'tags': [{'id': 7, 'name': 'Illich', 'slug': 'illich'}],
+        }
+
+        def fetch(url):
+            if '/posts' in url:
+                return wp_response(items)
+            return wp_response(terms['categories' if '/categories' in url else 'tags'])
+
+        mock_fetch_many.side_effect = lambda urls, kind=PAGE: [fetch(u) for u in urls]
+
+        extractor = BlogExtractor("https://example.com")
+        posts = extractor._try_wp_api()
+
+        assert posts[0].tags == ["books & reading", "illich"]
+
+
+class TestBlogExtractorWayback:
+    @patch.object(BlogExtractor, '_fetch_and_process')
+    @patch.object(BlogExtractor, '_safe_fetch')
+    def test_pages_cdx_and_uses_raw_snapshots(self, mock_fetch, mock_process):
+        pages = {
+            None: [["timestamp", "original"],
+                   ["20150101000000", "https://example.com/2015/01/first-post"],
+                   ["20150102000000", "https://example.com/about"],
+                   [], ["key-1"]],
+            'key-1': [["timestamp", "original"],
+                      ["20150103000000", "http://example.com:80/2015/01/first-post/?utm_source=feed"],
+                      ["20160101000000", "https://example.com/2016/01/second-post"]],
+        }
+        requested = []
+
+        def fetch(url, kind=PAGE):
+            requested.append(url)
+            resp = MagicMock()
+            resp.json.return_value = pages['key-1' if 'resumeKey=key-1' in url else None]
+            return resp
+
+        mock_fetch.side_effect = fetch
+        mock_process.side_effect = lambda urls, process: [
+            ExtractedPost("Post", url, "<p>x</p>", "post") for url in urls
+        ]
+
+        extractor = BlogExtractor("https://example.com")
+        posts = extractor._try_wayback()
+
+        assert len(requested) == 2
+        assert all('showResumeKey=true' in u for u in requested)
+        assert [p.url for p in posts] == [
+            "https://web.archive.org/web/20150101000000id_/https://example.com/2015/01/first-post",
+            "https://web.archive.org/web/20160101000000id_/https://example.com/2016/01/second-post",
+        ]
+        assert extractor.fetcher.limiter.host_delays['web.archive.org'] == BlogExtractor.WAYBACK_DELAY
+        extractor.close()
+
+
+class TestBlogExtractorArchive:
+    @patch.object(BlogExtractor, '_fetch_and_extract')
     @patch.object(BlogExtractor, '_safe_fetch')
-    def test_wp_api_returns_none_on_404(self, mock_fetch):
+    def test_link_variants_fetched_once(self, mock_fetch, mock_extract):
         resp = MagicMock()
-        resp.status_code = 404
+        resp.text = """<html><body>
+            <a href="/2020/01/a-post">A</a>
+            <a href="/2020/01/a-post/#comments">Comments</a>
+            <a href="http://example.com/2020/01/a-post?utm_source=rss">A</a>
+            <a href="/2020/02/another-post?share=1">B</a>
+            <a href="/tag/economics/all">Tag</a>
+            <a href="https://elsewhere.com/2020/01/a-post">Elsewhere</a>
+        </body></html>"""
         mock_fetch.return_value = resp
+        mock_extract.side_effect = lambda urls: urls
 
         extractor = BlogExtractor("https://example.com")
-        posts = extractor._try_wp_api()
+        urls = extractor._try_archive()
 
-        assert posts is None
+        assert urls == [
+            "https://example.com/2020/01/a-post",
+            "https://example.com/2020/02/another-post?share=1",
+        ]
+        extractor.close()
+
+    @patch.object(BlogExtractor, '_fetch_and_extract')
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    @patch.object(BlogExtractor, '_safe_fetch')
+    def test_follows_pagination_until_no_new_posts(self, mock_fetch, mock_fetch_many, mock_extract):
+        def listing(posts, nav):
+            resp = MagicMock(status_code=200)
+            resp.text = "<html><body>" + "".join(
+                f'<a href="/2020/01/post-{i}">Post {i}</a>' for i in posts
+            ) + nav + "</body></html>"
+            return resp
+
+        pages = {
+            "https://example.com/page/2/": listing([3, 4], '<a href="/?page=3">Older posts</a>'),
+            "https://example.com/?page=3": listing([5], '<a href="/older-than-that">Next page &raquo;</a>'),
+            # Repeats what we already have: the crawl stops here
+            "https://example.com/older-than-that": listing([1, 5], '<a href="/page/9/">9</a>'),
+        }
+        requested = []
+
+        def fetch_many(urls):
+            requested.append(urls)
+            return [pages[u] for u in urls]
+
+        mock_fetch.return_value = listing([1, 2], '<link rel="next" href="/page/2/">')
+        mock_fetch_many.side_effect = fetch_many
+        mock_extract.side_effect = lambda urls: urls
+
+        extractor = BlogExtractor("https://example.com")
+        urls = extractor._try_archive()
+
+        assert urls == [f"https://example.com/2020/01/post-{i}" for i in range(1, 6)]
+        assert requested == [[u] for u in pages]
+        extractor.close()
 
 
 class TestBlogExtractorSorting:
@@ -168,3 +309,118 @@ class TestBlogExtractorSorting:
         ]
         posts.sort(key=lambda p: (p.published_at or '0000', p.url))
         assert [p.title for p in posts] == ["A", "B", "C"]
+
+
+ARTICLE_HTML = """<html><head>
+<title>A Long Post</title>
+<meta property="article:published_time" content="2023-04-05T06:07:08">
+<meta property="article:tag" content="Economics">
+<meta property="article:tag" content="History">
+</head><body><nav>Home</nav><article><h1>A Long Post</h1>
+<p>""" + "This paragraph is long enough for readability to keep it as content. " * 10 + """</p>
+</article></body></html>"""
+
+
+class TestExtractArticle:
+    def test_metadata_and_content_from_one_parse(self):
+        extractor = BlogExtractor("https://example.com")
+        post = extractor._extract_article("https://example.com/a-long-post", ARTICLE_HTML)
+
+        assert post is not None
+        assert post.title == "A Long Post"
+        assert post.published_at == "2023-04-05T06:07:08"
+        assert post.tags == ["economics", "history"]
+        assert "readability to keep it" in post.content_html
+
+    def test_time_tag_preferred(self):
+        html = ARTICLE_HTML.replace('<article>', '<article><time datetime="2020-01-02">Jan 2</time>')
+        post = BlogExtractor("https://example.com")._extract_article("https://example.com/a", html)
+        assert post.published_at == "2020-01-02T00:00:00"
+
+
+class TestStrategySelection:
+    POSTS = [ExtractedPost("A", "https://example.com/a", "<p>A</p>", "a", "2023-01-01")]
+
+    @patch.object(BlogExtractor, '_probe')
+    @patch.object(BlogExtractor, '_try_structured_archive')
+    @patch.object(BlogExtractor, '_try_sitemap')
+    def test_cached_strategy_runs_first(self, mock_sitemap, mock_structured, mock_probe, tmp_path):
+        cache = StrategyCache(str(tmp_path / 'strategies.json'))
+        cache.set('example.com', 'sitemap')
+        mock_sitemap.return_value = list(self.POSTS)
+
+        posts = BlogExtractor("https://example.com", strategy_cache=cache).extract()
+
+        assert [p.title for p in posts] == ["A"]
+        mock_probe.assert_not_called()
+        mock_structured.assert_not_called()
+
+    @patch.object(BlogExtractor, '_probe')
+    @patch.object(BlogExtractor, '_try_structured_archive')
+    @patch.object(BlogExtractor, '_try_sitemap')
+    @patch.object(BlogExtractor, '_try_wp_api')
+    def test_failed_probes_skip_strategies(self, mock_wp, mock_sitemap, mock_structured, mock_probe, tmp_path):
+        cache = StrategyCache(str(tmp_path / 'strategies.json'))
+        mock_probe.return_value = {'structured archive': False, 'sitemap': False, 'WordPress API': True}
+        mock_wp.return_value = list(self.POSTS)
+
+        posts = BlogExtractor("https://example.com", strategy_cache=cache).extract()
+
+        assert len(posts) == 1
+        mock_structured.assert_not_called()
+        mock_sitemap.assert_not_called()
+        assert cache.get('example.com') == 'WordPress API'
+
+    def test_probe_batch(self, make_fetcher):
+        seen = []
+
+        def respond(request):
+            seen.append(str(request.url))
+            if request.url.path == '/sitemap.xml':
+                return httpx.Response(200, content=SITEMAP_XML.encode())
+            if request.url.path == '/archive':
+                return httpx.Response(200, html='<html><body>' + '<article>x</article>' * 5 + '</body></html>')
+            return httpx.Response(404)
+
+        with make_fetcher(respond, attempts=3) as fetcher:
+            probes = BlogExtractor("https://example.com", fetcher=fetcher)._probe()
+
+        assert probes == {'structured archive': True, 'sitemap': True, 'WordPress API': False}
+        # Single attempt each
+        assert len(seen) == len(set(seen)) == 9
+
+    @patch.object(BlogExtractor, '_try_structured_archive')
+    @patch.object(BlogExtractor, '_try_sitemap')
+    def test_transient_probe_failure_keeps_strategy(self, mock_sitemap, mock_structured, make_fetcher):
+        def respond(request):
+            if 'sitemap' in request.url.path:
+                return httpx.Response(503)
+            return httpx.Response(404)
+
+        mock_sitemap.return_value = list(self.POSTS)
+        with make_fetcher(respond, attempts=3) as fetcher:
+            extractor = BlogExtractor("https://example.com", fetcher=fetcher)
+            assert extractor._probe() == {'structured archive': False, 'sitemap': None, 'WordPress API': False}
+            posts = extractor.extract()
+
+        assert [p.title for p in posts] == ["A"]
+        mock_sitemap.assert_called_once()
+        mock_structured.assert_not_called()
+
+    def test_strategies_reuse_probe_responses(self, make_fetcher):
+        seen = []
+
+        def respond(request):
+            seen.append(str(request.url))
+            if request.url.path == '/sitemap.xml':
+                return httpx.Response(200, content=SITEMAP_XML.encode())
+            if request.url.path in ('/', '/post-one', '/post-two'):
+                return httpx.Response(200, html=ARTICLE_HTML)
+            return httpx.Response(404)
+
+        with make_fetcher(respond, attempts=1) as fetcher:
+            posts = BlogExtractor("https://example.com", fetcher=fetcher).extract()
+
+        assert [p.url for p in posts] == ["https://example.com/post-one", "https://example.com/post-two"]
+        # Nine probes and the two posts, each requested once
+        assert len(seen) == len(set(seen)) == 11
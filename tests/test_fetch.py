@@ -0,0 +1,177 @@
+"""Tests for scraper.fetch module."""
+
+import asyncio
+import gzip
+
+import httpx
+import pytest
+
+from scraper.fetch import DATA, DEFAULT_MAX_BYTES
+
+
+class TestFetchAll:
+    def test_results_keep_input_order(self, make_fetcher):
+        async def handler(request):
+            # Later URLs answer first
+            n = int(request.url.path.strip('/'))
+            await asyncio.sleep((5 - n) * 0.01)
+            return httpx.Response(200, html=f"page {n}")
+
+        with make_fetcher(handler) as fetcher:
+            responses = fetcher.fetch_all([f"https://example.com/{n}" for n in range(5)])
+
+        assert [r.text for r in responses] == [f"page {n}" for n in range(5)]
+
+    def test_failures_come_back_as_none(self, make_fetcher):
+        def handler(request):
+            if request.url.path == '/missing':
+                return httpx.Response(404)
+            return httpx.Response(200, html="ok")
+
+        urls = ["https://example.com/a", "https://example.com/missing", "https://example.com/b"]
+        with make_fetcher(handler, attempts=1) as fetcher:
+            responses = fetcher.fetch_all(urls)
+
+        assert responses[0].text == "ok"
+        assert responses[1] is None
+        assert responses[2].text == "ok"
+
+    def test_per_host_concurrency_is_bounded(self, make_fetcher):
+        active = {'now': 0, 'peak': 0}
+
+        async def handler(request):
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+            await asyncio.sleep(0.01)
+            active['now'] -= 1
+            return httpx.Response(200, html="ok")
+
+        with make_fetcher(handler, concurrency=10, per_host=2) as fetcher:
+            fetcher.fetch_all([f"https://example.com/{n}" for n in range(8)])
+
+        assert active['peak'] == 2
+
+
+class TestFetch:
+    def test_get_raises_on_error(self, make_fetcher):
+        def handler(request):
+            return httpx.Response(500)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            make_fetcher(handler, attempts=1).get("https://example.com/")
+
+
+class TestMap:
+    def test_func_sees_each_response_and_order_is_kept(self, make_fetcher):
+        async def handler(request):
+            n = int(request.url.path.strip('/'))
+            await asyncio.sleep((3 - n) * 0.01)
+            if n == 1:
+                return httpx.Response(404)
+            return httpx.Response(200, html=f"page {n}")
+
+        calls = []
+
+        def func(url, resp):
+            calls.append(url)
+            return resp.text if resp else None
+
+        with make_fetcher(handler, attempts=1) as fetcher:
+            results = fetcher.map([f"https://example.com/{n}" for n in range(3)], func)
+
+        assert results == ["page 0", None, "page 2"]
+        # Processed as responses arrived, not in input order
+        assert calls[0] == "https://example.com/2"
+
+    def test_imap_yields_in_order_and_stops_cleanly(self, make_fetcher):
+        seen = []
+
+        async def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, html=request.url.path)
+
+        async def func(url, resp):
+            return resp.text
+
+        with make_fetcher(handler, concurrency=1, attempts=1) as fetcher:
+            results = fetcher.imap([f"https://example.com/{n}" for n in range(10)], func)
+            assert [next(results) for _ in range(3)] == ["/0", "/1", "/2"]
+            results.close()
+
+        # Only a small window beyond what was consumed was ever requested
+        assert len(seen) < 10
+
+
+class TestStreaming:
+    def test_binary_urls_never_requested(self, make_fetcher):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, html="ok")
+
+        with make_fetcher(handler) as fetcher:
+            assert fetcher.fetch("https://example.com/files/paper.PDF") is None
+            assert fetcher.fetch("https://example.com/sitemap.xml.gz") is not None
+        assert seen == ["/sitemap.xml.gz"]
+
+    def test_unwanted_content_type_not_retried(self, make_fetcher):
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, content=b"\x89PNG" * 100, headers={'Content-Type': 'image/png'})
+
+        with make_fetcher(handler, attempts=3) as fetcher:
+            assert fetcher.fetch("https://example.com/avatar") is None
+        assert seen == ["/avatar"]
+
+    def test_size_cap(self, make_fetcher):
+        def handler(request):
+            if request.url.path == '/sitemap.xml':
+                return httpx.Response(200, content=b"<urlset/>" * 200, headers={'Content-Type': 'application/xml'})
+            return httpx.Response(200, content=b"<p>x</p>" * 200, headers={'Content-Type': 'text/html'})
+
+        with make_fetcher(handler, max_bytes=1000) as fetcher:
+            assert fetcher.fetch("https://example.com/huge") is None
+            assert fetcher.fetch("https://example.com/sitemap.xml", kind=DATA) is not None
+
+    def test_large_text_xml_sitemap(self, make_fetcher):
+        urlset = b"<urlset>" + b"<url><loc>https://example.com/post</loc></url>" * 140_000 + b"</urlset>"
+        assert len(urlset) > DEFAULT_MAX_BYTES
+
+        def handler(request):
+            return httpx.Response(200, content=urlset, headers={'Content-Type': 'text/xml; charset=UTF-8'})
+
+        with make_fetcher(handler) as fetcher:
+            resp = fetcher.fetch("https://example.com/sitemap.xml", kind=DATA)
+        assert resp is not None and len(resp.content) == len(urlset)
+
+    def test_page_fetch_refuses_feeds_and_data_types(self, make_fetcher):
+        types = {
+            '/rss.xml': 'application/rss+xml',
+            '/index.xml': 'text/xml',
+            '/api': 'application/json',
+            '/notes.txt': 'text/plain',
+            '/page': 'text/html; charset=utf-8',
+        }
+
+        def handler(request):
+            return httpx.Response(200, content=b"x", headers={'Content-Type': types[request.url.path]})
+
+        with make_fetcher(handler) as fetcher:
+            pages = {path: fetcher.fetch(f"https://example.com{path}") is not None for path in types}
+            data = {path: fetcher.fetch(f"https://example.com{path}", kind=DATA) is not None for path in types}
+        assert pages == {'/rss.xml': False, '/index.xml': False, '/api': False, '/notes.txt': False, '/page': True}
+        assert data == {'/rss.xml': True, '/index.xml': True, '/api': True, '/notes.txt': False, '/page': False}
+
+    def test_body_decoded(self, make_fetcher):
+        body = gzip.compress(b"<html>hello</html>")
+
+        def handler(request):
+            return httpx.Response(200, content=body, headers={'Content-Encoding': 'gzip', 'Content-Type': 'text/html'})
+
+        with make_fetcher(handler) as fetcher:
+            resp = fetcher.get("https://example.com/")
+        assert resp.text == "<html>hello</html>"
+        assert 'content-encoding' not in resp.headers
@@ -0,0 +1,57 @@
+"""Tests for scraper.frontier module."""
+
+from scraper.frontier import BloomFilter, Frontier, canonicalize_url, url_key
+
+
+class TestCanonicalize:
+    def test_strips_fragment_tracking_and_default_port(self):
+        assert canonicalize_url("HTTPS://Example.COM:443/Post/?utm_source=x&id=3&fbclid=y#top") == \
+            "https://example.com/Post/?id=3"
+
+    def test_keeps_trailing_slash_and_custom_port(self):
+        assert canonicalize_url("http://example.com:8080/post/") == "http://example.com:8080/post/"
+        assert canonicalize_url("https://example.com") == "https://example.com/"
+
+    def test_key_ignores_scheme_and_trailing_slash(self):
+        assert url_key("http://example.com/post/") == url_key("https://example.com/post#x")
+        assert url_key("https://example.com/post?p=1") != url_key("https://example.com/post?p=2")
+
+
+class TestFrontier:
+    def test_dedups_in_first_seen_order(self):
+        frontier = Frontier()
+        assert frontier.add("https://example.com/b") == "https://example.com/b"
+        assert frontier.add("https://example.com/a/") == "https://example.com/a/"
+        assert frontier.add("http://example.com/b/?utm_medium=email") is None
+        assert frontier.urls == ["https://example.com/b", "https://example.com/a/"]
+        assert "https://example.com/a" in frontier
+
+    def test_accept_runs_once_per_url(self):
+        calls = []
+
+        def accept(url):
+            calls.append(url)
+            return '/tag/' not in url
+
+        frontier = Frontier(accept=accept).extend([
+            "https://example.com/tag/x", "https://example.com/tag/x/", "https://example.com/post",
+        ])
+        assert frontier.urls == ["https://example.com/post"]
+        assert calls == ["https://example.com/tag/x", "https://example.com/post"]
+
+    def test_bloom_backed(self):
+        urls = [f"https://example.com/post-{i}" for i in range(1000)]
+        frontier = Frontier(capacity=1000).extend(urls + urls)
+        # A false positive can drop the odd URL, never add a duplicate
+        assert len(frontier) >= 995
+        assert len(set(frontier)) == len(frontier)
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(500, error_rate=0.01)
+        for i in range(500):
+            bloom.add(str(i))
+        assert all(str(i) in bloom for i in range(500))
+        false_positives = sum(str(i) in bloom for i in range(500, 5500))
+        assert false_positives < 150
@@ -0,0 +1,152 @@
+"""Tests for scraper.incremental module."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.fetch import PAGE
+from scraper.incremental import Baseline, merge_posts, parse_timestamp
+
+
+SINCE = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def post(slug, published_at, content="<p>Old</p>", index=None):
+    d = {
+        'title': slug.title(),
+        'url': f"https://example.com/{slug}",
+        'content_html': content,
+        'slug': slug,
+        'published_at': published_at,
+        'tags': [],
+    }
+    if index is not None:
+        d['post_index'] = index
+    return d
+
+
+def make_baseline():
+    return Baseline([post('a', '2024-01-01', index=1), post('b', '2024-02-01', index=2)], SINCE)
+
+
+class TestParseTimestamp:
+    def test_offsets_normalised_to_utc(self):
+        assert parse_timestamp('2024-03-01T14:00:00+02:00') == datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+    def test_naive_is_utc(self):
+        assert parse_timestamp('2024-03-01T12:00:00') == SINCE
+
+    def test_bare_date_is_end_of_day(self):
+        assert parse_timestamp('2024-03-01') > SINCE
+
+    def test_garbage(self):
+        assert parse_timestamp('last tuesday') is None
+        assert parse_timestamp(None) is None
+
+
+class TestBaseline:
+    def test_unchanged(self):
+        baseline = make_baseline()
+        assert baseline.unchanged('https://example.com/a', '2024-02-15T00:00:00Z')
+        assert not baseline.unchanged('https://example.com/a', '2024-03-02')
+        assert not baseline.unchanged('https://example.com/a', None)
+        assert not baseline.unchanged('https://example.com/new', '2020-01-01')
+
+    def test_post_drops_index(self):
+        assert 'post_index' not in make_baseline().post('https://example.com/a')
+
+
+class TestMergePosts:
+    def test_changeset_and_reindex(self):
+        fresh = [
+            post('a', '2024-01-01'),
+            post('b', '2024-02-01', content="<p>Edited</p>"),
+            post('early', '2023-12-01'),
+        ]
+        data, changeset = merge_posts(make_baseline(), fresh)
+
+        assert [(p['slug'], p['post_index']) for p in data] == [('early', 1), ('a', 2), ('b', 3)]
+        assert changeset['added'] == ['https://example.com/early']
+        assert changeset['updated'] == ['https://example.com/b']
+        assert changeset['unchanged'] == 1
+        assert changeset['missing'] == []
+
+    def test_missing_posts_are_kept(self):
+        data, changeset = merge_posts(make_baseline(), [post('b', '2024-02-01')])
+
+        assert [p['slug'] for p in data] == ['a', 'b']
+        assert changeset['missing'] == ['https://example.com/a']
+
+
+SITEMAP_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/2024/01/a</loc><lastmod>2024-01-02</lastmod></url>
+  <url><loc>https://example.com/2024/02/b</loc><lastmod>2024-03-05</lastmod></url>
+</urlset>"""
+
+
+class TestIncrementalSitemap:
+    @patch.object(BlogExtractor, '_fetch_and_extract')
+    @patch.object(BlogExtractor, '_safe_fetch')
+    def test_skips_unchanged_urls(self, mock_fetch, mock_fetch_and_extract):
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.content = SITEMAP_XML.encode()
+        mock_fetch.return_value = resp
+        mock_fetch_and_extract.side_effect = lambda urls: [
+            ExtractedPost("B", url, "<p>New</p>", "b") for url in urls
+        ]
+
+        baseline = Baseline([
+            post('2024/01/a', '2024-01-01') | {'url': 'https://example.com/2024/01/a'},
+            post('2024/02/b', '2024-02-01') | {'url': 'https://example.com/2024/02/b'},
+        ], SINCE)
+        extractor = BlogExtractor("https://example.com", baseline=baseline)
+        posts = extractor._try_sitemap()
+
+        mock_fetch_and_extract.assert_called_once_with(['https://example.com/2024/02/b'])
+        assert {p.content_html for p in posts} == {"<p>Old</p>", "<p>New</p>"}
+        extractor.close()
+
+
+def wp_response(items):
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.json.return_value = items
+    resp.headers = {'X-WP-TotalPages': '1'}
+    return resp
+
+
+class TestIncrementalWPAPI:
+    @patch.object(BlogExtractor, '_safe_fetch_many')
+    def test_fetches_content_only_for_changed_posts(self, mock_fetch_many):
+        listing = [
+            {'id': 1, 'link': 'https://example.com/a', 'modified_gmt': '2024-01-01T00:00:00'},
+            {'id': 2, 'link': 'https://example.com/b', 'modified_gmt': '2024-03-02T00:00:00'},
+            {'id': 3, 'link': 'https://example.com/c', 'modified_gmt': '2024-01-01T00:00:00'},
+        ]
+        full = [
+            {'title': {'rendered': t}, 'content': {'rendered': '<p>New</p>'}, 'link': f'https://example.com/{t}',
+             'slug': t, 'date': '2024-01-01T00:00:00'}
+            for t in ('b', 'c')
+        ]
+        requested = []
+
+        def fetch(url):
+            requested.append(url)
+            if 'include=' in url:
+                return wp_response(full)
+            if '/posts' in url:
+                return wp_response(listing)
+            return wp_response([])
+
+        mock_fetch_many.side_effect = lambda urls, kind=PAGE: [fetch(u) for u in urls]
+
+        extractor = BlogExtractor("https://example.com", baseline=make_baseline())
+        posts = extractor._try_wp_api()
+
+        include = [u for u in requested if 'include=' in u]
+        assert len(include) == 1 and 'include=2,3&' in include[0]
+        assert sorted(p.slug for p in posts) == ['a', 'b', 'c']
+        assert next(p for p in posts if p.slug == 'a').content_html == "<p>Old</p>"
+        extractor.close()
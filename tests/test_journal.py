@@ -0,0 +1,99 @@
+"""Tests for scraper.journal module."""
+
+import httpx
+
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.fetch import Fetcher
+from scraper.journal import Journal
+from scraper.ratelimit import HostRateLimiter
+
+
+ARTICLE = "<html><head><title>{slug}</title></head><body><article><p>{slug} " + "words " * 60 + "</p></article></body></html>"
+
+
+def make_extractor(handler, journal):
+    fetcher = Fetcher(
+        transport=httpx.MockTransport(handler),
+        limiter=HostRateLimiter(delay=0, robots=False),
+        attempts=1,
+    )
+    return BlogExtractor("https://example.com", fetcher=fetcher, journal=journal)
+
+
+def article_handler(seen):
+    def handler(request):
+        seen.append(str(request.url))
+        if request.url.path == '/broken':
+            return httpx.Response(500)
+        slug = request.url.path.strip('/')
+        return httpx.Response(200, html=ARTICLE.format(slug=slug))
+    return handler
+
+
+class TestJournal:
+    def test_resume_skips_journaled_urls(self, tmp_path):
+        path = str(tmp_path / "posts.json.journal")
+        urls = ["https://example.com/one", "https://example.com/two"]
+
+        seen = []
+        journal = Journal(path)
+        list(make_extractor(article_handler(seen), journal)._fetch_and_extract(urls[:1]))
+        journal.close()
+        assert seen == urls[:1]
+
+        seen = []
+        journal = Journal(path, resume=True)
+        posts = list(make_extractor(article_handler(seen), journal)._fetch_and_extract(urls))
+        journal.close()
+
+        assert seen == urls[1:]
+        assert [p.url for p in posts] == urls
+        assert isinstance(posts[0], ExtractedPost)
+
+    def test_failed_fetch_not_recorded(self, tmp_path):
+        path = str(tmp_path / "posts.json.journal")
+        journal = Journal(path)
+        list(make_extractor(article_handler([]), journal)._fetch_and_extract(
+            ["https://example.com/one", "https://example.com/broken"]
+        ))
+        journal.close()
+
+        resumed = Journal(path, resume=True)
+        assert "https://example.com/one" in resumed
+        assert "https://example.com/broken" not in resumed
+        resumed.close()
+
+    def test_torn_line_ignored(self, tmp_path):
+        path = tmp_path / "posts.json.journal"
+        path.write_text('{"url": "https://example.com/one", "post": null}\n{"url": "https://exa')
+
+        journal = Journal(str(path), resume=True)
+        assert len(journal) == 1
+        assert "https://example.com/one" in journal
+        journal.close()
+
+    def test_fresh_journal_truncates(self, tmp_path):
+        path = tmp_path / "posts.json.journal"
+        path.write_text('{"url": "https://example.com/one", "post": null}\n')
+
+        journal = Journal(str(path))
+        assert len(journal) == 0
+        journal.remove()
+        assert not path.exists()
+
+    def test_resumed_posts_read_back_from_file(self, tmp_path):
+        path = str(tmp_path / "posts.json.journal")
+        journal = Journal(path)
+        journal.record("https://example.com/one", {'title': 'One', 'content_html': '<p>é</p>'})
+        journal.record("https://example.com/empty", None)
+        journal.close()
+
+        journal = Journal(path, resume=True)
+        journal.record("https://example.com/two", {'title': 'Two'})
+        assert len(journal) == 3
+        assert "https://example.com/two" in journal
+        assert journal.post("https://example.com/one") == {'title': 'One', 'content_html': '<p>é</p>'}
+        assert journal.post("https://example.com/empty") is None
+        # Posts recorded in this run are not held for replay
+        assert journal.post("https://example.com/two") is None
+        journal.close()
@@ -0,0 +1,102 @@
+"""Tests for scraper.metrics module."""
+
+import json
+from unittest.mock import patch
+
+import httpx
+
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.fetch import Fetcher
+from scraper.metrics import Metrics, percentile, summarize
+from scraper.ratelimit import HostRateLimiter
+
+
+def make_fetcher(handler, metrics, **kwargs):
+    return Fetcher(
+        transport=httpx.MockTransport(handler),
+        limiter=HostRateLimiter(delay=0, robots=False),
+        metrics=metrics,
+        **kwargs,
+    )
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([3.0], 90) == 3.0
+        assert percentile([], 50) is None
+
+
+class TestFetcherMetrics:
+    def test_samples_record_status_bytes_and_errors(self):
+        def handler(request):
+            if request.url.path == '/missing':
+                return httpx.Response(404)
+            return httpx.Response(200, html="x" * 100)
+
+        metrics = Metrics()
+        with make_fetcher(handler, metrics, attempts=1) as fetcher:
+            fetcher.fetch_all(["https://example.com/a", "https://example.com/missing"])
+
+        ok, missing = metrics.samples
+        assert (ok.status, ok.bytes, ok.error) == (200, 100, None)
+        assert (missing.status, missing.error) == (404, 'HTTPStatusError')
+        assert ok.total >= 0 and ok.wait >= 0
+
+        report = metrics.report()
+        assert report['requests'] == 2
+        assert report['errors'] == 1
+        assert report['hosts']['example.com']['bytes'] == 100
+        assert set(report['total_seconds']) == {'p50', 'p90', 'p99'}
+
+    def test_retries_counted(self):
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            if len(calls) == 1:
+                return httpx.Response(503, headers={'Retry-After': '0'})
+            return httpx.Response(200, html="ok")
+
+        metrics = Metrics()
+        with make_fetcher(handler, metrics, attempts=2) as fetcher:
+            fetcher.fetch("https://example.com/flaky")
+
+        assert metrics.samples[0].retries == 1
+        assert metrics.samples[0].status == 200
+
+
+class TestStrategyTotals:
+    @patch.object(BlogExtractor, '_probe', return_value={})
+    @patch.object(BlogExtractor, '_try_sitemap')
+    @patch.object(BlogExtractor, '_try_structured_archive')
+    def test_requests_attributed_to_strategies(self, mock_structured, mock_sitemap, mock_probe, tmp_path):
+        def structured():
+            extractor.fetcher.fetch("https://example.com/archive")
+            return None
+
+        def sitemap():
+            extractor.fetcher.fetch("https://example.com/sitemap.xml")
+            return iter([ExtractedPost("A", "https://example.com/a", "<p>A</p>", "a")])
+
+        mock_structured.side_effect = structured
+        mock_sitemap.side_effect = sitemap
+
+        metrics = Metrics()
+        fetcher = make_fetcher(lambda request: httpx.Response(200, html="ok"), metrics)
+        extractor = BlogExtractor("https://example.com", fetcher=fetcher)
+        assert len(extractor.extract()) == 1
+        fetcher.close()
+
+        report = metrics.report()
+        assert report['strategies']['structured archive']['requests'] == 1
+        assert report['strategies']['structured archive']['posts'] == 0
+        assert report['strategies']['sitemap']['requests'] == 1
+        assert report['strategies']['sitemap']['posts'] == 1
+
+        path = tmp_path / "report.json"
+        metrics.write(str(path))
+        assert json.loads(path.read_text())['requests'] == 2
+        assert any(line.startswith("Strategy sitemap: 1 posts") for line in summarize(report))
@@ -0,0 +1,73 @@
+"""Tests for scraper.output module."""
+
+import io
+import json
+
+import pytest
+
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.output import index_posts, infer_format, iter_array, read_posts, write_posts
+
+
+def make_posts():
+    return [
+        ExtractedPost("C", "https://example.com/c", "<p>C\n\"quoted\"</p>", "c", "2023-03-01", ["x"]),
+        ExtractedPost("Undated", "https://example.com/u", "<p>U</p>", "u"),
+        ExtractedPost("A", "https://example.com/a", "<p>Café</p>", "a", "2023-01-01"),
+    ]
+
+
+class TestWritePosts:
+    def test_json_matches_json_dump(self, tmp_path):
+        data = [p.to_dict() | {'post_index': i} for i, p in enumerate(make_posts(), 1)]
+        expected = tmp_path / "expected.json"
+        with open(expected, 'w') as f:
+            json.dump(data, f, indent=2)
+
+        out = tmp_path / "posts.json"
+        assert write_posts(str(out), iter(data)) == 3
+        assert out.read_bytes() == expected.read_bytes()
+
+    def test_ndjson_round_trip(self, tmp_path):
+        data = [p.to_dict() for p in make_posts()]
+        out = tmp_path / "posts.ndjson"
+        write_posts(str(out), data, infer_format(str(out)))
+
+        assert len(out.read_text().splitlines()) == 3
+        assert list(read_posts(str(out))) == data
+
+    def test_nothing_written_without_posts(self, tmp_path):
+        out = tmp_path / "posts.json"
+        assert write_posts(str(out), iter([])) == 0
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestReadPosts:
+    @pytest.mark.parametrize('chunk_size', [1, 3, 64])
+    def test_array_read_in_chunks(self, chunk_size):
+        data = [p.to_dict() for p in make_posts()] + [[], 12345.5e-3, True, None, "x"]
+        for text in (json.dumps(data), json.dumps(data, indent=2) + '\n'):
+            assert list(iter_array(io.StringIO(text), chunk_size)) == data
+
+    @pytest.mark.parametrize('text', ['', '[', '[1,', '[1 2]', '[1,]', '[1]]', '{"a": 1}'])
+    def test_malformed_array(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_array(io.StringIO(text), 2))
+
+    def test_json_round_trip(self, tmp_path):
+        data = [p.to_dict() for p in make_posts()]
+        out = tmp_path / "posts.json"
+        write_posts(str(out), data)
+        assert list(read_posts(str(out))) == data
+
+
+class TestIndexPosts:
+    def test_arrival_order_without_key(self):
+        data = list(index_posts(make_posts()))
+        assert [(d['slug'], d['post_index']) for d in data] == [('c', 1), ('u', 2), ('a', 3)]
+
+    def test_sorted_through_spool(self):
+        data = list(index_posts(make_posts(), BlogExtractor.ORDER_KEY))
+        assert [(d['slug'], d['post_index']) for d in data] == [('u', 1), ('a', 2), ('c', 3)]
+        assert data[2]['content_html'] == "<p>C\n\"quoted\"</p>"
+        assert data[1]['content_html'] == "<p>Café</p>"
@@ -0,0 +1,45 @@
+"""Tests for scraper.pipeline module."""
+
+import asyncio
+import os
+
+import httpx
+
+from scraper.dedup import post_fingerprint
+from scraper.extract import BlogExtractor, ExtractedPost
+from scraper.pipeline import ParsePool
+
+
+ARTICLE = ("<html><head><title>{slug}</title></head><body><article><p>{slug} "
+           + "words " * 60 + "</p></article></body></html>")
+
+
+class TestParsePool:
+    def test_single_job_runs_inline(self):
+        with ParsePool(1) as pool:
+            assert pool.inline
+            assert asyncio.run(pool.run(os.getpid)) == os.getpid()
+
+    def test_runs_in_worker_processes(self):
+        with ParsePool(2) as pool:
+            assert not pool.inline
+            assert asyncio.run(pool.run(os.getpid)) != os.getpid()
+
+
+class TestExtractorOnPool:
+    def test_posts_parsed_in_workers_keep_order(self, make_fetcher):
+        def handler(request):
+            slug = request.url.path.strip('/')
+            return httpx.Response(200, html=ARTICLE.format(slug=slug))
+
+        urls = [f"https://example.com/post-{i}" for i in range(6)]
+        fetcher = make_fetcher(handler, attempts=1)
+        with fetcher, ParsePool(2) as pool:
+            extractor = BlogExtractor("https://example.com", fetcher=fetcher, parse_pool=pool)
+            posts = list(extractor._fetch_and_extract(urls))
+
+        assert [p.url for p in posts] == urls
+        assert [p.title for p in posts] == [f"post-{i}" for i in range(6)]
+        # Dedup fingerprints are computed in the workers
+        assert all(p.fingerprint is not None for p in posts)
+        assert [p.fingerprint for p in posts] == [post_fingerprint(ExtractedPost.from_dict(p.to_dict())) for p in posts]
@@ -0,0 +1,77 @@
+"""Tests for scraper.ratelimit module."""
+
+import asyncio
+import time
+
+import httpx
+
+from scraper.fetch import Fetcher
+from scraper.ratelimit import HostRateLimiter, TokenBucket, parse_crawl_delay
+
+
+ROBOTS_TXT = """User-agent: *
+Crawl-delay: 3
+
+User-agent: Replay
+Crawl-delay: 0.05
+"""
+
+
+class TestParseCrawlDelay:
+    def test_matching_agent(self):
+        assert parse_crawl_delay(ROBOTS_TXT, 'Replay/0.1 (blog archiver)') == 0.05
+
+    def test_wildcard(self):
+        assert parse_crawl_delay(ROBOTS_TXT, 'OtherBot') == 3.0
+
+    def test_missing(self):
+        assert parse_crawl_delay("User-agent: *\nDisallow:\n") is None
+
+
+class TestTokenBucket:
+    def test_paces_requests(self):
+        async def run():
+            bucket = TokenBucket(rate=20, burst=1)
+            start = time.monotonic()
+            for _ in range(4):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        # First token is free, the next three each wait ~50ms
+        assert asyncio.run(run()) >= 0.14
+
+
+class TestHostRateLimiter:
+    def test_robots_crawl_delay_applied(self):
+        robots_requests = []
+
+        def handler(request):
+            if request.url.path == '/robots.txt':
+                robots_requests.append(request.url.host)
+                return httpx.Response(200, text=ROBOTS_TXT)
+            return httpx.Response(200, text="ok")
+
+        limiter = HostRateLimiter(delay=0.01)
+        fetcher = Fetcher(transport=httpx.MockTransport(handler), limiter=limiter)
+        start = time.monotonic()
+        fetcher.fetch_all([f"https://example.com/{n}" for n in range(3)])
+        elapsed = time.monotonic() - start
+        fetcher.close()
+
+        # robots.txt read once; the Replay-specific 50ms delay wins over 10ms
+        assert robots_requests == ['example.com']
+        assert elapsed >= 0.09
+
+    def test_explicit_host_delay_overrides_robots(self):
+        async def run():
+            limiter = HostRateLimiter(delay=5, host_delays={'example.com': 0})
+
+            async def load_robots(url):
+                raise AssertionError("robots.txt should not be read")
+
+            start = time.monotonic()
+            for _ in range(3):
+                await limiter.acquire("https://example.com/post", load_robots)
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 0.5
@@ -0,0 +1,113 @@
+"""Tests for scraper.retry module."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from scraper.ratelimit import HostRateLimiter
+from scraper.retry import CircuitBreaker, CircuitOpenError, is_transient, retry_after
+
+
+def status_error(status, headers=None):
+    request = httpx.Request('GET', 'https://example.com/')
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError('error', request=request, response=response)
+
+
+class TestIsTransient:
+    def test_statuses(self):
+        assert is_transient(status_error(429))
+        assert is_transient(status_error(503))
+        assert not is_transient(status_error(404))
+        assert not is_transient(status_error(410))
+
+    def test_transport_errors(self):
+        assert is_transient(httpx.ReadTimeout('slow'))
+        assert is_transient(httpx.ConnectError('refused'))
+        assert not is_transient(ValueError())
+
+
+class TestRetryAfter:
+    def test_seconds_and_http_date(self):
+        assert retry_after(httpx.Response(429, headers={'Retry-After': '12'})) == 12.0
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 < retry_after(httpx.Response(503, headers={'Retry-After': later})) <= 30
+        assert retry_after(httpx.Response(503)) is None
+        assert retry_after(httpx.Response(503, headers={'Retry-After': 'soon'})) is None
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_cools_down(self):
+        now = [0.0]
+        breaker = CircuitBreaker(threshold=2, cooldown=10, clock=lambda: now[0])
+        breaker.record_failure('example.com')
+        breaker.check('example.com')
+        breaker.record_failure('example.com')
+        with pytest.raises(CircuitOpenError):
+            breaker.check('example.com')
+        assert not breaker.is_open('other.com')
+
+        now[0] = 11.0
+        breaker.check('example.com')
+        # Still failing: straight back open
+        breaker.record_failure('example.com')
+        assert breaker.is_open('example.com')
+        breaker.record_success('example.com')
+        assert not breaker.is_open('example.com')
+
+
+class TestFetcherRetries:
+    def test_dead_links_not_retried(self, make_fetcher):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(404)
+
+        with make_fetcher(handler, attempts=3) as fetcher:
+            assert fetcher.fetch("https://example.com/gone") is None
+        assert calls == ['/gone']
+
+    def test_breaker_stops_requests_to_failing_host(self, make_fetcher):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.host)
+            if request.url.host == 'down.example':
+                return httpx.Response(503, headers={'Retry-After': '0'})
+            return httpx.Response(200, html="ok")
+
+        breaker = CircuitBreaker(threshold=3, cooldown=60)
+        with make_fetcher(handler, attempts=2, concurrency=1, breaker=breaker) as fetcher:
+            results = [fetcher.fetch(f"https://down.example/{i}") for i in range(5)]
+            assert fetcher.fetch("https://up.example/") is not None
+
+        assert results == [None] * 5
+        assert calls.count('down.example') == 3
+        assert breaker.is_open('down.example')
+
+    def test_breaker_stops_queued_requests_in_a_batch(self, make_fetcher):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(503)
+
+        # Pacing keeps the batch queued on the limiter while the first requests fail
+        fetcher = make_fetcher(
+            handler,
+            limiter=HostRateLimiter(delay=0.001, robots=False),
+            attempts=1,
+            breaker=CircuitBreaker(threshold=3, cooldown=60),
+        )
+        with fetcher:
+            assert fetcher.fetch_all([f"https://down.example/{i}" for i in range(30)]) == [None] * 30
+            assert len(calls) == 3
+            calls.clear()
+            fetcher.breaker = CircuitBreaker(threshold=3, cooldown=60)
+            mapped = list(fetcher.imap([f"https://down.example/m{i}" for i in range(100)], lambda url, resp: resp))
+
+        assert mapped == [None] * 100
+        assert len(calls) == 3
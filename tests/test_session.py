@@ -0,0 +1,46 @@
+"""Tests for scraper.session module."""
+
+import asyncio
+
+import httpx
+
+from scraper import session
+from scraper.session import create_async_client, session_headers
+
+
+class TestSessionHeaders:
+    def test_defaults_and_overrides(self):
+        headers = session_headers({'User-Agent': 'Custom/1.0'})
+        assert headers['User-Agent'] == 'Custom/1.0'
+        assert 'Accept' in headers
+        assert 'gzip' in headers['Accept-Encoding']
+
+    def test_explicit_accept_encoding_kept(self):
+        assert session_headers({'Accept-Encoding': 'identity'})['Accept-Encoding'] == 'identity'
+
+
+class TestClients:
+    def test_async_client_sends_session_headers(self):
+        seen = {}
+
+        def handler(request):
+            seen.update(request.headers)
+            return httpx.Response(200, text="ok")
+
+        async def run():
+            async with create_async_client(transport=httpx.MockTransport(handler)) as client:
+                await client.get("https://example.com/")
+
+        asyncio.run(run())
+
+        assert seen['user-agent'].startswith('Replay/')
+        assert 'gzip' in seen['accept-encoding']
+
+    def test_pool_limits(self):
+        limits = session.pool_limits(8)
+        assert limits.max_connections == 8
+        assert limits.max_keepalive_connections == 8
+
+    def test_brotli_advertised_when_installed(self, monkeypatch):
+        monkeypatch.setattr(session, '_installed', lambda module: module == 'brotli')
+        assert session.accept_encoding() == 'gzip, deflate, br'
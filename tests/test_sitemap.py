@@ -0,0 +1,81 @@
+"""Tests for scraper.sitemap module."""
+
+import gzip
+
+import httpx
+
+from scraper.extract import BlogExtractor
+from scraper.sitemap import SitemapEntry, iter_sitemap
+
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <url><loc>https://example.com/post-one</loc><lastmod>2023-01-05</lastmod></url>
+    <url><loc> https://example.com/post-two </loc></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+    <sitemap><loc>https://example.com/sitemap-1.xml</loc></sitemap>
+    <sitemap><loc>https://example.com/sitemap-2.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+
+class TestIterSitemap:
+    def test_urls_with_lastmod(self):
+        assert list(iter_sitemap(URLSET)) == [
+            ('url', SitemapEntry('https://example.com/post-one', '2023-01-05')),
+            ('url', SitemapEntry('https://example.com/post-two', None)),
+        ]
+
+    def test_index_entries(self):
+        kinds = [kind for kind, _ in iter_sitemap(INDEX)]
+        assert kinds == ['sitemap', 'sitemap']
+
+    def test_gzipped(self):
+        entries = [entry.loc for _, entry in iter_sitemap(gzip.compress(URLSET))]
+        assert entries == ['https://example.com/post-one', 'https://example.com/post-two']
+
+    def test_no_namespace(self):
+        xml = b"<urlset><url><loc>https://example.com/a</loc></url></urlset>"
+        assert [e.loc for _, e in iter_sitemap(xml)] == ['https://example.com/a']
+
+    def test_garbage_yields_nothing(self):
+        assert list(iter_sitemap(b"<html><body>Not found</body></html>")) == []
+
+
+class TestBlogExtractorSitemapIndex:
+    def test_children_streamed_in_order(self, make_fetcher):
+        bodies = {
+            '/sitemap-1.xml': URLSET,
+            '/sitemap-2.xml.gz': gzip.compress(
+                URLSET.replace(b'post-one', b'post-three').replace(b'post-two', b'post-four')),
+        }
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.path)
+            return httpx.Response(200, content=bodies[request.url.path], headers={'Content-Type': 'application/xml'})
+
+        with make_fetcher(handler, attempts=1) as fetcher:
+            entries = BlogExtractor("https://example.com", fetcher=fetcher)._parse_sitemap(INDEX)
+
+        assert sorted(seen) == ['/sitemap-1.xml', '/sitemap-2.xml.gz']
+        assert [e.loc for e in entries] == [
+            'https://example.com/post-one', 'https://example.com/post-two',
+            'https://example.com/post-three', 'https://example.com/post-four',
+        ]
+
+    def test_nested_indexes_and_failed_children(self, make_fetcher):
+        nested = INDEX.replace(b'sitemap-1.xml', b'nested.xml').replace(b'sitemap-2.xml.gz', b'gone.xml')
+        bodies = {'/nested.xml': INDEX, '/sitemap-1.xml': URLSET}
+
+        def handler(request):
+            if request.url.path not in bodies:
+                return httpx.Response(404)
+            return httpx.Response(200, content=bodies[request.url.path], headers={'Content-Type': 'text/xml'})
+
+        with make_fetcher(handler, attempts=1) as fetcher:
+            entries = BlogExtractor("https://example.com", fetcher=fetcher)._parse_sitemap(nested)
+
+        assert [e.loc for e in entries] == ['https://example.com/post-one', 'https://example.com/post-two']